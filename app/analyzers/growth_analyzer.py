@@ -1,6 +1,8 @@
 from typing import Optional, Dict, Any
 import pandas as pd
 
+from app.analyzers.requirements import MetricRequirements, annual, quarterly
+
 
 def _is_empty(df: Any) -> bool:
     try:
@@ -102,6 +104,15 @@ FCF_ROWS = ["Free Cash Flow"]
 OCF_ROWS = ["Operating Cash Flow", "Total Cash From Operating Activities", "Cash Flow From Continuing Operating Activities"]
 CAPEX_ROWS = ["Capital Expenditure", "Capital Expenditures", "Capital Expenditure Reported"]
 
+STATEMENT_REQUIREMENTS: MetricRequirements = {
+    "revenue_cagr": (annual("income_statement", *REVENUE_ROWS),),
+    "eps_growth": (annual("income_statement", *EPS_ROWS),),
+    "fcf_growth": (annual("cash_flow", *FCF_ROWS, *OCF_ROWS, *CAPEX_ROWS),),
+    "qoq_revenue_growth": (quarterly("income_statement", *REVENUE_ROWS),),
+    "qoq_eps_growth": (quarterly("income_statement", *EPS_ROWS),),
+    "qoq_fcf_growth": (quarterly("cash_flow", *FCF_ROWS, *OCF_ROWS, *CAPEX_ROWS),),
+}
+
 
 def calculate_revenue_cagr(financial_data: Dict[str, Any], years: int = 3) -> Optional[float]:
     """Calculate annual revenue CAGR over up to 3 fiscal years, returned as percent."""
@@ -1,6 +1,25 @@
 import math
 from typing import Any, Dict, Optional
 
+from app.analyzers.requirements import MetricRequirements, annual
+
+
+# Quality metrics read the latest annual column; quarterly statements are only
+# a fallback when the annual statement is missing.
+STATEMENT_REQUIREMENTS: MetricRequirements = {
+    "roe": (
+        annual("income_statement", "Net Income"),
+        annual("balance_sheet", "Stockholders Equity"),
+    ),
+    "roa": (
+        annual("income_statement", "Net Income"),
+        annual("balance_sheet", "Total Assets"),
+    ),
+    "debt_to_equity": (annual("balance_sheet", "Total Debt", "Stockholders Equity"),),
+    "free_cash_flow": (annual("cash_flow", "Operating Cash Flow", "Capital Expenditure"),),
+    "profit_margins": (annual("income_statement", "Net Income", "Total Revenue"),),
+}
+
 
 def _number(value: Any) -> Optional[float]:
     if value is None or isinstance(value, bool):
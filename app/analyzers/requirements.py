@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class StatementRequirement:
+    """One statement (and the rows read from it) that a metric depends on."""
+
+    statement: str
+    frequency: str
+    rows: Tuple[str, ...]
+
+    @property
+    def kind(self) -> str:
+        return f"{self.frequency}_{self.statement}"
+
+
+MetricRequirements = Dict[str, Tuple[StatementRequirement, ...]]
+
+
+def annual(statement: str, *rows: str) -> StatementRequirement:
+    return StatementRequirement(statement, "annual", tuple(rows))
+
+
+def quarterly(statement: str, *rows: str) -> StatementRequirement:
+    return StatementRequirement(statement, "quarterly", tuple(rows))
+
+
+def required_statement_kinds(
+    requirements: MetricRequirements,
+    metrics: Optional[Iterable[str]] = None,
+) -> Set[str]:
+    """Statement kinds needed by ``metrics`` (every declared metric when None)."""
+
+    names = requirements.keys() if metrics is None else metrics
+    return {requirement.kind for name in names for requirement in requirements[name]}
+
+
+def required_rows(
+    requirements: MetricRequirements,
+    metrics: Optional[Iterable[str]] = None,
+) -> Dict[str, Set[str]]:
+    """Row names read per statement kind, for diagnostics and documentation."""
+
+    names = requirements.keys() if metrics is None else metrics
+    rows: Dict[str, Set[str]] = {}
+    for name in names:
+        for requirement in requirements[name]:
+            rows.setdefault(requirement.kind, set()).update(requirement.rows)
+    return rows
@@ -1,12 +1,30 @@
 import logging
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import yfinance as yf
 
+from app.data_sources.statement_warehouse import (
+    ANNUAL_STATEMENT_KINDS,
+    INFO_REFRESH_SECONDS,
+    QUARTERLY_STATEMENT_KINDS,
+    STATEMENT_KINDS,
+    StoredFinancials,
+    earnings_key,
+    get_statement_warehouse,
+    needs_statement_refresh,
+)
+from app.utils.market_calendar import market_for_symbol, session_ttl
 from app.utils.symbol_mapper import map_symbol_for_yfinance
 
 logger = logging.getLogger(__name__)
 
+# Price and valuation fields in stock.info (currentPrice, PE, PB, PEG) move
+# with the market; a stored copy serves them only this long within a session.
+INFO_QUOTE_TTL_SECONDS = 15 * 60
+
 StatementLoader = Callable[[], Any]
 
 
@@ -116,28 +134,211 @@ def _get_quarterly_cash_flow(stock, diagnostics=None):
     )
 
 
+STATEMENT_LOADERS = (
+    ("annual_income_statement", _get_annual_income_statement),
+    ("annual_balance_sheet", _get_annual_balance_sheet),
+    ("annual_cash_flow", _get_annual_cash_flow),
+    ("quarterly_income_statement", _get_quarterly_income_statement),
+    ("quarterly_balance_sheet", _get_quarterly_balance_sheet),
+    ("quarterly_cash_flow", _get_quarterly_cash_flow),
+)
+# Process-wide budget of concurrent statement/info requests shared by every
+# symbol being fetched, so discovery workers cannot multiply the load.
+STATEMENT_FETCH_WORKERS = 12
+_STATEMENT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=STATEMENT_FETCH_WORKERS,
+    thread_name_prefix="statements",
+)
+
+
+def _load_statement(loader, stock) -> Tuple[Any, List[Dict[str, str]]]:
+    errors: List[Dict[str, str]] = []
+    return loader(stock, errors), errors
+
+
+def build_fetch_plan(statements: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """Statement kinds to fetch, in loader order; ``None`` means all six."""
+
+    if statements is None:
+        return STATEMENT_KINDS
+    requested = set(statements)
+    unknown = requested.difference(STATEMENT_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown statement kinds: {sorted(unknown)}")
+    return tuple(kind for kind in STATEMENT_KINDS if kind in requested)
+
+
+def _quarterly_fallback_kinds(statements: Dict[str, Any]) -> List[str]:
+    """Quarterly kinds needed because the matching annual statement is empty.
+
+    ``income_statement``/``balance_sheet``/``cash_flow`` fall back to the
+    quarterly statement, so a plan without quarterly data still fetches it
+    for symbols that publish no annual statement.
+    """
+
+    fallbacks = []
+    for annual_kind, quarterly_kind in zip(ANNUAL_STATEMENT_KINDS, QUARTERLY_STATEMENT_KINDS):
+        if annual_kind in statements and quarterly_kind not in statements and _is_empty(statements[annual_kind]):
+            fallbacks.append(quarterly_kind)
+    return fallbacks
+
+
+def _fetch_statements(
+    stock,
+    provider_errors: List[Dict[str, str]],
+    kinds: Iterable[str] = STATEMENT_KINDS,
+) -> Dict[str, Any]:
+    """Run the requested statement loaders concurrently on the shared statement pool.
+
+    Each loader keeps its own lazy fallback order; diagnostics are merged in
+    the fixed loader order so provider_errors matches a sequential fetch.
+    """
+
+    requested = set(kinds)
+    futures = [
+        (kind, _STATEMENT_EXECUTOR.submit(_load_statement, loader, stock))
+        for kind, loader in STATEMENT_LOADERS
+        if kind in requested
+    ]
+    statements: Dict[str, Any] = {}
+    for kind, future in futures:
+        statement, errors = future.result()
+        statements[kind] = statement
+        provider_errors.extend(errors)
+    return statements
+
+
+def _fetch_info(stock, symbol: str, yf_symbol: str, provider_errors: List[Dict[str, str]]):
+    try:
+        return stock.info or {}, True
+    except Exception as exc:
+        provider_errors.append({"stage": "stock_info", "error": str(exc)[:300]})
+        logger.debug("stock.info failed for %s (%s): %s", symbol, yf_symbol, exc)
+        return {}, False
+
+
+def _fetch_info_result(stock, symbol: str, yf_symbol: str) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+    errors: List[Dict[str, str]] = []
+    info, _ = _fetch_info(stock, symbol, yf_symbol, errors)
+    return info, errors
+
+
+def _load_stored_financials(yf_symbol: str) -> Optional[StoredFinancials]:
+    try:
+        return get_statement_warehouse().load(yf_symbol)
+    except Exception as exc:
+        logger.warning("Statement warehouse read failed for %s: %s", yf_symbol, exc)
+        return None
+
+
+def _store_financials(
+    yf_symbol: str,
+    statements: Dict[str, Any],
+    info: Dict[str, Any],
+    replace: bool,
+) -> None:
+    try:
+        get_statement_warehouse().save_statements(yf_symbol, statements, info, replace=replace)
+    except Exception as exc:
+        logger.warning("Statement warehouse write failed for %s: %s", yf_symbol, exc)
+
+
+def _store_info(yf_symbol: str, info: Dict[str, Any]) -> None:
+    try:
+        get_statement_warehouse().save_info(yf_symbol, info)
+    except Exception as exc:
+        logger.warning("Statement warehouse write failed for %s: %s", yf_symbol, exc)
+
+
+def _stored_quote_is_current(yf_symbol: str, fetched_at: float) -> bool:
+    fetched = datetime.fromtimestamp(fetched_at, tz=timezone.utc)
+    lifetime = session_ttl(market_for_symbol(yf_symbol), INFO_QUOTE_TTL_SECONDS, at=fetched)
+    return time.time() - fetched_at < lifetime
+
+
+def get_info(symbol: str, exchange: str = "SET") -> Dict[str, Any]:
+    """Return ``stock.info``, served from the warehouse while its quote is current.
+
+    A live fetch is stored, so a following ``get_financials_with_diagnostics``
+    for the same symbol reuses it instead of requesting ``stock.info`` again.
+    Provider errors propagate to the caller.
+    """
+
+    yf_symbol = map_symbol_for_yfinance(symbol, exchange)
+    stored = _load_stored_financials(yf_symbol)
+    if stored is not None and stored.info and _stored_quote_is_current(yf_symbol, stored.info_fetched_at or 0):
+        return stored.info
+    info = yf.Ticker(yf_symbol).info or {}
+    _store_info(yf_symbol, info)
+    return info
+
+
 def get_financials_with_diagnostics(
     symbol: str,
     exchange: str = "SET",
+    statements: Optional[Iterable[str]] = None,
 ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
-    """Fetch statements and distinguish missing data from provider failures."""
-
+    """Fetch statements and distinguish missing data from provider failures.
+
+    ``statements`` is the fetch plan: the statement kinds the caller's
+    metrics read (see ``build_fetch_plan``); kinds outside it are returned as
+    ``None``. Statements are served from the on-disk statement warehouse
+    until a new fiscal period is due or the earnings fields of ``stock.info``
+    change; only then are they fetched from yfinance again. A stored
+    ``stock.info`` younger than ``INFO_REFRESH_SECONDS`` only feeds that
+    earnings check; the returned ``info`` carries live price and valuation
+    fields unless the stored copy is within ``INFO_QUOTE_TTL_SECONDS`` of the
+    current market session.
+    """
+
+    plan = build_fetch_plan(statements)
     provider_errors: List[Dict[str, str]] = []
     yf_symbol = map_symbol_for_yfinance(symbol, exchange)
+    stored = _load_stored_financials(yf_symbol)
+    info: Optional[Dict[str, Any]] = None
+    refresh_info: Optional[Dict[str, Any]] = None
+    info_future = None
     try:
         stock = yf.Ticker(yf_symbol)
-        annual_income_statement = _get_annual_income_statement(stock, provider_errors)
-        annual_balance_sheet = _get_annual_balance_sheet(stock, provider_errors)
-        annual_cash_flow = _get_annual_cash_flow(stock, provider_errors)
-        quarterly_income_statement = _get_quarterly_income_statement(
-            stock,
-            provider_errors,
-        )
-        quarterly_balance_sheet = _get_quarterly_balance_sheet(
-            stock,
-            provider_errors,
+        if stored is not None:
+            info_fetched_at = stored.info_fetched_at or 0
+            if _stored_quote_is_current(yf_symbol, info_fetched_at):
+                info = stored.info
+            elif time.time() - info_fetched_at < INFO_REFRESH_SECONDS:
+                # Earnings fields are still fresh enough to decide the refresh;
+                # quote fields are fetched live alongside the statements.
+                refresh_info = stored.info
+            else:
+                info, info_ok = _fetch_info(stock, symbol, yf_symbol, provider_errors)
+                if info_ok:
+                    _store_info(yf_symbol, info)
+                else:
+                    info = stored.info
+
+        replace = stored is None or needs_statement_refresh(
+            stored, earnings_key(info if info is not None else refresh_info)
         )
-        quarterly_cash_flow = _get_quarterly_cash_flow(stock, provider_errors)
+        reusable = () if replace else stored.fetched_kinds
+        loaded = {kind: stored.statements.get(kind) for kind in plan if kind in reusable}
+        fetched: Dict[str, Any] = {}
+        if info is None:
+            info_future = _STATEMENT_EXECUTOR.submit(_fetch_info_result, stock, symbol, yf_symbol)
+        missing = [kind for kind in plan if kind not in loaded]
+        while True:
+            if missing:
+                fetched.update(_fetch_statements(stock, provider_errors, missing))
+            missing = []
+            for kind in _quarterly_fallback_kinds({**loaded, **fetched}):
+                if kind in reusable:
+                    loaded[kind] = stored.statements.get(kind)
+                else:
+                    missing.append(kind)
+            if not missing:
+                break
+        statement_source = "provider" if fetched else "warehouse"
+        statement_frames = {kind: None for kind in STATEMENT_KINDS}
+        statement_frames.update(loaded)
+        statement_frames.update(fetched)
     except Exception as exc:
         provider_errors.append({"stage": "ticker_initialization", "error": str(exc)[:300]})
         return None, {
@@ -146,6 +347,13 @@ def get_financials_with_diagnostics(
             "provider_errors": provider_errors,
         }
 
+    annual_income_statement = statement_frames["annual_income_statement"]
+    annual_balance_sheet = statement_frames["annual_balance_sheet"]
+    annual_cash_flow = statement_frames["annual_cash_flow"]
+    quarterly_income_statement = statement_frames["quarterly_income_statement"]
+    quarterly_balance_sheet = statement_frames["quarterly_balance_sheet"]
+    quarterly_cash_flow = statement_frames["quarterly_cash_flow"]
+
     has_annual_income = not _is_empty(annual_income_statement)
     has_annual_cash_flow = not _is_empty(annual_cash_flow)
     has_annual_balance = not _is_empty(annual_balance_sheet)
@@ -169,12 +377,18 @@ def get_financials_with_diagnostics(
             "provider_errors": provider_errors,
         }
 
-    try:
-        info = stock.info or {}
-    except Exception as exc:
-        provider_errors.append({"stage": "stock_info", "error": str(exc)[:300]})
-        logger.debug("stock.info failed for %s (%s): %s", symbol, yf_symbol, exc)
-        info = {}
+    live_info = False
+    if info_future is not None:
+        # Info errors only count once statements exist, as in a sequential fetch.
+        info, info_errors = info_future.result()
+        provider_errors.extend(info_errors)
+        live_info = not info_errors
+    elif info is None:
+        info, live_info = _fetch_info(stock, symbol, yf_symbol, provider_errors)
+    if fetched:
+        _store_financials(yf_symbol, fetched, info, replace=replace)
+    elif live_info and refresh_info is not None:
+        _store_info(yf_symbol, info)
 
     data = {
         "income_statement": annual_income_statement
@@ -202,6 +416,7 @@ def get_financials_with_diagnostics(
         "info": info,
         "financial_provider_diagnostics": {
             "status": "success",
+            "statement_source": statement_source,
             "provider_error_count": len(provider_errors),
             "provider_errors": provider_errors[:5],
         },
@@ -209,12 +424,17 @@ def get_financials_with_diagnostics(
     return data, {
         "status": "success",
         "yf_symbol": yf_symbol,
+        "statement_source": statement_source,
         "provider_errors": provider_errors,
     }
 
 
-def get_financials(symbol: str, exchange: str = "SET") -> Optional[Dict[str, Any]]:
+def get_financials(
+    symbol: str,
+    exchange: str = "SET",
+    statements: Optional[Iterable[str]] = None,
+) -> Optional[Dict[str, Any]]:
     """Backward-compatible wrapper returning only financial data."""
 
-    data, _ = get_financials_with_diagnostics(symbol, exchange)
+    data, _ = get_financials_with_diagnostics(symbol, exchange, statements)
     return data
@@ -0,0 +1,240 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from app.utils.market_calendar import symbol_session_ttl
+from app.utils.singleflight import SingleFlight
+from app.utils.ttl_cache import TTLCache, register_cache
+from app.utils.yfinance_frames import extract_yfinance_frame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+# Approximate daily bars returned by each yfinance period, narrowest first.
+PERIOD_BARS = (
+    ("5d", 5),
+    ("1mo", 21),
+    ("3mo", 63),
+    ("6mo", 126),
+    ("1y", 252),
+    ("2y", 504),
+    ("5y", 1260),
+)
+# Widest window any scanner service reads (market regime MA200), so the first
+# request for a symbol already covers every later caller.
+DEFAULT_HISTORY_PERIOD = "1y"
+# The last daily bar moves during the session, so stored frames expire; outside
+# the session they stay valid until the next open of the symbol's market.
+PRICE_HISTORY_TTL_SECONDS = 15 * 60
+PRICE_HISTORY_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    size = max(1, int(size))
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _unique_symbols(symbols: Iterable[str]) -> List[str]:
+    unique: List[str] = []
+    seen = set()
+    for symbol in symbols:
+        clean_symbol = str(symbol or "").upper().strip()
+        if clean_symbol and clean_symbol not in seen:
+            unique.append(clean_symbol)
+            seen.add(clean_symbol)
+    return unique
+
+
+def download_price_histories(
+    symbols: Iterable[str],
+    period: str = "6mo",
+    interval: str = "1d",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """Download daily bars for many symbols with chunked multi-ticker requests.
+
+    One ``yf.download`` call covers up to ``batch_size`` tickers instead of one
+    HTTP round-trip per symbol. The combined frame is split back into one flat
+    OHLCV frame per symbol. A failed chunk or an unparseable symbol is reported
+    in the error map so callers can keep their per-symbol error reasons.
+    """
+
+    histories: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+
+    for chunk in _chunks(_unique_symbols(symbols), batch_size):
+        try:
+            frame = yf.download(
+                chunk if len(chunk) > 1 else chunk[0],
+                period=period,
+                interval=interval,
+                progress=False,
+                auto_adjust=True,
+                group_by="column",
+                threads=True,
+            )
+        except Exception as exc:
+            logger.warning(
+                "Batched price download failed for %d symbols: %s",
+                len(chunk),
+                exc,
+            )
+            for symbol in chunk:
+                errors[symbol] = str(exc)
+            continue
+
+        for symbol in chunk:
+            try:
+                histories[symbol] = extract_yfinance_frame(frame, symbol)
+            except Exception as exc:
+                errors[symbol] = str(exc)
+
+    return histories, errors
+
+
+def _period_rank(period: str) -> int:
+    for rank, (name, _) in enumerate(PERIOD_BARS):
+        if name == period:
+            return rank
+    raise ValueError(f"Unsupported price history period: {period}")
+
+
+def period_for_bars(bars: int, minimum_period: str = DEFAULT_HISTORY_PERIOD) -> str:
+    """Return the narrowest supported period covering ``bars`` daily bars."""
+
+    minimum_rank = _period_rank(minimum_period)
+    for rank, (name, period_bars) in enumerate(PERIOD_BARS):
+        if rank >= minimum_rank and period_bars >= bars:
+            return name
+    return PERIOD_BARS[-1][0]
+
+
+class PriceHistoryStore:
+    """Process-wide daily OHLCV store shared by every price-based service.
+
+    Each symbol is downloaded once with the widest window needed so far and
+    callers receive the last ``bars`` rows. A caller asking for more history
+    than is held triggers one wider download that replaces the stored frame.
+    Empty responses are not stored because yfinance reports throttling and
+    transport failures as empty frames. Frames expire at the next session
+    boundary of the symbol's market (at most ``ttl_seconds`` while it is open)
+    and the least recently used are evicted beyond ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        minimum_period: str = DEFAULT_HISTORY_PERIOD,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ttl_seconds: float = PRICE_HISTORY_TTL_SECONDS,
+        max_bytes: Optional[int] = PRICE_HISTORY_MAX_BYTES,
+        name: str = "price_history",
+    ):
+        self.minimum_period = minimum_period
+        self.batch_size = batch_size
+        self.cache = TTLCache(
+            name,
+            ttl_seconds,
+            max_bytes=max_bytes,
+            ttl_for=symbol_session_ttl(ttl_seconds),
+        )
+        self._flight = SingleFlight()
+
+    def _cached(self, symbol: str, bars: int) -> Optional[pd.DataFrame]:
+        needed_rank = _period_rank(period_for_bars(bars, self.minimum_period))
+        found, entry = self.cache.get(symbol)
+        if not found:
+            return None
+        period, frame = entry
+        if _period_rank(period) < needed_rank:
+            return None
+        return frame
+
+    def _store(self, histories: Dict[str, pd.DataFrame], period: str) -> None:
+        for symbol, frame in histories.items():
+            if frame is None or frame.empty:
+                continue
+            self.cache.set(symbol, (period, frame))
+
+    def prefetch(self, symbols: Iterable[str], bars: int) -> Dict[str, str]:
+        """Load every missing symbol with batched downloads and return errors."""
+
+        missing = [
+            symbol
+            for symbol in _unique_symbols(symbols)
+            if self._cached(symbol, bars) is None
+        ]
+        if not missing:
+            return {}
+        period = period_for_bars(bars, self.minimum_period)
+        histories, errors = download_price_histories(
+            missing,
+            period=period,
+            batch_size=self.batch_size,
+        )
+        self._store(histories, period)
+        return errors
+
+    def _download_one(self, symbol: str, bars: int) -> Optional[pd.DataFrame]:
+        frame = self._cached(symbol, bars)
+        if frame is not None:
+            return frame
+        period = period_for_bars(bars, self.minimum_period)
+        histories, errors = download_price_histories(
+            [symbol],
+            period=period,
+            batch_size=1,
+        )
+        if symbol in errors:
+            raise RuntimeError(errors[symbol])
+        self._store(histories, period)
+        return histories.get(symbol)
+
+    def get(self, symbol: str, bars: int) -> pd.DataFrame:
+        """Return the last ``bars`` daily bars for ``symbol``.
+
+        Concurrent misses for the same symbol and window share one download.
+        Provider exceptions propagate so callers keep their own error reasons.
+        """
+
+        symbol = str(symbol or "").upper().strip()
+        frame = self._cached(symbol, bars)
+        if frame is None:
+            period = period_for_bars(bars, self.minimum_period)
+            frame, _ = self._flight.do(
+                (symbol, period),
+                lambda: self._download_one(symbol, bars),
+            )
+            if frame is None:
+                return pd.DataFrame()
+        return frame.tail(bars).copy()
+
+    def clear(self, symbols: Optional[Iterable[str]] = None) -> None:
+        if symbols is None:
+            self.cache.clear()
+            return
+        for symbol in _unique_symbols(symbols):
+            self.cache.invalidate(symbol)
+
+
+_STORE = PriceHistoryStore()
+register_cache(_STORE.cache)
+
+
+def get_price_history(symbol: str, bars: int) -> pd.DataFrame:
+    """Return the last ``bars`` daily OHLCV rows from the shared store."""
+
+    return _STORE.get(symbol, bars)
+
+
+def prefetch_price_histories(symbols: Iterable[str], bars: int) -> Dict[str, str]:
+    """Warm the shared store with batched downloads; returns per-symbol errors."""
+
+    return _STORE.prefetch(symbols, bars)
+
+
+def clear_price_history_cache(symbols: Optional[Iterable[str]] = None) -> None:
+    _STORE.clear(symbols)
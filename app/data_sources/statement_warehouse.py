@@ -0,0 +1,320 @@
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WAREHOUSE_PATH = Path("data/financial_statements.sqlite3")
+
+ANNUAL_STATEMENT_KINDS = (
+    "annual_income_statement",
+    "annual_balance_sheet",
+    "annual_cash_flow",
+)
+QUARTERLY_STATEMENT_KINDS = (
+    "quarterly_income_statement",
+    "quarterly_balance_sheet",
+    "quarterly_cash_flow",
+)
+STATEMENT_KINDS = ANNUAL_STATEMENT_KINDS + QUARTERLY_STATEMENT_KINDS
+
+# stock.info is re-read at most this often; its earnings fields decide
+# whether stored statements are still current.
+INFO_REFRESH_SECONDS = 12 * 60 * 60
+# A filing that is due but not yet published is retried at most daily.
+MIN_STATEMENT_REFRESH_SECONDS = 24 * 60 * 60
+# Days after a period end by which the statements are normally published.
+ANNUAL_FILING_LAG_DAYS = 90
+QUARTERLY_FILING_LAG_DAYS = 45
+EARNINGS_INFO_FIELDS = ("earningsTimestamp", "mostRecentQuarter", "lastFiscalYearEnd")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS statements (
+        yf_symbol TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        period_end TEXT NOT NULL,
+        line_items TEXT NOT NULL,
+        PRIMARY KEY (yf_symbol, kind, period_end)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS symbols (
+        yf_symbol TEXT PRIMARY KEY,
+        statements_fetched_at REAL,
+        info_fetched_at REAL,
+        earnings_key TEXT,
+        info TEXT,
+        fetched_kinds TEXT
+    )
+    """,
+)
+
+
+@dataclass
+class StoredFinancials:
+    yf_symbol: str
+    statements: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    info: Dict[str, Any] = field(default_factory=dict)
+    statements_fetched_at: Optional[float] = None
+    info_fetched_at: Optional[float] = None
+    earnings_key: Optional[str] = None
+    # Kinds requested from the provider, including ones that came back empty.
+    fetched_kinds: Tuple[str, ...] = ()
+
+
+def earnings_key(info: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Fingerprint of the info fields that move when a new report is filed."""
+
+    values = {name: (info or {}).get(name) for name in EARNINGS_INFO_FIELDS}
+    if not any(value is not None for value in values.values()):
+        return None
+    return json.dumps(values, sort_keys=True, default=str)
+
+
+def _period_label(column: Any) -> str:
+    try:
+        return pd.Timestamp(column).strftime("%Y-%m-%d")
+    except Exception:
+        return str(column)
+
+
+def _period_value(label: str) -> Any:
+    try:
+        return pd.Timestamp(label)
+    except Exception:
+        return label
+
+
+def _json_number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) or math.isinf(number) else number
+
+
+def _frame_rows(frame: pd.DataFrame) -> Iterable[Tuple[str, str]]:
+    for column in frame.columns:
+        line_items = {str(item): _json_number(value) for item, value in frame[column].items()}
+        yield _period_label(column), json.dumps(line_items)
+
+
+def _rows_to_frame(rows: Iterable[Tuple[str, str]]) -> pd.DataFrame:
+    columns: Dict[Any, pd.Series] = {}
+    index = None
+    for period_end, payload in rows:
+        line_items = json.loads(payload)
+        series = pd.Series(line_items, dtype="float64")
+        if index is None:
+            index = list(series.index)
+        columns[_period_value(period_end)] = series
+    if not columns:
+        return pd.DataFrame()
+    frame = pd.DataFrame(columns)
+    return frame.reindex(index + [item for item in frame.index if item not in index])
+
+
+def _latest_period(frame: Optional[pd.DataFrame]) -> Optional[pd.Timestamp]:
+    if frame is None or frame.empty:
+        return None
+    periods = [value for value in map(_period_value, map(_period_label, frame.columns)) if isinstance(value, pd.Timestamp)]
+    return max(periods) if periods else None
+
+
+def new_period_expected(stored: StoredFinancials, now: Optional[float] = None) -> bool:
+    """True when a later annual or quarterly filing should be published by now."""
+
+    current = datetime.fromtimestamp(now if now is not None else time.time(), timezone.utc).replace(tzinfo=None)
+    checks = (
+        (ANNUAL_STATEMENT_KINDS, 365 + ANNUAL_FILING_LAG_DAYS),
+        (QUARTERLY_STATEMENT_KINDS, 92 + QUARTERLY_FILING_LAG_DAYS),
+    )
+    for kinds, due_days in checks:
+        latest = [_latest_period(stored.statements.get(kind)) for kind in kinds]
+        latest = [period for period in latest if period is not None]
+        if latest and max(latest).to_pydatetime() + timedelta(days=due_days) <= current:
+            return True
+    return False
+
+
+def needs_statement_refresh(
+    stored: Optional[StoredFinancials],
+    current_earnings_key: Optional[str],
+    now: Optional[float] = None,
+) -> bool:
+    """Decide whether stored statements must be refetched from the provider."""
+
+    if stored is None or not stored.statements or stored.statements_fetched_at is None:
+        return True
+    if current_earnings_key and current_earnings_key != stored.earnings_key:
+        return True
+    now = now if now is not None else time.time()
+    if now - stored.statements_fetched_at < MIN_STATEMENT_REFRESH_SECONDS:
+        return False
+    return new_period_expected(stored, now)
+
+
+class StatementWarehouse:
+    """SQLite store of yfinance statements keyed by symbol, kind and period end.
+
+    Each period column is stored as one JSON object of line items, so a
+    symbol's statements are rebuilt into the same DataFrame layout yfinance
+    returns (line items as index, period ends as columns).
+    """
+
+    def __init__(self, path: Path = DEFAULT_WAREHOUSE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30)
+        if not self._initialized:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(symbols)")}
+            if "fetched_kinds" not in columns:
+                connection.execute("ALTER TABLE symbols ADD COLUMN fetched_kinds TEXT")
+            connection.commit()
+            self._initialized = True
+        return connection
+
+    def load(self, yf_symbol: str) -> Optional[StoredFinancials]:
+        with self._lock:
+            connection = self._connect()
+            try:
+                meta = connection.execute(
+                    "SELECT statements_fetched_at, info_fetched_at, earnings_key, info, fetched_kinds FROM symbols WHERE yf_symbol = ?",
+                    (yf_symbol,),
+                ).fetchone()
+                if meta is None:
+                    return None
+                rows = connection.execute(
+                    "SELECT kind, period_end, line_items FROM statements WHERE yf_symbol = ? ORDER BY kind, period_end DESC",
+                    (yf_symbol,),
+                ).fetchall()
+            finally:
+                connection.close()
+
+        grouped: Dict[str, list] = {}
+        for kind, period_end, line_items in rows:
+            grouped.setdefault(kind, []).append((period_end, line_items))
+        return StoredFinancials(
+            yf_symbol=yf_symbol,
+            statements={kind: _rows_to_frame(kind_rows) for kind, kind_rows in grouped.items()},
+            info=json.loads(meta[3]) if meta[3] else {},
+            statements_fetched_at=meta[0],
+            info_fetched_at=meta[1],
+            earnings_key=meta[2],
+            fetched_kinds=tuple(json.loads(meta[4])) if meta[4] else tuple(grouped),
+        )
+
+    def save_statements(
+        self,
+        yf_symbol: str,
+        statements: Dict[str, Optional[pd.DataFrame]],
+        info: Optional[Dict[str, Any]] = None,
+        now: Optional[float] = None,
+        replace: bool = True,
+    ) -> None:
+        """Store freshly fetched statement kinds for one symbol.
+
+        ``replace`` drops every previously stored kind (a refresh after new
+        filings); otherwise the given kinds are merged into what is stored.
+        """
+
+        now = now if now is not None else time.time()
+        kinds = [kind for kind in STATEMENT_KINDS if kind in statements]
+        with self._lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    fetched_kinds = set(kinds)
+                    if replace:
+                        connection.execute("DELETE FROM statements WHERE yf_symbol = ?", (yf_symbol,))
+                    else:
+                        row = connection.execute(
+                            "SELECT fetched_kinds FROM symbols WHERE yf_symbol = ?",
+                            (yf_symbol,),
+                        ).fetchone()
+                        if row and row[0]:
+                            fetched_kinds.update(json.loads(row[0]))
+                        connection.executemany(
+                            "DELETE FROM statements WHERE yf_symbol = ? AND kind = ?",
+                            [(yf_symbol, kind) for kind in kinds],
+                        )
+                    for kind in kinds:
+                        frame = statements.get(kind)
+                        if frame is None or getattr(frame, "empty", True):
+                            continue
+                        connection.executemany(
+                            "INSERT OR REPLACE INTO statements (yf_symbol, kind, period_end, line_items) VALUES (?, ?, ?, ?)",
+                            [(yf_symbol, kind, period_end, line_items) for period_end, line_items in _frame_rows(frame)],
+                        )
+                    self._upsert_symbol(
+                        connection,
+                        yf_symbol,
+                        info,
+                        now,
+                        statements_fetched_at=now,
+                        fetched_kinds=[kind for kind in STATEMENT_KINDS if kind in fetched_kinds],
+                    )
+            finally:
+                connection.close()
+
+    def save_info(self, yf_symbol: str, info: Dict[str, Any], now: Optional[float] = None) -> None:
+        now = now if now is not None else time.time()
+        with self._lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    self._upsert_symbol(connection, yf_symbol, info, now)
+            finally:
+                connection.close()
+
+    @staticmethod
+    def _upsert_symbol(
+        connection: sqlite3.Connection,
+        yf_symbol: str,
+        info: Optional[Dict[str, Any]],
+        now: float,
+        statements_fetched_at: Optional[float] = None,
+        fetched_kinds: Optional[Iterable[str]] = None,
+    ) -> None:
+        payload = json.dumps(info or {}, default=str)
+        key = earnings_key(info)
+        kinds = json.dumps(list(fetched_kinds)) if fetched_kinds is not None else None
+        connection.execute(
+            """
+            INSERT INTO symbols (yf_symbol, statements_fetched_at, info_fetched_at, earnings_key, info, fetched_kinds)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(yf_symbol) DO UPDATE SET
+                statements_fetched_at = COALESCE(excluded.statements_fetched_at, statements_fetched_at),
+                fetched_kinds = COALESCE(excluded.fetched_kinds, fetched_kinds),
+                info_fetched_at = excluded.info_fetched_at,
+                earnings_key = CASE
+                    WHEN excluded.statements_fetched_at IS NOT NULL THEN excluded.earnings_key
+                    ELSE earnings_key
+                END,
+                info = excluded.info
+            """,
+            (yf_symbol, statements_fetched_at, now, key, payload, kinds),
+        )
+
+
+_WAREHOUSE = StatementWarehouse()
+
+
+def get_statement_warehouse() -> StatementWarehouse:
+    return _WAREHOUSE
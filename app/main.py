@@ -3,9 +3,12 @@ from fastapi import FastAPI, HTTPException, Request
 from typing import Any, Dict, List, Optional, Tuple
 from app.services.scanner import scan_market
 from app.services.long_term_scanner import scan_long_term
-from app.services.fundamental_discovery import discover_best_fundamentals
+from app.services.fundamental_discovery import discover_best_fundamentals, merge_discovery_shards
+from app.utils.provider_limits import provider_concurrency_stats
+from app.utils.ttl_cache import cache_stats, clear_all_caches
 from app.models import (
     BestFundamentalsRequest,
+    DiscoveryShardMergeRequest,
     ScanRequest,
     ScannerContractResult,
     ScannerResult,
@@ -49,6 +52,7 @@ def _scanner_runtime_metadata() -> Dict[str, Any]:
         "bucket_hint_version": "scanner-bucket-hints-v2",
         "bucket_hint_policy_version": "scanner-bucket-hint-policy-v3",
         "generic_tag_bucket_hints": False,
+        "provider_concurrency": provider_concurrency_stats(),
     }
 
 
@@ -315,6 +319,25 @@ def health_check():
     )
 
 
+@app.get("/cache", response_model=StandardAgentResponse[dict])
+def cache_status():
+    return build_response(
+        status="success",
+        data={"caches": cache_stats()},
+        metadata=_scanner_runtime_metadata(),
+    )
+
+
+@app.post("/cache/clear", response_model=StandardAgentResponse[dict])
+def cache_clear():
+    clear_all_caches()
+    return build_response(
+        status="success",
+        data={"cleared": True, "caches": cache_stats()},
+        metadata=_scanner_runtime_metadata(),
+    )
+
+
 @app.post("/discover-best-fundamentals", response_model=StandardAgentResponse)
 def discover_best_fundamental_stocks(
     request: BestFundamentalsRequest,
@@ -333,6 +356,16 @@ def discover_best_fundamental_stocks(
             top_n=request.top_n,
             exchange=request.exchange,
             max_workers=request.max_workers,
+            two_phase=request.two_phase,
+            prescreen_fraction=request.prescreen_fraction,
+            prescreen_audit_size=request.prescreen_audit_size,
+            retry_budget_seconds=request.retry_budget_seconds,
+            progressive=request.progressive,
+            progressive_slice_size=request.progressive_slice_size,
+            job_id=request.job_id,
+            symbols=request.symbols,
+            shard_index=request.shard_index,
+            shard_count=request.shard_count,
         )
     except Exception as exc:
         logger.exception("Best fundamentals discovery failed")
@@ -355,6 +388,33 @@ def discover_best_fundamental_stocks(
     )
 
 
+@app.post("/discover-best-fundamentals/merge", response_model=StandardAgentResponse)
+def merge_best_fundamental_shards(
+    request: DiscoveryShardMergeRequest,
+    req: Request,
+):
+    correlation_id = req.headers.get("X-Correlation-ID")
+    try:
+        candidates, errors, metadata = merge_discovery_shards(request.shards, top_n=request.top_n)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    error_dict = _error_dict(errors) or {}
+    status = "success" if candidates else "error"
+    return build_response(
+        status=status,
+        data=ScannerContractResult(
+            scan_type="best_fundamentals",
+            count=len(candidates),
+            candidates=candidates,
+            metadata=metadata,
+            errors=error_dict,
+        ),
+        error=error_dict if not candidates else None,
+        metadata=_scanner_runtime_metadata(),
+        correlation_id=correlation_id,
+    )
+
+
 @app.post("/scan", response_model=StandardAgentResponse)
 def scan_stocks(request: ScanRequest, req: Request):
     correlation_id = req.headers.get("X-Correlation-ID")
@@ -377,6 +437,7 @@ def scan_stocks(request: ScanRequest, req: Request):
             symbols=symbols_to_scan,
             screener=screener,
             exchange=exchange,
+            technical_source=request.technical_source,
         )
     except Exception:
         logger.exception("Technical scan failed")
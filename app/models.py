@@ -22,6 +22,10 @@ class ScanRequest(BaseModel):
     symbols: Optional[List[str]] = Field(default=None, description="A list of stock symbols to scan. Defaults to a predefined list if empty.")
     screener: str = Field(default="thailand", description="The TradingView screener to use (e.g., 'thailand', 'america').")
     exchange: str = Field(default="SET", description="The stock exchange to use (e.g., 'SET', 'NASDAQ', 'NYSE').")
+    technical_source: Literal["tradingview", "local"] = Field(
+        default="tradingview",
+        description="Where technical indicators come from: per-batch TradingView requests, or computed locally from shared OHLCV history.",
+    )
 
 
 class BestFundamentalsRequest(BaseModel):
@@ -30,6 +34,24 @@ class BestFundamentalsRequest(BaseModel):
     top_n: int = Field(default=10, ge=1, le=50, description="Number of fundamentally strong candidates to return.")
     exchange: str = Field(default="NASDAQ", description="Primary US exchange to use for market data lookup.")
     max_workers: int = Field(default=10, ge=1, le=20, description="Concurrent workers for analysis.")
+    two_phase: bool = Field(default=False, description="Pre-screen the universe from quote/info fields and run statement analysis only on the best fraction.")
+    prescreen_fraction: float = Field(default=0.2, gt=0.0, le=1.0, description="Share of the pre-screened universe that gets statement analysis in two-phase mode.")
+    prescreen_audit_size: int = Field(default=20, ge=0, le=200, description="Dropped symbols fully analyzed to estimate how often the pre-screen misses a top-N name.")
+    retry_budget_seconds: float = Field(default=0.0, ge=0.0, le=600.0, description="Opt-in seconds spent retrying rate-limited or timed-out symbols at the end of the run; the default 0 disables retries so the request never sleeps.")
+    progressive: bool = Field(default=False, description="Analyze only the next slice of the universe and rank it together with stored scores from earlier runs.")
+    progressive_slice_size: int = Field(default=250, ge=1, le=6000, description="Universe symbols analyzed per run in progressive mode.")
+    job_id: Optional[str] = Field(default=None, pattern=r"^[A-Za-z0-9_.-]{1,128}$", description="Checkpoint finished symbols under this id; rerunning the same id and parameters resumes the job.")
+    symbols: Optional[List[str]] = Field(default=None, description="Explicit symbols to analyze instead of the built universe.")
+    shard_index: Optional[int] = Field(default=None, ge=0, description="Zero-based shard of the universe this request analyzes.")
+    shard_count: Optional[int] = Field(default=None, ge=1, le=256, description="Total number of shards the universe is split into.")
+
+    @model_validator(mode="after")
+    def check_shard(self):
+        if (self.shard_index is None) != (self.shard_count is None):
+            raise ValueError("shard_index and shard_count must be given together")
+        if self.shard_count is not None and self.shard_index >= self.shard_count:
+            raise ValueError("shard_index must be lower than shard_count")
+        return self
 
 
 class Candidate(BaseModel):
@@ -137,6 +159,11 @@ class ScannerContractResult(BaseModel):
     errors: Dict[str, str] = Field(default_factory=dict)
 
 
+class DiscoveryShardMergeRequest(BaseModel):
+    shards: List[ScannerContractResult] = Field(min_length=1, description="Discovery results returned by each shard.")
+    top_n: int = Field(default=10, ge=1, le=50, description="Number of candidates to keep after merging.")
+
+
 class ScannerResult(BaseModel):
     scan_type: str
     count: int
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
-import yfinance as yf
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
+from app.data_sources.price_history import get_price_history
 from app.utils.yfinance_frames import extract_yfinance_series
+from app.utils.ttl_cache import ttl_cache
+
+
+# Roughly six months of daily bars.
+BACKTEST_HISTORY_BARS = 126
+# Daily-bar statistics only change meaningfully between sessions.
+BACKTEST_CACHE_TTL_SECONDS = 6 * 60 * 60
+BACKTEST_MA_WINDOW = 20
+BACKTEST_FORWARD_BARS = 5
+# Symbols per matrix block; bounds the contiguous MA-window copy.
+BACKTEST_MATRIX_BLOCK_ROWS = 256
 
 
 @dataclass
@@ -30,81 +43,26 @@ def _pct_return(start: Optional[float], end: Optional[float]) -> Optional[float]
     return (end - start) / start
 
 
-@lru_cache(maxsize=512)
-def get_backtest_result(symbol: str) -> BacktestResult:
-    symbol = symbol.upper().strip()
-    reasons: list[str] = []
-
-    try:
-        history = yf.download(
-            symbol,
-            period="6mo",
-            interval="1d",
-            progress=False,
-            auto_adjust=True,
-        )
-        closes = extract_yfinance_series(history, "Close", symbol)
-    except Exception as exc:
-        return BacktestResult(
-            symbol=symbol,
-            current_price=None,
-            return_5d=None,
-            return_20d=None,
-            win_rate=None,
-            score=0.50,
-            reason=[f"ดึงข้อมูลย้อนหลังไม่สำเร็จ: {exc}"],
-        )
-
-    if closes.empty:
-        return BacktestResult(
-            symbol=symbol,
-            current_price=None,
-            return_5d=None,
-            return_20d=None,
-            win_rate=None,
-            score=0.50,
-            reason=["ไม่มีข้อมูลราคาย้อนหลังเพียงพอสำหรับ Backtest"],
-        )
-
-    if len(closes) < 25:
-        return BacktestResult(
-            symbol=symbol,
-            current_price=float(closes.iloc[-1]),
-            return_5d=None,
-            return_20d=None,
-            win_rate=None,
-            score=0.50,
-            reason=["ข้อมูลย้อนหลังน้อยเกินไปสำหรับคำนวณ Win Rate"],
-        )
-
-    current_price = float(closes.iloc[-1])
-    return_5d = (
-        _pct_return(float(closes.iloc[-6]), current_price)
-        if len(closes) >= 6
-        else None
-    )
-    return_20d = (
-        _pct_return(float(closes.iloc[-21]), current_price)
-        if len(closes) >= 21
-        else None
+def _failed_result(symbol: str, reason: str, current_price: Optional[float] = None) -> BacktestResult:
+    return BacktestResult(
+        symbol=symbol,
+        current_price=current_price,
+        return_5d=None,
+        return_20d=None,
+        win_rate=None,
+        score=0.50,
+        reason=[reason],
     )
 
-    forward_returns = []
-    for i in range(20, len(closes) - 5):
-        current = float(closes.iloc[i])
-        ma20 = float(closes.iloc[i - 20 : i].mean())
-        if current > ma20:
-            forward_returns.append(
-                _pct_return(current, float(closes.iloc[i + 5]))
-            )
-
-    clean_forward_returns = [r for r in forward_returns if r is not None]
-    win_rate = None
-    if clean_forward_returns:
-        win_rate = sum(1 for r in clean_forward_returns if r > 0) / len(
-            clean_forward_returns
-        )
 
+def _scored_result(
+    symbol: str,
+    current_price: float,
+    return_5d: Optional[float],
+    return_20d: Optional[float],
+    win_rate: Optional[float],
+) -> BacktestResult:
+    reasons: list[str] = []
     score_parts = []
     if return_5d is not None:
         score_parts.append(_clamp01((return_5d + 0.08) / 0.16))
@@ -143,6 +101,145 @@ def get_backtest_result(symbol: str) -> BacktestResult:
     )
 
 
+def _close_matrix(series: List[pd.Series]) -> Tuple[np.ndarray, np.ndarray]:
+    """Right-align each symbol's closes so column -k is every symbol's k-th last bar.
+
+    Symbols with shorter histories are left-padded with NaN; the returned
+    lengths mark where each row's real data starts.
+    """
+
+    lengths = np.array([len(closes) for closes in series], dtype=np.int64)
+    matrix = np.full((len(series), int(lengths.max())), np.nan)
+    for row, closes in enumerate(series):
+        if len(closes):
+            matrix[row, matrix.shape[1] - len(closes) :] = closes.to_numpy(dtype=float)
+    return matrix, lengths
+
+
+def _trailing_return(matrix: np.ndarray, lengths: np.ndarray, bars_back: int) -> List[Optional[float]]:
+    if matrix.shape[1] <= bars_back:
+        return [None] * len(matrix)
+    start = matrix[:, -1 - bars_back]
+    end = matrix[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (end - start) / start
+    valid = (lengths > bars_back) & (start != 0)
+    return [float(value) if ok else None for value, ok in zip(returns, valid)]
+
+
+def _ma20_win_rates(matrix: np.ndarray, lengths: np.ndarray) -> List[Optional[float]]:
+    """Share of days closing above the prior 20-day mean that were up 5 days later.
+
+    All symbols and days are evaluated at once. Each window is copied into
+    contiguous memory before summing so NumPy reduces it exactly like the
+    per-day ``Series.mean()`` it replaces, keeping the comparisons identical.
+    """
+
+    width = matrix.shape[1]
+    days = width - BACKTEST_MA_WINDOW - BACKTEST_FORWARD_BARS
+    if days <= 0:
+        return [None] * len(matrix)
+    windows = np.ascontiguousarray(
+        sliding_window_view(matrix, BACKTEST_MA_WINDOW, axis=1)[:, :days]
+    )
+    ma20 = windows.sum(axis=-1) / BACKTEST_MA_WINDOW
+    current = matrix[:, BACKTEST_MA_WINDOW : BACKTEST_MA_WINDOW + days]
+    forward = matrix[:, BACKTEST_MA_WINDOW + BACKTEST_FORWARD_BARS :]
+    first_day = (width - lengths + BACKTEST_MA_WINDOW)[:, None]
+    day_index = np.arange(BACKTEST_MA_WINDOW, BACKTEST_MA_WINDOW + days)[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        forward_returns = (forward - current) / current
+        signals = (day_index >= first_day) & (current > ma20) & (current != 0)
+    signal_counts = signals.sum(axis=1)
+    win_counts = (signals & (forward_returns > 0)).sum(axis=1)
+    return [
+        int(wins) / int(count) if count else None
+        for wins, count in zip(win_counts, signal_counts)
+    ]
+
+
+def backtest_close_matrix(closes: Mapping[str, pd.Series]) -> Dict[str, BacktestResult]:
+    """Backtest many symbols in one pass over a symbols x days close matrix.
+
+    ``closes`` maps each symbol to its clean close series (oldest first).
+    Results are identical to running the former per-symbol loop on each
+    series; rows are processed in blocks to bound the window-copy memory.
+    """
+
+    results: Dict[str, BacktestResult] = {}
+    ready: List[Tuple[str, pd.Series]] = []
+    for symbol, series in closes.items():
+        if series.empty:
+            results[symbol] = _failed_result(symbol, "ไม่มีข้อมูลราคาย้อนหลังเพียงพอสำหรับ Backtest")
+        elif len(series) < BACKTEST_MA_WINDOW + BACKTEST_FORWARD_BARS:
+            results[symbol] = _failed_result(
+                symbol,
+                "ข้อมูลย้อนหลังน้อยเกินไปสำหรับคำนวณ Win Rate",
+                current_price=float(series.iloc[-1]),
+            )
+        else:
+            ready.append((symbol, series))
+
+    for start in range(0, len(ready), BACKTEST_MATRIX_BLOCK_ROWS):
+        block = ready[start : start + BACKTEST_MATRIX_BLOCK_ROWS]
+        matrix, lengths = _close_matrix([series for _, series in block])
+        returns_5d = _trailing_return(matrix, lengths, 5)
+        returns_20d = _trailing_return(matrix, lengths, 20)
+        win_rates = _ma20_win_rates(matrix, lengths)
+        for row, (symbol, _) in enumerate(block):
+            results[symbol] = _scored_result(
+                symbol,
+                float(matrix[row, -1]),
+                returns_5d[row],
+                returns_20d[row],
+                win_rates[row],
+            )
+    return results
+
+
+def _load_closes(symbol: str) -> pd.Series:
+    history = get_price_history(symbol, BACKTEST_HISTORY_BARS)
+    return extract_yfinance_series(history, "Close", symbol)
+
+
+@ttl_cache(BACKTEST_CACHE_TTL_SECONDS, maxsize=512)
+def get_backtest_result(symbol: str) -> BacktestResult:
+    symbol = symbol.upper().strip()
+    try:
+        closes = _load_closes(symbol)
+    except Exception as exc:
+        return _failed_result(symbol, f"ดึงข้อมูลย้อนหลังไม่สำเร็จ: {exc}")
+    return backtest_close_matrix({symbol: closes})[symbol]
+
+
+def get_backtest_results(symbols: Iterable[str]) -> Dict[str, BacktestResult]:
+    """Backtest many symbols together and seed the per-symbol cache.
+
+    Cached symbols are served as-is; the rest are backtested in one matrix
+    pass, so later ``get_backtest_result`` calls for them are cache hits.
+    """
+
+    results: Dict[str, BacktestResult] = {}
+    closes: Dict[str, pd.Series] = {}
+    for symbol in dict.fromkeys(str(symbol or "").upper().strip() for symbol in symbols):
+        if not symbol:
+            continue
+        found, cached = get_backtest_result.cache.get((symbol,))
+        if found:
+            results[symbol] = cached
+            continue
+        try:
+            closes[symbol] = _load_closes(symbol)
+        except Exception as exc:
+            results[symbol] = _failed_result(symbol, f"ดึงข้อมูลย้อนหลังไม่สำเร็จ: {exc}")
+            get_backtest_result.cache.set((symbol,), results[symbol])
+
+    for symbol, result in backtest_close_matrix(closes).items():
+        get_backtest_result.cache.set((symbol,), result)
+        results[symbol] = result
+    return results
+
+
 def result_to_metadata(result: BacktestResult) -> Dict[str, object]:
     return {
         "symbol": result.symbol,
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import hashlib
+import json
+import re
+import threading
+import time
+
+from app.models import ErrorDetail, ScannerCandidateContract
+
+
+DEFAULT_CHECKPOINT_DIR = Path("data/discovery_checkpoints")
+# Checkpoints older than this are discarded instead of resumed.
+CHECKPOINT_MAX_AGE_SECONDS = 24 * 60 * 60
+_JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class DiscoveryCheckpoint:
+    """Append-only record of per-symbol discovery outcomes for one job.
+
+    The file is JSON lines: a header with the job id and parameter hash,
+    then one line per finished symbol. Appending keeps each write O(1) and a
+    line torn by a crash is simply ignored on load. A later line for the
+    same symbol (e.g. a successful retry) replaces the earlier one. The
+    header may also carry the job's symbol ``plan`` (e.g. a two-phase
+    pre-screen), so a resumed job runs the same symbols without redoing it.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        params: Dict[str, Any],
+        directory: Path = DEFAULT_CHECKPOINT_DIR,
+        max_age_seconds: float = CHECKPOINT_MAX_AGE_SECONDS,
+    ):
+        if not _JOB_ID_PATTERN.match(str(job_id or "")):
+            raise ValueError(f"invalid discovery job id: {job_id!r}")
+        self.job_id = job_id
+        self.params_hash = params_hash(params)
+        self.path = directory / f"{job_id}.jsonl"
+        self.max_age_seconds = float(max_age_seconds)
+        self._lock = threading.Lock()
+        self._outcomes: Dict[str, Dict[str, Any]] = {}
+        self._header: Dict[str, Any] = {}
+        self.resumed = False
+        self._open()
+
+    def _open(self) -> None:
+        if self.path.exists() and self._load():
+            self.resumed = True
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._header = {"job_id": self.job_id, "params_hash": self.params_hash, "created_at": time.time()}
+        with self.path.open("w", encoding="utf-8") as file:
+            file.write(json.dumps(self._header) + "\n")
+
+    def _load(self) -> bool:
+        """Read an existing checkpoint; False when it belongs to other params or is stale."""
+
+        try:
+            with self.path.open("r", encoding="utf-8") as file:
+                lines = file.read().splitlines()
+            header = json.loads(lines[0]) if lines else {}
+        except Exception:
+            return False
+        if header.get("params_hash") != self.params_hash:
+            return False
+        if time.time() - float(header.get("created_at") or 0) > self.max_age_seconds:
+            return False
+        self._header = header
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+                self._outcomes[str(record["symbol"])] = record
+            except Exception:
+                continue
+        return True
+
+    def restore(
+        self, symbols: List[str]
+    ) -> Tuple[List[ScannerCandidateContract], List[ErrorDetail], List[str]]:
+        """Split ``symbols`` into checkpointed candidates, errors and symbols still to run."""
+
+        candidates: List[ScannerCandidateContract] = []
+        errors: List[ErrorDetail] = []
+        remaining: List[str] = []
+        for symbol in symbols:
+            record = self._outcomes.get(symbol)
+            try:
+                if record and record.get("candidate"):
+                    candidates.append(ScannerCandidateContract.model_validate(record["candidate"]))
+                    continue
+                if record and record.get("error") is not None:
+                    errors.append(ErrorDetail(symbol=symbol, error=str(record["error"])))
+                    continue
+            except Exception:
+                pass
+            remaining.append(symbol)
+        return candidates, errors, remaining
+
+    @property
+    def plan(self) -> Optional[Dict[str, Any]]:
+        plan = self._header.get("plan")
+        return plan if isinstance(plan, dict) else None
+
+    def save_plan(self, plan: Dict[str, Any]) -> None:
+        """Store ``plan`` in the header, rewriting the file with the outcomes so far."""
+
+        with self._lock:
+            self._header = {**self._header, "plan": plan}
+            lines = [json.dumps(self._header, default=str)]
+            lines.extend(json.dumps(record, default=str) for record in self._outcomes.values())
+            temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with temp_path.open("w", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+            temp_path.replace(self.path)
+
+    def record_candidate(self, symbol: str, candidate: ScannerCandidateContract) -> None:
+        self._append({"symbol": symbol, "candidate": candidate.model_dump(mode="json")})
+
+    def record_error(self, symbol: str, error: str) -> None:
+        self._append({"symbol": symbol, "error": error})
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self._outcomes[record["symbol"]] = record
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write(line)
+                file.flush()
+
+    @property
+    def completed_count(self) -> int:
+        with self._lock:
+            return len(self._outcomes)
+
+
+def open_checkpoint(
+    job_id: Optional[str],
+    params: Dict[str, Any],
+    directory: Optional[Path] = None,
+) -> Optional[DiscoveryCheckpoint]:
+    if not job_id:
+        return None
+    return DiscoveryCheckpoint(job_id, params, directory=directory or DEFAULT_CHECKPOINT_DIR)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import json
+import threading
+import time
+
+from app.models import ScannerCandidateContract
+
+
+DEFAULT_DISCOVERY_PROGRESS_PATH = Path("data/discovery_progress.json")
+# Stored scores older than this are not merged into the ranking any more.
+PROGRESSIVE_SCORE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class DiscoveryProgress:
+    """Rolling coverage of the discovery universe across scheduled runs.
+
+    A pass walks the universe order in slices. Every attempted symbol records
+    when it was attempted and, on success, its candidate payload, so later
+    runs rank the newest slice together with the stored scores of earlier
+    ones. Slices are chosen by "not yet attempted in this pass" rather than
+    by an offset, so names added to or dropped from the universe between
+    runs do not shift the walk.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_DISCOVERY_PROGRESS_PATH,
+        clock: Callable[[], float] = time.time,
+        max_score_age_seconds: float = PROGRESSIVE_SCORE_MAX_AGE_SECONDS,
+    ):
+        self.path = path
+        self.max_score_age_seconds = float(max_score_age_seconds)
+        self._clock = clock
+        self._state: Optional[Dict[str, Any]] = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Any]:
+        if self._state is not None:
+            return self._state
+        state: Dict[str, Any] = {}
+        if self.path.exists():
+            try:
+                with self.path.open("r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if isinstance(data, dict):
+                    state = data
+            except Exception:
+                state = {}
+        state.setdefault("pass_started_at", None)
+        state.setdefault("pass_count", 0)
+        if not isinstance(state.get("symbols"), dict):
+            state["symbols"] = {}
+        self._state = state
+        return state
+
+    def next_slice(self, universe: List[str], size: int) -> Dict[str, Any]:
+        """Pick the next ``size`` symbols of the universe order to analyze.
+
+        Symbols not attempted since the current pass started come first. When
+        the pass has covered the whole universe a new pass begins.
+        """
+
+        with self._lock:
+            state = self._load()
+            now = self._clock()
+            started = state["pass_started_at"]
+            completed_pass = False
+            pending = self._pending(universe, started)
+            if started is None or not pending:
+                completed_pass = started is not None
+                state["pass_started_at"] = started = now
+                state["pass_count"] = int(state["pass_count"]) + 1
+                pending = list(universe)
+            size = max(1, int(size))
+            return {
+                "symbols": pending[:size],
+                "pass_count": state["pass_count"],
+                "pass_started_at": _iso(started),
+                "previous_pass_completed": completed_pass,
+                "remaining_in_pass": max(0, len(pending) - size),
+            }
+
+    def _pending(self, universe: List[str], started: Optional[float]) -> List[str]:
+        if started is None:
+            return list(universe)
+        entries = self._state["symbols"]
+        return [
+            symbol
+            for symbol in universe
+            if float((entries.get(symbol) or {}).get("attempted_at") or 0) < started
+        ]
+
+    def record(
+        self,
+        attempted: List[str],
+        candidates: List[ScannerCandidateContract],
+    ) -> None:
+        """Store this slice; failed symbols keep their last good score."""
+
+        with self._lock:
+            state = self._load()
+            now = self._clock()
+            entries = state["symbols"]
+            for symbol in attempted:
+                entries.setdefault(symbol, {})["attempted_at"] = now
+            for candidate in candidates:
+                entry = entries.setdefault(candidate.symbol, {})
+                entry["attempted_at"] = now
+                entry["scored_at"] = now
+                entry["candidate"] = candidate.model_dump(mode="json")
+
+    def stored_candidates(self, universe: List[str]) -> List[ScannerCandidateContract]:
+        """Stored candidates of universe symbols whose score is recent enough.
+
+        Each candidate's metadata carries ``scored_at`` and
+        ``score_age_seconds`` so consumers can see how fresh every row is.
+        """
+
+        with self._lock:
+            state = self._load()
+            now = self._clock()
+            entries = state["symbols"]
+            candidates = []
+            for symbol in universe:
+                entry = entries.get(symbol) or {}
+                scored_at = entry.get("scored_at")
+                payload = entry.get("candidate")
+                if scored_at is None or not payload:
+                    continue
+                age = now - float(scored_at)
+                if age > self.max_score_age_seconds:
+                    continue
+                try:
+                    candidate = ScannerCandidateContract.model_validate(payload)
+                except Exception:
+                    continue
+                candidate.metadata["scored_at"] = _iso(float(scored_at))
+                candidate.metadata["score_age_seconds"] = round(age, 1)
+                candidates.append(candidate)
+            return candidates
+
+    def coverage(self, universe: List[str]) -> Dict[str, Any]:
+        with self._lock:
+            state = self._load()
+            now = self._clock()
+            entries = state["symbols"]
+            scored = [
+                float(entries[symbol]["scored_at"])
+                for symbol in universe
+                if (entries.get(symbol) or {}).get("scored_at") is not None
+                and now - float(entries[symbol]["scored_at"]) <= self.max_score_age_seconds
+            ]
+            attempted = sum(1 for symbol in universe if (entries.get(symbol) or {}).get("attempted_at"))
+            return {
+                "progressive_scored_count": len(scored),
+                "progressive_attempted_count": attempted,
+                "progressive_coverage_ratio": round(len(scored) / len(universe), 4) if universe else 0.0,
+                "progressive_oldest_score_at": _iso(min(scored)) if scored else None,
+                "progressive_newest_score_at": _iso(max(scored)) if scored else None,
+            }
+
+    def prune(self) -> int:
+        """Forget symbols not attempted within the score age limit."""
+
+        with self._lock:
+            entries = self._load()["symbols"]
+            cutoff = self._clock() - self.max_score_age_seconds
+            removed = [
+                symbol
+                for symbol, entry in entries.items()
+                if float(entry.get("attempted_at") or 0) < cutoff
+            ]
+            for symbol in removed:
+                del entries[symbol]
+            return len(removed)
+
+    def save(self) -> None:
+        with self._lock:
+            if self._state is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with temp_path.open("w", encoding="utf-8") as file:
+                json.dump(self._state, file, ensure_ascii=False, sort_keys=True)
+            temp_path.replace(self.path)
+
+
+_PROGRESS = DiscoveryProgress()
+
+
+def get_discovery_progress() -> DiscoveryProgress:
+    return _PROGRESS
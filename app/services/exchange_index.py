@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import json
+import threading
+import time
+
+from app.universe import load_listing_exchanges
+
+
+DEFAULT_EXCHANGE_INDEX_PATH = Path("data/exchange_index.json")
+# An exchange that returned nothing is demoted only this long, so one
+# transient empty response does not hide a listing for good.
+FAILED_EXCHANGE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _timestamp(value: object) -> float:
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _entry_failures(entry: Dict[str, object]) -> Dict[str, float]:
+    """Failed exchange -> time it failed; older files stored a bare list."""
+
+    failed = entry.get("failed") or {}
+    if isinstance(failed, dict):
+        return {str(exchange): float(at or 0) for exchange, at in failed.items()}
+    failed_at = _timestamp(entry.get("updated_at"))
+    return {str(exchange): failed_at for exchange in failed}
+
+
+class ExchangeIndex:
+    """Symbol -> TradingView exchange resolution shared across scans.
+
+    Seeds come from the nasdaqtrader listing files. Learned entries record the
+    exchange that actually returned analysis and the exchanges that returned
+    nothing; they override the seed and are persisted between processes.
+    Failed exchanges age out after ``failed_ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_EXCHANGE_INDEX_PATH,
+        seed_loader: Callable[[], Dict[str, str]] = load_listing_exchanges,
+        clock: Callable[[], float] = time.time,
+        failed_ttl_seconds: float = FAILED_EXCHANGE_TTL_SECONDS,
+    ):
+        self.path = path
+        self.failed_ttl_seconds = float(failed_ttl_seconds)
+        self._clock = clock
+        self._seed_loader = seed_loader
+        self._seed: Optional[Dict[str, str]] = None
+        self._learned: Optional[Dict[str, Dict[str, object]]] = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self) -> None:
+        if self._learned is not None:
+            return
+        learned: Dict[str, Dict[str, object]] = {}
+        if self.path.exists():
+            try:
+                with self.path.open("r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if isinstance(data, dict):
+                    learned = {
+                        str(symbol).upper(): entry
+                        for symbol, entry in data.items()
+                        if isinstance(entry, dict)
+                    }
+            except Exception:
+                learned = {}
+        self._learned = learned
+
+    def _seed_exchange(self, symbol: str) -> Optional[str]:
+        if self._seed is None:
+            try:
+                self._seed = dict(self._seed_loader() or {})
+            except Exception:
+                self._seed = {}
+        return self._seed.get(symbol)
+
+    def resolved_exchange(self, symbol: str) -> Optional[str]:
+        symbol = str(symbol or "").upper().strip()
+        with self._lock:
+            self._load()
+            entry = self._learned.get(symbol) or {}
+            exchange = entry.get("exchange")
+            if exchange:
+                return str(exchange)
+            return self._seed_exchange(symbol)
+
+    def _live_failures(self, entry: Dict[str, object]) -> Dict[str, float]:
+        cutoff = self._clock() - self.failed_ttl_seconds
+        return {exchange: at for exchange, at in _entry_failures(entry).items() if at >= cutoff}
+
+    def failed_exchanges(self, symbol: str) -> List[str]:
+        symbol = str(symbol or "").upper().strip()
+        with self._lock:
+            self._load()
+            return list(self._live_failures(self._learned.get(symbol) or {}))
+
+    def is_resolved(self, symbol: str, candidates: Optional[Iterable[str]] = None) -> bool:
+        """True when the known exchange has not failed and, if given, is one of ``candidates``."""
+
+        known = self.resolved_exchange(symbol)
+        if candidates is not None and known not in set(candidates):
+            return False
+        return bool(known) and known not in self.failed_exchanges(symbol)
+
+    def order_candidates(self, symbol: str, candidates: Iterable[str]) -> List[str]:
+        """Put the known exchange first and exchanges that returned nothing last.
+
+        The known exchange is only promoted when it is one of ``candidates``;
+        a listing on an exchange the caller never probes (e.g. CBOE) is ignored.
+        """
+
+        ordered = list(dict.fromkeys(candidates))
+        known = self.resolved_exchange(symbol)
+        failed = set(self.failed_exchanges(symbol))
+        if known in failed or known not in ordered:
+            known = None
+        head = [known] if known else []
+        rest = [exchange for exchange in ordered if exchange != known]
+        return head + [exchange for exchange in rest if exchange not in failed] + [
+            exchange for exchange in rest if exchange in failed
+        ]
+
+    def record_success(self, symbol: str, exchange: str) -> None:
+        symbol = str(symbol or "").upper().strip()
+        exchange = str(exchange or "").upper().strip()
+        if not symbol or not exchange:
+            return
+        with self._lock:
+            self._load()
+            entry = self._learned.get(symbol) or {}
+            failures = _entry_failures(entry)
+            failed = {item: at for item, at in self._live_failures(entry).items() if item != exchange}
+            if entry.get("exchange") == exchange and failures == failed:
+                return
+            self._learned[symbol] = {
+                "exchange": exchange,
+                "failed": failed,
+                "updated_at": _now_iso(),
+            }
+            self._dirty = True
+
+    def record_failure(self, symbol: str, exchanges: Iterable[str]) -> None:
+        symbol = str(symbol or "").upper().strip()
+        exchanges = [str(exchange).upper().strip() for exchange in exchanges if exchange]
+        if not symbol or not exchanges:
+            return
+        with self._lock:
+            self._load()
+            entry = dict(self._learned.get(symbol) or {})
+            failed = self._live_failures(entry)
+            new_failures = [exchange for exchange in exchanges if exchange not in failed]
+            if not new_failures and entry.get("exchange") not in exchanges:
+                return
+            now = self._clock()
+            entry["failed"] = {**failed, **{exchange: now for exchange in new_failures}}
+            if entry.get("exchange") in exchanges:
+                entry.pop("exchange", None)
+            entry["updated_at"] = _now_iso()
+            self._learned[symbol] = entry
+            self._dirty = True
+
+    def save(self) -> bool:
+        with self._lock:
+            if not self._dirty or self._learned is None:
+                return False
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with temp_path.open("w", encoding="utf-8") as file:
+                json.dump(self._learned, file, ensure_ascii=False, indent=2, sort_keys=True)
+            temp_path.replace(self.path)
+            self._dirty = False
+            return True
+
+
+_INDEX = ExchangeIndex()
+
+
+def get_exchange_index() -> ExchangeIndex:
+    return _INDEX
@@ -7,11 +7,14 @@ from statistics import mean
 from typing import Dict, Iterable, List, Optional
 
 import json
-import yfinance as yf
+
+from app.data_sources.price_history import get_price_history
+from app.utils.yfinance_frames import extract_yfinance_series
 
 
 DEFAULT_FEEDBACK_PATH = Path("data/feedback_history.jsonl")
 DEFAULT_HORIZONS = (1, 5, 10)
+LATEST_PRICE_BARS = 5
 
 
 @dataclass
@@ -63,10 +66,8 @@ def _days_between(start: Optional[datetime], end: Optional[datetime] = None) ->
 
 def _latest_price(symbol: str) -> Optional[float]:
     try:
-        history = yf.download(symbol, period="5d", interval="1d", progress=False, auto_adjust=True)
-        if history is None or history.empty or "Close" not in history:
-            return None
-        close = history["Close"].dropna()
+        history = get_price_history(symbol, LATEST_PRICE_BARS)
+        close = extract_yfinance_series(history, "Close", symbol)
         if close.empty:
             return None
         return _safe_float(close.iloc[-1])
@@ -2,14 +2,27 @@ from __future__ import annotations
 
 from collections import Counter, defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import heapq
 import math
-from typing import Any, Dict, List, Optional, Tuple
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.analyzers import growth_analyzer, quality_analyzer, valuation_analyzer
+from app.analyzers.requirements import required_statement_kinds
 from app.data_sources import financial_statements, market_data
-from app.models import ErrorDetail, ScannerCandidateContract
+from app.models import ErrorDetail, ScannerCandidateContract, ScannerContractResult
 from app.scoring import fundamental_score
 from app.services.bucket_hints import build_strategy_bucket_hints
+from app.services.discovery_checkpoint import DiscoveryCheckpoint, open_checkpoint
+from app.services.discovery_progress import get_discovery_progress
+from app.services.fundamental_score import (
+    FundamentalScoreResult,
+    fundamental_error_result,
+    score_fundamental_info,
+)
+from app.services.negative_cache import get_negative_cache
+from app.utils.provider_limits import provider_concurrency, reasons_outcome
 from app.universe import (
     US_GROWTH_UNIVERSE,
     US_LARGE_CAP_FALLBACK,
@@ -21,8 +34,28 @@ from app.universe import (
 )
 
 _NON_TRADABLE_DISCOVERY_SYMBOLS = {"CASH", "USD", "USDT", "USDC"}
-_MAX_PROVIDER_WORKERS = 4
 _ERROR_SAMPLE_LIMIT = 5
+# Two-phase discovery: share of the pre-screened universe that gets the
+# statement analysis, never fewer than top_n * PRESCREEN_MIN_KEEP_MULTIPLE.
+DEFAULT_PRESCREEN_FRACTION = 0.2
+PRESCREEN_MIN_KEEP_MULTIPLE = 3
+DEFAULT_PRESCREEN_AUDIT_SIZE = 20
+# Symbols that fail with a provider-pressure category are retried at the
+# tail of the run with exponential backoff and full jitter, inside a budget.
+# Retries sleep inside the request, so they are opt-in (budget 0 = off).
+RETRYABLE_ERROR_CATEGORIES = frozenset({"provider_rate_limited", "provider_timeout"})
+DEFAULT_RETRY_BUDGET_SECONDS = 0.0
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY_SECONDS = 2.0
+RETRY_MAX_DELAY_SECONDS = 30.0
+# Progressive discovery analyzes this many universe symbols per run.
+DEFAULT_PROGRESSIVE_SLICE_SIZE = 250
+# Discovery reads every quality and growth metric, which needs no quarterly
+# balance sheet unless a symbol has no annual one.
+_DISCOVERY_STATEMENTS = frozenset(
+    required_statement_kinds(quality_analyzer.STATEMENT_REQUIREMENTS)
+    | required_statement_kinds(growth_analyzer.STATEMENT_REQUIREMENTS)
+)
 
 
 def _is_discoverable_stock_symbol(symbol: str) -> bool:
@@ -103,7 +136,13 @@ def _initial_coverage(symbols: List[str]) -> List[str]:
 
 
 def build_us_fundamental_universe(max_universe: int = 1000) -> Dict[str, Any]:
-    """Build a broad, deterministic, common-equity US universe."""
+    """Build a broad, deterministic, common-equity US universe.
+
+    The ``max_universe`` cap is applied to the fixed source order and no
+    local state is consulted, so every process builds the same list and
+    shards cut from it line up. Negative-cache hits are skipped later, by
+    ``discover_best_fundamentals``, inside the partition a process runs.
+    """
 
     live_sp500 = load_sp500_symbols()
     live_nasdaq100 = load_nasdaq100_symbols()
@@ -175,7 +214,11 @@ def analyze_fundamental_candidate(
         raise ValueError(f"non-tradable discovery symbol: {symbol}")
 
     financials, financial_diagnostics = (
-        financial_statements.get_financials_with_diagnostics(symbol, exchange)
+        financial_statements.get_financials_with_diagnostics(
+            symbol,
+            exchange,
+            statements=_DISCOVERY_STATEMENTS,
+        )
     )
     if not financials:
         if financial_diagnostics.get("status") == "provider_error":
@@ -384,25 +427,18 @@ def _error_diagnostics(errors: List[ErrorDetail]) -> Dict[str, Any]:
     }
 
 
-def discover_best_fundamentals(
-    max_universe: int = 1000,
-    top_n: int = 10,
-    exchange: str = "NASDAQ",
-    max_workers: int = 10,
-) -> Tuple[List[ScannerCandidateContract], List[ErrorDetail], Dict[str, Any]]:
-    universe_info = build_us_fundamental_universe(max_universe=max_universe)
-    symbols = [
-        symbol
-        for symbol in universe_info["symbols"]
-        if _is_discoverable_stock_symbol(symbol)
-    ]
+def _analyze_symbols(
+    symbols: List[str],
+    exchange: str,
+    workers: int,
+    checkpoint: Optional[DiscoveryCheckpoint] = None,
+) -> Tuple[List[ScannerCandidateContract], List[ErrorDetail]]:
     candidates: List[ScannerCandidateContract] = []
     errors: List[ErrorDetail] = []
-    effective_workers = max(1, min(int(max_workers), _MAX_PROVIDER_WORKERS))
-
-    with ThreadPoolExecutor(max_workers=effective_workers) as executor:
+    controller = provider_concurrency("yfinance")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
         future_to_symbol = {
-            executor.submit(analyze_fundamental_candidate, symbol, exchange): symbol
+            executor.submit(controller.call, analyze_fundamental_candidate, symbol, exchange): symbol
             for symbol in symbols
         }
         for future in as_completed(future_to_symbol):
@@ -411,23 +447,419 @@ def discover_best_fundamentals(
                 candidate = future.result()
                 if _is_discoverable_stock_symbol(candidate.symbol):
                     candidates.append(candidate)
+                    if checkpoint is not None:
+                        checkpoint.record_candidate(symbol, candidate)
             except Exception as exc:
                 errors.append(ErrorDetail(symbol=symbol, error=str(exc)))
+                if checkpoint is not None:
+                    checkpoint.record_error(symbol, str(exc))
+    return candidates, errors
 
-    candidates.sort(
-        key=lambda candidate: (
-            candidate.candidate_score or 0.0,
-            candidate.raw_scores.get("evidence_coverage") or 0.0,
-            candidate.raw_scores.get("quality_score") or 0.0,
-            candidate.raw_scores.get("growth_score") or 0.0,
-            candidate.raw_scores.get("revenue_3y_cagr") or 0.0,
-            candidate.raw_scores.get("fcf_growth") or 0.0,
-            candidate.raw_scores.get("valuation_score") or 0.0,
-        ),
-        reverse=True,
+
+def _retry_delay(attempt: int, rng: random.Random) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt`` (1-based)."""
+
+    ceiling = min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+    return rng.uniform(0.0, ceiling)
+
+
+def _retry_failed_symbols(
+    errors: List[ErrorDetail],
+    exchange: str,
+    workers: int,
+    budget_seconds: float,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+    rng: Optional[random.Random] = None,
+    checkpoint: Optional[DiscoveryCheckpoint] = None,
+) -> Tuple[List[ScannerCandidateContract], List[ErrorDetail], Dict[str, Any]]:
+    """Retry rate-limited and timed-out symbols before the run finishes.
+
+    Each retryable symbol waits a jittered, exponentially growing delay so
+    the retries do not hit the provider in one burst. Due symbols are
+    analyzed together. A retry that fails for the same reasons is queued
+    again until ``RETRY_MAX_ATTEMPTS`` is reached or the next attempt would
+    start after the budget runs out. Returns the recovered candidates, the
+    errors that remain (one per symbol) and the retry statistics.
+    """
+
+    rng = rng or random.Random()
+    started = clock()
+    deadline = started + max(0.0, float(budget_seconds))
+    final_errors: Dict[str, ErrorDetail] = {}
+    queue: List[Tuple[float, str, int]] = []
+    for error in errors:
+        final_errors[error.symbol] = error
+        if budget_seconds > 0 and _classify_discovery_error(error.error) in RETRYABLE_ERROR_CATEGORIES:
+            heapq.heappush(queue, (started + _retry_delay(1, rng), error.symbol, 1))
+    queued_count = len(queue)
+
+    recovered: List[ScannerCandidateContract] = []
+    attempts = 0
+    budget_exhausted = False
+    while queue:
+        ready_at = queue[0][0]
+        if ready_at > deadline:
+            budget_exhausted = True
+            break
+        wait = ready_at - clock()
+        if wait > 0:
+            sleep(wait)
+        now = clock()
+        due: Dict[str, int] = {}
+        while queue and queue[0][0] <= now:
+            _, symbol, attempt = heapq.heappop(queue)
+            due[symbol] = attempt
+        attempts += len(due)
+        candidates, retry_errors = _analyze_symbols(list(due), exchange, workers, checkpoint)
+        for candidate in candidates:
+            final_errors.pop(candidate.symbol, None)
+        recovered.extend(candidates)
+        for error in retry_errors:
+            final_errors[error.symbol] = error
+            attempt = due.get(error.symbol, RETRY_MAX_ATTEMPTS)
+            if attempt < RETRY_MAX_ATTEMPTS and _classify_discovery_error(error.error) in RETRYABLE_ERROR_CATEGORIES:
+                heapq.heappush(queue, (clock() + _retry_delay(attempt + 1, rng), error.symbol, attempt + 1))
+
+    remaining = [final_errors[error.symbol] for error in errors if error.symbol in final_errors]
+    stats = {
+        "retry_queued_count": queued_count,
+        "retry_attempt_count": attempts,
+        "retry_recovered_count": len(recovered),
+        "retry_yield": round(len(recovered) / queued_count, 4) if queued_count else None,
+        "retry_budget_seconds": budget_seconds,
+        "retry_elapsed_seconds": round(clock() - started, 3),
+        "retry_budget_exhausted": budget_exhausted,
+        "retry_abandoned_count": len(queue),
+    }
+    return recovered, remaining, stats
+
+
+def _update_negative_cache(
+    candidates: List[ScannerCandidateContract],
+    errors: List[ErrorDetail],
+) -> Dict[str, Any]:
+    cache = get_negative_cache()
+    for candidate in candidates:
+        cache.discard(candidate.symbol)
+    recorded = sum(
+        cache.record(error.symbol, _classify_discovery_error(error.error), error.error)
+        for error in errors
     )
+    cache.prune()
+    metadata: Dict[str, Any] = {"negative_cache_recorded_count": recorded}
+    try:
+        cache.save()
+    except Exception as exc:
+        metadata["negative_cache_save_error"] = str(exc)
+    return metadata
+
+
+def _candidate_sort_key(candidate: ScannerCandidateContract) -> Tuple[float, ...]:
+    return (
+        candidate.candidate_score or 0.0,
+        candidate.raw_scores.get("evidence_coverage") or 0.0,
+        candidate.raw_scores.get("quality_score") or 0.0,
+        candidate.raw_scores.get("growth_score") or 0.0,
+        candidate.raw_scores.get("revenue_3y_cagr") or 0.0,
+        candidate.raw_scores.get("fcf_growth") or 0.0,
+        candidate.raw_scores.get("valuation_score") or 0.0,
+    )
+
+
+def _fundamental_score_outcome(result: Any) -> str:
+    # A failed info fetch is a neutral score with the error as a reason.
+    return reasons_outcome(getattr(result, "reason", []))
+
+
+def _prescreen_score(symbol: str, exchange: str) -> FundamentalScoreResult:
+    """Score one symbol from its info fields.
+
+    The info goes through the statement warehouse, so the phase-2 statement
+    analysis of a kept symbol reuses it and only fetches statements.
+    """
+
+    try:
+        info = financial_statements.get_info(symbol, exchange)
+    except Exception as exc:
+        return fundamental_error_result(symbol, exc)
+    return score_fundamental_info(symbol, info)
+
+
+def _prescreen_scores(symbols: List[str], exchange: str, workers: int) -> Dict[str, float]:
+    """Phase 1: score every symbol from quote/info fields only (one info call each)."""
+
+    controller = provider_concurrency("yfinance")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                lambda symbol: controller.call_with_outcome(
+                    _prescreen_score, _fundamental_score_outcome, symbol, exchange
+                ),
+                symbols,
+            )
+        )
+    return {symbol: result.score for symbol, result in zip(symbols, results)}
+
+
+def _two_phase_plan(
+    symbols: List[str],
+    exchange: str,
+    top_n: int,
+    prescreen_fraction: float,
+    prescreen_audit_size: int,
+    workers: int,
+) -> Dict[str, Any]:
+    """Pre-screen ``symbols`` and pick the kept and audited symbols for phase 2."""
+
+    prescreen = _prescreen_scores(symbols, exchange, workers)
+    ranked = sorted(symbols, key=lambda symbol: prescreen[symbol], reverse=True)
+    keep_count = _prescreen_keep_count(len(ranked), top_n, prescreen_fraction)
+    analysis_symbols = ranked[:keep_count]
+    dropped = ranked[keep_count:]
+    return {
+        "analysis_symbols": analysis_symbols,
+        "audited": _audit_sample(dropped, prescreen_audit_size),
+        "prescreen_metadata": {
+            "discovery_mode": "two_phase",
+            "prescreen_source": "fundamental_score_info_fields",
+            "prescreen_fraction": prescreen_fraction,
+            "prescreen_kept_count": keep_count,
+            "prescreen_dropped_count": len(dropped),
+            "prescreen_cutoff_score": prescreen[analysis_symbols[-1]] if analysis_symbols else None,
+        },
+    }
+
+
+def _prescreen_keep_count(total: int, top_n: int, fraction: float) -> int:
+    keep = int(math.ceil(total * max(0.0, min(1.0, float(fraction)))))
+    return min(total, max(keep, top_n * PRESCREEN_MIN_KEEP_MULTIPLE))
+
+
+def _audit_sample(dropped: List[str], size: int) -> List[str]:
+    """Evenly spaced sample across the dropped ranking, best-ranked first."""
+
+    if size <= 0 or not dropped:
+        return []
+    if size >= len(dropped):
+        return list(dropped)
+    step = len(dropped) / size
+    return [dropped[int(index * step)] for index in range(size)]
+
+
+def _prescreen_recall(
+    top_candidates: List[ScannerCandidateContract],
+    audited: List[str],
+    dropped_count: int,
+    top_n: int,
+) -> Dict[str, Any]:
+    audited_set = set(audited)
+    missed = [candidate.symbol for candidate in top_candidates if candidate.symbol in audited_set]
+    if not audited:
+        return {
+            "prescreen_audit_count": 0,
+            "prescreen_audit_top_n_hits": [],
+            "prescreen_audit_miss_rate": None,
+            "prescreen_estimated_missed_top_n": None,
+            "prescreen_estimated_top_n_recall": None,
+        }
+    miss_rate = len(missed) / len(audited)
+    estimated_missed = min(float(top_n), miss_rate * dropped_count)
+    return {
+        "prescreen_audit_count": len(audited),
+        "prescreen_audit_top_n_hits": missed,
+        "prescreen_audit_miss_rate": round(miss_rate, 4),
+        "prescreen_estimated_missed_top_n": round(estimated_missed, 2),
+        "prescreen_estimated_top_n_recall": round(1.0 - estimated_missed / top_n, 4)
+        if top_n
+        else None,
+    }
+
+
+def shard_symbols(
+    symbols: List[str],
+    shard_index: Optional[int],
+    shard_count: Optional[int],
+) -> List[str]:
+    """Deterministic round-robin partition of the universe order.
+
+    Round-robin rather than contiguous ranges keeps every shard's mix of
+    large caps and listed fill, and so its provider cost, about equal.
+    """
+
+    if shard_index is None or shard_count is None:
+        raise ValueError("shard_index and shard_count must be given together")
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"invalid shard {shard_index} of {shard_count}")
+    return list(symbols)[shard_index::shard_count]
+
+
+def discover_best_fundamentals(
+    max_universe: int = 1000,
+    top_n: int = 10,
+    exchange: str = "NASDAQ",
+    max_workers: int = 10,
+    two_phase: bool = False,
+    prescreen_fraction: float = DEFAULT_PRESCREEN_FRACTION,
+    prescreen_audit_size: int = DEFAULT_PRESCREEN_AUDIT_SIZE,
+    retry_budget_seconds: float = DEFAULT_RETRY_BUDGET_SECONDS,
+    progressive: bool = False,
+    progressive_slice_size: int = DEFAULT_PROGRESSIVE_SLICE_SIZE,
+    job_id: Optional[str] = None,
+    symbols: Optional[List[str]] = None,
+    shard_index: Optional[int] = None,
+    shard_count: Optional[int] = None,
+) -> Tuple[List[ScannerCandidateContract], List[ErrorDetail], Dict[str, Any]]:
+    """Rank the broad US universe by statement-based fundamentals.
+
+    With ``two_phase`` the whole universe is first pre-screened from cheap
+    quote/info fields and only the best ``prescreen_fraction`` gets the
+    statement analysis. A sample of the dropped names is also fully analyzed
+    so metadata can report how often the pre-screen dropped a true top-N name.
+    With a ``retry_budget_seconds`` above zero, rate-limited and timed-out
+    symbols are retried at the tail of the run for up to that long and
+    recovered names join the ranking; by default nothing is retried.
+
+    With ``progressive`` each run analyzes only the next
+    ``progressive_slice_size`` symbols of the universe order and ranks them
+    together with the stored scores of earlier runs, so a large universe is
+    covered over several scheduled runs. Pre-screening is skipped in that mode.
+
+    With a ``job_id`` every finished symbol is checkpointed as it completes;
+    rerunning the same job id with the same parameters resumes from the
+    checkpoint instead of analyzing those symbols again.
+
+    ``symbols`` replaces the built universe with an explicit list, and
+    ``shard_index``/``shard_count`` keep only one deterministic partition of
+    it, so several processes can each run a shard that
+    ``merge_discovery_shards`` later combines. Symbols of a built universe
+    with a live negative-cache entry are skipped within the shard; an
+    explicit list is analyzed as given.
+    """
+
+    explicit_symbols = normalize_symbols(symbols) if symbols else None
+    if explicit_symbols is not None:
+        universe_info = {
+            "symbols": explicit_symbols,
+            "sources": {"universe_source": "explicit_symbols"},
+        }
+    else:
+        universe_info = build_us_fundamental_universe(max_universe=max_universe)
+    symbols = [
+        symbol
+        for symbol in universe_info["symbols"]
+        if _is_discoverable_stock_symbol(symbol)
+    ]
+    shard_metadata: Dict[str, Any] = {}
+    if shard_count is not None or shard_index is not None:
+        shard_metadata = {
+            "shard_index": shard_index,
+            "shard_count": shard_count,
+            "shard_universe_count": len(symbols),
+        }
+        symbols = shard_symbols(symbols, shard_index, shard_count)
+    negative_cache_skip_metadata: Dict[str, Any] = {}
+    if explicit_symbols is None:
+        # Skipped only after sharding: each node's cache differs, and
+        # filtering before the partition would shift every shard boundary.
+        symbols, negative_cache_skipped = get_negative_cache().partition(symbols)
+        negative_cache_skip_metadata = {
+            "negative_cache_skipped_count": sum(negative_cache_skipped.values()),
+            "negative_cache_skipped_by_category": negative_cache_skipped,
+        }
+    # The pool is only a ceiling; the yfinance AIMD controller decides how
+    # many of these workers may call the provider at any moment.
+    controller = provider_concurrency("yfinance")
+    effective_workers = max(1, min(int(max_workers), controller.max_limit))
+
+    checkpoint = open_checkpoint(
+        job_id,
+        {
+            "max_universe": max_universe,
+            "top_n": top_n,
+            "exchange": exchange,
+            "two_phase": two_phase,
+            "prescreen_fraction": prescreen_fraction,
+            "prescreen_audit_size": prescreen_audit_size,
+            "progressive": progressive,
+            "progressive_slice_size": progressive_slice_size,
+            # A reused job id on another symbol list or shard must not resume
+            # from outcomes of a different partition.
+            "symbols": explicit_symbols,
+            "shard_index": shard_index,
+            "shard_count": shard_count,
+        },
+    )
+    prescreen_metadata: Dict[str, Any] = {"discovery_mode": "single_phase"}
+    analysis_symbols = symbols
+    audited: List[str] = []
+    progress = get_discovery_progress() if progressive else None
+    if progress is not None:
+        progress_slice = progress.next_slice(symbols, progressive_slice_size)
+        analysis_symbols = progress_slice.pop("symbols")
+        prescreen_metadata = {
+            "discovery_mode": "progressive",
+            "progressive_slice_size": len(analysis_symbols),
+            **{f"progressive_{key}": value for key, value in progress_slice.items()},
+        }
+    elif two_phase and symbols:
+        # A resumed job reuses its stored pre-screen: redoing the info sweep
+        # costs the provider calls the checkpoint saves, and fresh info could
+        # pick a different set from the one the checkpoint was recording.
+        plan = checkpoint.plan if checkpoint is not None else None
+        prescreen_from_checkpoint = plan is not None
+        if plan is None:
+            plan = _two_phase_plan(
+                symbols, exchange, top_n, prescreen_fraction, prescreen_audit_size, effective_workers
+            )
+            if checkpoint is not None:
+                checkpoint.save_plan(plan)
+        analysis_symbols = list(plan["analysis_symbols"])
+        audited = list(plan["audited"])
+        prescreen_metadata = {**plan["prescreen_metadata"], "prescreen_from_checkpoint": prescreen_from_checkpoint}
+
+    candidates: List[ScannerCandidateContract] = []
+    errors: List[ErrorDetail] = []
+    pending_symbols = analysis_symbols + audited
+    if checkpoint is not None:
+        candidates, errors, pending_symbols = checkpoint.restore(pending_symbols)
+    resumed_count = len(candidates) + len(errors)
+    new_candidates, new_errors = _analyze_symbols(pending_symbols, exchange, effective_workers, checkpoint)
+    candidates.extend(new_candidates)
+    errors.extend(new_errors)
+    first_pass_analyzed_count = len(candidates)
+    recovered, errors, retry_metadata = _retry_failed_symbols(
+        errors,
+        exchange,
+        effective_workers,
+        retry_budget_seconds,
+        checkpoint=checkpoint,
+    )
+    candidates.extend(recovered)
+    negative_cache_metadata = _update_negative_cache(candidates, errors)
+    analyzed_count = len(candidates)
+    if progress is not None:
+        progress.record(analysis_symbols, candidates)
+        progress.prune()
+        candidates = progress.stored_candidates(symbols)
+        prescreen_metadata.update(progress.coverage(symbols))
+        try:
+            progress.save()
+        except Exception as exc:
+            prescreen_metadata["progressive_save_error"] = str(exc)
+
+    candidates.sort(key=_candidate_sort_key, reverse=True)
 
     top_candidates = candidates[:top_n]
+    if prescreen_metadata["discovery_mode"] == "two_phase":
+        prescreen_metadata.update(
+            _prescreen_recall(
+                top_candidates,
+                audited,
+                prescreen_metadata["prescreen_dropped_count"],
+                top_n,
+            )
+        )
     for rank, candidate in enumerate(top_candidates, start=1):
         candidate.discovery_rank = rank
 
@@ -456,20 +888,34 @@ def discover_best_fundamentals(
         for candidate in top_candidates
     ]
     error_diagnostics = _error_diagnostics(errors)
-    attempted_count = len(symbols)
+    attempted_count = len(analysis_symbols) + len(audited)
 
     metadata = {
         **universe_info["sources"],
+        "universe_symbol_count": len(symbols),
         "attempted_count": attempted_count,
-        "analyzed_count": len(candidates),
+        "first_pass_analyzed_count": first_pass_analyzed_count,
+        "first_pass_yield": round(first_pass_analyzed_count / attempted_count, 4)
+        if attempted_count
+        else 0.0,
+        **retry_metadata,
+        **negative_cache_skip_metadata,
+        **negative_cache_metadata,
+        **shard_metadata,
+        "job_id": job_id,
+        "checkpoint_resumed": bool(checkpoint and checkpoint.resumed),
+        "checkpoint_resumed_count": resumed_count,
+        "analyzed_count": analyzed_count,
         "error_count": len(errors),
-        "success_rate": round(len(candidates) / attempted_count, 4)
+        "success_rate": round(analyzed_count / attempted_count, 4)
         if attempted_count
         else 0.0,
         "requested_max_workers": max_workers,
         "effective_max_workers": effective_workers,
-        "provider_worker_cap": _MAX_PROVIDER_WORKERS,
+        "provider_worker_cap": controller.max_limit,
+        "provider_concurrency": controller.snapshot(),
         **error_diagnostics,
+        **prescreen_metadata,
         "top_n": top_n,
         "exchange": exchange,
         "excluded_non_tradable_symbols": sorted(_NON_TRADABLE_DISCOVERY_SYMBOLS),
@@ -486,3 +932,81 @@ def discover_best_fundamentals(
         "diagnostics": diagnostics,
     }
     return top_candidates, errors, metadata
+
+
+def merge_discovery_shards(
+    shards: List[ScannerContractResult],
+    top_n: int = 10,
+) -> Tuple[List[ScannerCandidateContract], List[ErrorDetail], Dict[str, Any]]:
+    """Combine shard discovery results into one ranked top-N.
+
+    A shard's own top-N contains every shard member of the global top-N only
+    when the shard ran with at least the merged ``top_n``; re-ranking the
+    union is exact in that case. A shard that declares a smaller ``top_n``
+    raises ``ValueError``, and shards that do not declare one are merged
+    but reported in ``unverified_shard_count`` with ``exact_merge`` false.
+    A symbol reported by several shards keeps its best-scored candidate, and
+    an error is dropped when another shard analyzed that symbol successfully.
+    """
+
+    unverified_shard_count = 0
+    for position, shard in enumerate(shards):
+        shard_top_n = (shard.metadata or {}).get("top_n")
+        if shard_top_n is None:
+            unverified_shard_count += 1
+        elif int(shard_top_n) < top_n:
+            shard_index = (shard.metadata or {}).get("shard_index", position)
+            raise ValueError(
+                f"shard {shard_index} returned its top {int(shard_top_n)}, "
+                f"fewer than the merged top_n={top_n}; rerun it with top_n >= {top_n}"
+            )
+
+    best: Dict[str, ScannerCandidateContract] = {}
+    errors: Dict[str, str] = {}
+    shard_indexes = []
+    shard_counts = set()
+    attempted_count = 0
+    analyzed_count = 0
+    negative_cache_skipped_count = 0
+    for shard in shards:
+        metadata = shard.metadata or {}
+        for candidate in shard.candidates:
+            current = best.get(candidate.symbol)
+            if current is None or _candidate_sort_key(candidate) > _candidate_sort_key(current):
+                best[candidate.symbol] = candidate
+        errors.update(shard.errors or {})
+        attempted_count += int(metadata.get("attempted_count") or 0)
+        analyzed_count += int(metadata.get("analyzed_count") or 0)
+        negative_cache_skipped_count += int(metadata.get("negative_cache_skipped_count") or 0)
+        if metadata.get("shard_index") is not None:
+            shard_indexes.append(int(metadata["shard_index"]))
+        if metadata.get("shard_count") is not None:
+            shard_counts.add(int(metadata["shard_count"]))
+
+    candidates = sorted(best.values(), key=_candidate_sort_key, reverse=True)[:top_n]
+    for rank, candidate in enumerate(candidates, start=1):
+        candidate.discovery_rank = rank
+    error_details = [
+        ErrorDetail(symbol=symbol, error=message)
+        for symbol, message in sorted(errors.items())
+        if symbol not in best
+    ]
+    expected = max(shard_counts) if shard_counts else None
+    metadata = {
+        "discovery_mode": "sharded_merge",
+        "merged_shard_count": len(shards),
+        "shard_indexes": sorted(shard_indexes),
+        "expected_shard_count": expected,
+        "missing_shard_indexes": sorted(set(range(expected)) - set(shard_indexes)) if expected else [],
+        "inconsistent_shard_counts": len(shard_counts) > 1,
+        "unverified_shard_count": unverified_shard_count,
+        "exact_merge": unverified_shard_count == 0,
+        "attempted_count": attempted_count,
+        "analyzed_count": analyzed_count,
+        "negative_cache_skipped_count": negative_cache_skipped_count,
+        "error_count": len(error_details),
+        "success_rate": round(analyzed_count / attempted_count, 4) if attempted_count else 0.0,
+        **_error_diagnostics(error_details),
+        "top_n": top_n,
+    }
+    return candidates, error_details, metadata
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import Dict, List, Optional
 
 import yfinance as yf
 
+from app.utils.ttl_cache import ttl_cache
+
+# Fundamentals are updated by quarterly filings.
+FUNDAMENTAL_CACHE_TTL_SECONDS = 24 * 60 * 60
+# A failed info fetch (429, timeout) is only cached briefly so it is retried soon.
+FUNDAMENTAL_ERROR_CACHE_TTL_SECONDS = 5 * 60
+
 
 @dataclass
 class FundamentalScoreResult:
@@ -20,6 +26,7 @@ class FundamentalScoreResult:
     debt_to_equity: Optional[float]
     profit_margin: Optional[float]
     reason: List[str]
+    error: Optional[str] = None
 
 
 def _clamp01(value: float) -> float:
@@ -81,28 +88,45 @@ def _score_margin(value: Optional[float]) -> float:
     return _clamp01((value + 0.05) / 0.35)
 
 
-@lru_cache(maxsize=1024)
+def _fundamental_score_ttl(result: FundamentalScoreResult) -> Optional[float]:
+    return FUNDAMENTAL_ERROR_CACHE_TTL_SECONDS if result.error else None
+
+
+def fundamental_error_result(symbol: str, exc: Exception) -> FundamentalScoreResult:
+    """Neutral result for a symbol whose ``stock.info`` could not be fetched."""
+
+    return FundamentalScoreResult(
+        symbol=symbol,
+        score=0.50,
+        market_cap=None,
+        revenue_growth=None,
+        earnings_growth=None,
+        pe_ratio=None,
+        forward_pe=None,
+        roe=None,
+        debt_to_equity=None,
+        profit_margin=None,
+        reason=[f"ดึงข้อมูลพื้นฐานไม่สำเร็จ: {exc}"],
+        error=str(exc),
+    )
+
+
+@ttl_cache(FUNDAMENTAL_CACHE_TTL_SECONDS, maxsize=1024, ttl_for_value=_fundamental_score_ttl)
 def get_fundamental_score(symbol: str) -> FundamentalScoreResult:
     symbol = symbol.upper().strip()
-    reasons: List[str] = []
 
     try:
         info: Dict = yf.Ticker(symbol).get_info() or {}
     except Exception as exc:
-        return FundamentalScoreResult(
-            symbol=symbol,
-            score=0.50,
-            market_cap=None,
-            revenue_growth=None,
-            earnings_growth=None,
-            pe_ratio=None,
-            forward_pe=None,
-            roe=None,
-            debt_to_equity=None,
-            profit_margin=None,
-            reason=[f"ดึงข้อมูลพื้นฐานไม่สำเร็จ: {exc}"],
-        )
+        return fundamental_error_result(symbol, exc)
+    return score_fundamental_info(symbol, info)
+
 
+def score_fundamental_info(symbol: str, info: Dict) -> FundamentalScoreResult:
+    """Score ``symbol`` from an already fetched ``stock.info`` mapping."""
+
+    symbol = symbol.upper().strip()
+    reasons: List[str] = []
     market_cap = _safe_float(info.get("marketCap"))
     revenue_growth = _safe_float(info.get("revenueGrowth"))
     earnings_growth = _safe_float(info.get("earningsGrowth"))
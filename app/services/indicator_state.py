@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import json
+import threading
+import time
+
+
+DEFAULT_INDICATOR_STATE_PATH = Path("data/indicator_state.json")
+# Symbols not advanced for this long are dropped; a later scan reseeds them.
+INDICATOR_STATE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+class IndicatorStateStore:
+    """Persistent per-symbol streaming indicator state.
+
+    Each entry holds what ``local_indicators`` needs to advance a symbol by
+    its newest bars only: EMA/Wilder accumulators, short rolling windows and
+    the last bar it has seen. The store itself only loads, keeps and saves
+    those entries.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_INDICATOR_STATE_PATH,
+        clock: Callable[[], float] = time.time,
+        max_age_seconds: float = INDICATOR_STATE_MAX_AGE_SECONDS,
+    ):
+        self.path = path
+        self.max_age_seconds = float(max_age_seconds)
+        self._clock = clock
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                with self.path.open("r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if isinstance(data, dict):
+                    entries = {str(symbol).upper(): state for symbol, state in data.items() if isinstance(state, dict)}
+            except Exception:
+                entries = {}
+        self._entries = entries
+        return entries
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(str(symbol or "").upper().strip())
+
+    def put(self, symbol: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._load()[str(symbol or "").upper().strip()] = dict(state, updated_at=self._clock())
+            self._dirty = True
+
+    def discard(self, symbol: str) -> None:
+        with self._lock:
+            if self._load().pop(str(symbol or "").upper().strip(), None) is not None:
+                self._dirty = True
+
+    def prune(self) -> int:
+        """Drop states not advanced within the age limit."""
+
+        cutoff = self._clock() - self.max_age_seconds
+        with self._lock:
+            entries = self._load()
+            removed = [symbol for symbol, state in entries.items() if float(state.get("updated_at") or 0) < cutoff]
+            for symbol in removed:
+                del entries[symbol]
+            if removed:
+                self._dirty = True
+            return len(removed)
+
+    def save(self) -> bool:
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return False
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with temp_path.open("w", encoding="utf-8") as file:
+                json.dump(self._entries, file, separators=(",", ":"), sort_keys=True)
+            temp_path.replace(self.path)
+            self._dirty = False
+            return True
+
+
+_STORE = IndicatorStateStore()
+
+
+def get_indicator_state() -> IndicatorStateStore:
+    return _STORE
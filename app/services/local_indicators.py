@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+
+from app.data_sources.price_history import get_price_history, prefetch_price_histories
+from app.services.indicator_state import IndicatorStateStore, get_indicator_state
+from app.utils.symbol_mapper import map_symbol_for_yfinance
+from app.utils.yfinance_frames import OHLCV_FIELDS, extract_yfinance_frame
+
+logger = logging.getLogger(__name__)
+
+
+WEEK_52_BARS = 252
+# SMA200 and the 52-week high both fit in one year of daily bars, so local
+# mode reads the same 1y frames that ranking and prefetch already cache.
+LOCAL_INDICATOR_BARS = WEEK_52_BARS
+MOVING_AVERAGE_LENGTHS = (10, 20, 30, 50, 100, 200)
+EMA_LENGTHS = tuple(sorted(set(MOVING_AVERAGE_LENGTHS) | {12, 26}))
+# Calendar-style lookbacks in trading days for TradingView's Perf.* fields.
+PERFORMANCE_BARS = {"Perf.W": 5, "Perf.1M": 21, "Perf.3M": 63, "Perf.6M": 126}
+# CCI20 on the last two rows reads 21 bars, the longest high/low window.
+MIN_WINDOW_ROWS = 21
+# Bars of each field kept in the persisted state: SMA200 and Perf.6M read
+# the closes, CCI20 and Stoch the highs and lows, the volume MA 20 volumes.
+STATE_WINDOW_BARS = {"Open": 1, "High": MIN_WINDOW_ROWS, "Low": MIN_WINDOW_ROWS, "Close": 200, "Volume": 20}
+INDICATOR_STATE_VERSION = 1
+LOCAL_SOURCE = "local"
+NO_LOCAL_DATA_ERROR = "No price history for local technical indicators"
+
+
+def _frame_values(frame: pd.DataFrame) -> np.ndarray:
+    """Days x OHLCV float array of one frame."""
+
+    if list(frame.columns) != list(OHLCV_FIELDS):
+        frame = frame.reindex(columns=list(OHLCV_FIELDS))
+    return frame.to_numpy(dtype=float)
+
+
+def _ohlcv_matrix(arrays: List[np.ndarray], width: int) -> np.ndarray:
+    """Days x symbols x OHLCV array, each symbol's bars ending on the last row."""
+
+    matrix = np.full((width, len(arrays), len(OHLCV_FIELDS)), np.nan)
+    for column, values in enumerate(arrays):
+        if len(values):
+            matrix[width - len(values) :, column, :] = values
+    return matrix
+
+
+def _ewm(
+    values: np.ndarray,
+    alpha: float,
+    min_periods: int,
+    state: Optional[np.ndarray] = None,
+    count: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``ewm(alpha=..., adjust=False).mean()`` down the rows of a 2-D array.
+
+    The recursion steps over days once and updates every symbol per step,
+    starting each column at its first non-NaN value like pandas does. Passing
+    the returned ``state`` and ``count`` back in continues the recursion on
+    later rows, which is how stored indicator state is advanced.
+    """
+
+    columns = values.shape[1]
+    state = np.full(columns, np.nan) if state is None else np.array(state, dtype=float)
+    count = np.zeros(columns) if count is None else np.array(count, dtype=float)
+    result = np.full(values.shape, np.nan)
+    for row in range(values.shape[0]):
+        current = values[row]
+        present = ~np.isnan(current)
+        state = np.where(np.isnan(state), current, np.where(present, (1.0 - alpha) * state + alpha * current, state))
+        count += present
+        result[row] = np.where(present & (count >= min_periods), state, np.nan)
+    return result, state, count
+
+
+def _advance_recursive(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    previous_close: np.ndarray,
+    carry: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """EMA, MACD, Wilder RSI and ATR rows for the given bars.
+
+    ``previous_close`` is each row's prior close (NaN before a symbol's first
+    bar). ``carry`` holds the accumulators after earlier bars; the returned
+    carry continues from the last row.
+    """
+
+    carry = carry or {}
+    updated: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def run(name: str, values: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+        result, state, count = _ewm(values, alpha, min_periods, *carry.get(name, (None, None)))
+        updated[name] = (state, count)
+        return result
+
+    ema = {length: run(f"EMA{length}", close, 2.0 / (length + 1.0), length) for length in EMA_LENGTHS}
+    macd = ema[12] - ema[26]
+    signal = run("MACD.signal", macd, 2.0 / 10.0, 9)
+    change = close - previous_close
+    gain = run("RSI.gain", np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)), 1.0 / 14, 14)
+    loss = run("RSI.loss", np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)), 1.0 / 14, 14)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(np.isnan(gain), np.nan, np.where(loss == 0, 100.0, 100.0 - 100.0 / (1.0 + gain / loss)))
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    atr = run("ATR", true_range, 1.0 / 14, 14)
+
+    rows = {f"EMA{length}": ema[length] for length in MOVING_AVERAGE_LENGTHS}
+    rows.update({"MACD.macd": macd, "MACD.signal": signal, "RSI": rsi, "ATR": atr})
+    return rows, updated
+
+
+def _previous_close(close: np.ndarray, first: Optional[np.ndarray] = None) -> np.ndarray:
+    """Close of the bar before each row; ``first`` fills each symbol's first row."""
+
+    previous = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    if first is not None:
+        first_row = np.argmax(~np.isnan(close), axis=0)
+        previous = np.where(np.arange(len(close))[:, None] == first_row, first, previous)
+    return previous
+
+
+def _window_tail(values: np.ndarray, length: int, rows: int, reducer) -> np.ndarray:
+    """Rolling ``reducer`` over ``length`` rows, evaluated only for the last ``rows`` rows.
+
+    A window that reaches into the NaN padding yields NaN, matching pandas'
+    default ``min_periods=length``. Each symbol's window is reduced along a
+    contiguous row, so its result does not depend on which other symbols
+    share the batch.
+    """
+
+    tail = np.full((rows, values.shape[1]), np.nan)
+    for offset in range(rows):
+        end = len(values) - rows + offset + 1
+        if end >= length:
+            tail[offset] = reducer(np.ascontiguousarray(values[end - length : end].T), axis=-1)
+    return tail
+
+
+def _cci_tail(typical: np.ndarray, length: int = 20, rows: int = 2) -> np.ndarray:
+    tail = np.full((rows, typical.shape[1]), np.nan)
+    for offset in range(rows):
+        end = len(typical) - rows + offset + 1
+        if end < length:
+            continue
+        window = np.ascontiguousarray(typical[end - length : end].T)
+        mean = window.mean(axis=-1)
+        deviation = np.abs(window - mean[:, None]).mean(axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tail[offset] = (typical[end - 1] - mean) / (0.015 * deviation)
+    return tail
+
+
+def _recommendation(buy: np.ndarray, sell: np.ndarray, total: np.ndarray) -> List[str]:
+    """TradingView's rating thresholds on (buy - sell) / total."""
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = np.where(total > 0, (buy - sell) / total, 0.0)
+    labels = []
+    for item in value:
+        if item >= 0.5:
+            labels.append("STRONG_BUY")
+        elif item >= 0.1:
+            labels.append("BUY")
+        elif item > -0.1:
+            labels.append("NEUTRAL")
+        elif item > -0.5:
+            labels.append("SELL")
+        else:
+            labels.append("STRONG_SELL")
+    return labels
+
+
+def _summarize(
+    symbols: List[str],
+    ohlcv: np.ndarray,
+    recursive: Dict[str, np.ndarray],
+    high_52w: np.ndarray,
+) -> Dict[str, Dict[str, Any]]:
+    """Windowed indicators, the vote summary and the per-symbol result dicts.
+
+    ``ohlcv`` only has to reach back as far as :data:`STATE_WINDOW_BARS`;
+    ``recursive`` holds the latest EMA, MACD, RSI and ATR values.
+    """
+
+    opens, high, low, close, volume = (ohlcv[:, :, index] for index in range(len(OHLCV_FIELDS)))
+    width = len(close)
+    last = close[-1]
+
+    sma = {length: _window_tail(close, length, 1, np.mean)[-1] for length in MOVING_AVERAGE_LENGTHS}
+    volume_ma = _window_tail(volume, 20, 1, np.mean)[-1]
+    # Stoch %K(14, 3) smoothed into %D(3) needs raw %K on the last five rows.
+    lowest = _window_tail(low, 14, 5, np.min)
+    highest = _window_tail(high, 14, 5, np.max)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_k = 100.0 * (close[-5:] - lowest) / (highest - lowest)
+        williams_r = -100.0 * (highest[-2:] - close[-2:]) / (highest[-2:] - lowest[-2:])
+    stoch_k = np.vstack([raw_k[index : index + 3].mean(axis=0) for index in range(3)])
+    stoch_d = stoch_k.mean(axis=0)
+    momentum = close[-2:] - close[-12:-10]
+    cci = _cci_tail((high + low + close) / 3.0)
+
+    buy = np.zeros(len(symbols))
+    sell = np.zeros(len(symbols))
+    total = np.zeros(len(symbols))
+
+    def vote(buy_mask: np.ndarray, sell_mask: np.ndarray, available: np.ndarray) -> None:
+        buy[:] += buy_mask & available
+        sell[:] += sell_mask & available
+        total[:] += available
+
+    ema = [recursive[f"EMA{length}"] for length in MOVING_AVERAGE_LENGTHS]
+    for average in list(sma.values()) + ema:
+        vote(average < last, average > last, ~np.isnan(average))
+    rsi_now, rsi_prev = recursive["RSI"], recursive["RSI[1]"]
+    vote((rsi_now < 30) & (rsi_now > rsi_prev), (rsi_now > 70) & (rsi_now < rsi_prev), ~np.isnan(rsi_now) & ~np.isnan(rsi_prev))
+    macd, macd_signal = recursive["MACD.macd"], recursive["MACD.signal"]
+    vote(macd > macd_signal, macd < macd_signal, ~np.isnan(macd) & ~np.isnan(macd_signal))
+    k_now = stoch_k[-1]
+    vote((k_now < 20) & (k_now > stoch_d), (k_now > 80) & (k_now < stoch_d), ~np.isnan(k_now) & ~np.isnan(stoch_d))
+    vote(momentum[-1] > momentum[-2], momentum[-1] < momentum[-2], ~np.isnan(momentum[-1]) & ~np.isnan(momentum[-2]))
+    vote((cci[-1] < -100) & (cci[-1] > cci[-2]), (cci[-1] > 100) & (cci[-1] < cci[-2]), ~np.isnan(cci[-1]) & ~np.isnan(cci[-2]))
+    vote(
+        (williams_r[-1] < -80) & (williams_r[-1] > williams_r[-2]),
+        (williams_r[-1] > -20) & (williams_r[-1] < williams_r[-2]),
+        ~np.isnan(williams_r[-1]) & ~np.isnan(williams_r[-2]),
+    )
+
+    columns: Dict[str, np.ndarray] = {
+        "close": last,
+        "open": opens[-1],
+        "high": high[-1],
+        "low": low[-1],
+        "volume": volume[-1],
+        "RSI": rsi_now,
+        "RSI[1]": rsi_prev,
+        "MACD.macd": macd,
+        "MACD.signal": macd_signal,
+        "Stoch.K": k_now,
+        "Stoch.D": stoch_d,
+        "W.R": williams_r[-1],
+        "Mom": momentum[-1],
+        "CCI20": cci[-1],
+        "ATR": recursive["ATR"],
+        "Volume MA": volume_ma,
+        "High.52W": high_52w,
+    }
+    for length in MOVING_AVERAGE_LENGTHS:
+        columns[f"SMA{length}"] = sma[length]
+        columns[f"EMA{length}"] = recursive[f"EMA{length}"]
+    for name, bars in PERFORMANCE_BARS.items():
+        if width > bars:
+            start = close[-1 - bars]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                columns[name] = np.where(start > 0, (last - start) / start * 100.0, np.nan)
+
+    names = list(columns)
+    table = np.vstack([columns[name] for name in names]).T
+    recommendations = _recommendation(buy, sell, total)
+    results: Dict[str, Dict[str, Any]] = {}
+    for position, symbol in enumerate(symbols):
+        row = table[position]
+        results[symbol] = {
+            "analysis": {
+                "RECOMMENDATION": recommendations[position],
+                "BUY": int(buy[position]),
+                "SELL": int(sell[position]),
+                "NEUTRAL": int(total[position] - buy[position] - sell[position]),
+            },
+            "indicators": {name: float(value) for name, value in zip(names, row) if not np.isnan(value)},
+        }
+    return results
+
+
+def compute_indicator_matrix(frames: Mapping[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+    """Compute TradingView-style indicators and a vote summary for many symbols.
+
+    ``frames`` maps symbols to daily OHLCV frames (oldest first). All symbols
+    are stacked into one days x symbols array per field, so each indicator is
+    computed for the whole universe at once; windowed values are evaluated
+    only on the rows the summary reads. Returns, per symbol,
+    ``{"analysis": summary, "indicators": values}`` in the same shape the
+    TradingView path produces; values that need more history are omitted.
+    """
+
+    symbols = [symbol for symbol, frame in frames.items() if frame is not None and not frame.empty]
+    if not symbols:
+        return {}
+    ordered = [_frame_values(frames[symbol]) for symbol in symbols]
+    width = max(MIN_WINDOW_ROWS, max(len(values) for values in ordered))
+    ohlcv = _ohlcv_matrix(ordered, width)
+    high, low, close = ohlcv[:, :, 1], ohlcv[:, :, 2], ohlcv[:, :, 3]
+    rows, _ = _advance_recursive(close, high, low, _previous_close(close))
+    recursive = {name: values[-1] for name, values in rows.items()}
+    recursive["RSI[1]"] = rows["RSI"][-2]
+    high_52w = np.fmax.reduce(high[-WEEK_52_BARS:], axis=0)
+    return _summarize(symbols, ohlcv, recursive, high_52w)
+
+
+def _bar_key(index: pd.Index, position: int) -> str:
+    # Raw index values avoid boxing a Timestamp per bar.
+    return str(index.values[position])
+
+
+def _new_bar_count(index: pd.Index, values: np.ndarray, state: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Bars after the state's last bar, or None when the state must be reseeded.
+
+    A state is reseeded when it is missing, from another version, older than
+    the frame, or when the stored last close no longer matches the frame;
+    yfinance rewrites adjusted history after dividends and splits.
+    """
+
+    if not state or state.get("version") != INDICATOR_STATE_VERSION:
+        return None
+    last_bar = state.get("last_bar")
+    for offset in range(1, len(index) + 1):
+        if _bar_key(index, -offset) != last_bar:
+            continue
+        if not math.isclose(values[-offset, OHLCV_FIELDS.index("Close")], float(state.get("last_close", math.nan)), rel_tol=1e-9):
+            return None
+        return offset - 1
+    return None
+
+
+def _advance_high_52w(window: List[List[float]], bars: int, highs: Iterable[float]) -> Tuple[List[List[float]], int]:
+    """Monotonic deque of ``[bar number, high]`` whose head is the 52-week high."""
+
+    for value in highs:
+        bars += 1
+        if math.isnan(value):
+            continue
+        while window and window[-1][1] <= value:
+            window.pop()
+        window.append([bars, float(value)])
+    while window and window[0][0] <= bars - WEEK_52_BARS:
+        window.pop(0)
+    return window, bars
+
+
+def _advance_group(
+    arrays: List[np.ndarray],
+    states: List[Dict[str, Any]],
+    last_bars: List[str],
+) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+    """Advance symbols whose states are all warm or all empty by ``arrays``.
+
+    ``arrays`` hold each symbol's new bars; empty states seed from the full
+    history instead. Returns the latest recursive values, the 52-week
+    highs, the OHLCV windows and the new states.
+    """
+
+    warm = bool(states[0])
+    width = max(1, max(len(values) for values in arrays))
+    ohlcv = _ohlcv_matrix(arrays, width)
+    high, low, close = ohlcv[:, :, 1], ohlcv[:, :, 2], ohlcv[:, :, 3]
+    new_counts = [len(values) for values in arrays]
+    carry = None
+    first_previous = None
+    if warm:
+        carry = {}
+        for name in states[0]["ewm"]:
+            pairs = np.array([state["ewm"][name] for state in states], dtype=float)
+            carry[name] = (pairs[:, 0], pairs[:, 1])
+        first_previous = np.array([state["last_close"] for state in states], dtype=float)
+    rows, carry = _advance_recursive(close, high, low, _previous_close(close, first_previous), carry)
+
+    recursive = {name: values[-1].copy() for name, values in rows.items()}
+    recursive["RSI[1]"] = rows["RSI"][-2].copy() if width > 1 else np.full(len(arrays), np.nan)
+    for position, state in enumerate(states):
+        if new_counts[position] == 0:
+            for name in recursive:
+                recursive[name][position] = state["outputs"][name]
+        elif new_counts[position] == 1 and warm:
+            recursive["RSI[1]"][position] = state["outputs"]["RSI"]
+
+    # Plain lists keep the per-symbol bookkeeping cheap; NaN round-trips
+    # through Python's json as a bare NaN token.
+    carry_lists = {name: (value.tolist(), count.astype(int).tolist()) for name, (value, count) in carry.items()}
+    output_lists = {name: values.tolist() for name, values in recursive.items()}
+    window_rows = max(STATE_WINDOW_BARS.values())
+    windows = np.full((window_rows, len(arrays), len(OHLCV_FIELDS)), np.nan)
+    high_52w = np.full(len(arrays), np.nan)
+    new_states = []
+    for position, state in enumerate(states):
+        appended = ohlcv[width - new_counts[position] :, position, :] if new_counts[position] else np.empty((0, len(OHLCV_FIELDS)))
+        stored = {}
+        for field_index, field in enumerate(OHLCV_FIELDS):
+            values = ((state.get("windows") or {}).get(field, []) + appended[:, field_index].tolist())[-STATE_WINDOW_BARS[field] :]
+            if values:
+                windows[window_rows - len(values) :, position, field_index] = values
+            stored[field] = values
+        if not new_counts[position]:
+            # Nothing new since the stored bar: the state is unchanged.
+            high_52w[position] = state["high_52w"][0][1] if state.get("high_52w") else math.nan
+            new_states.append(state)
+            continue
+        deque, bars = _advance_high_52w(
+            list(state.get("high_52w") or []),
+            int(state.get("bars") or 0),
+            appended[:, OHLCV_FIELDS.index("High")].tolist(),
+        )
+        if deque:
+            high_52w[position] = deque[0][1]
+        new_states.append(
+            {
+                "version": INDICATOR_STATE_VERSION,
+                "last_bar": last_bars[position],
+                "last_close": float(ohlcv[-1, position, OHLCV_FIELDS.index("Close")]),
+                "bars": bars,
+                "high_52w": deque,
+                "windows": stored,
+                "ewm": {name: [values[position], counts[position]] for name, (values, counts) in carry_lists.items()},
+                "outputs": {name: values[position] for name, values in output_lists.items()},
+            }
+        )
+    return recursive, high_52w, windows, new_states
+
+
+def advance_indicator_states(
+    frames: Mapping[str, pd.DataFrame],
+    store: IndicatorStateStore,
+) -> Dict[str, Dict[str, Any]]:
+    """Same results as :func:`compute_indicator_matrix`, advancing stored state.
+
+    Symbols with a matching stored state run the EMA/Wilder recursions over
+    their new bars only (none on a same-day rescan), so a warm rescan costs
+    O(symbols) rather than O(symbols x history). Other symbols are seeded
+    from their full frame. Windowed indicators are read from the short
+    windows kept in the state.
+    """
+
+    symbols = [symbol for symbol, frame in frames.items() if frame is not None and not frame.empty]
+    warm: List[Tuple[str, np.ndarray, Dict[str, Any], str]] = []
+    cold: List[Tuple[str, np.ndarray, Dict[str, Any], str]] = []
+    for symbol in symbols:
+        frame = frames[symbol]
+        values = _frame_values(frame)
+        state = store.get(symbol)
+        new_count = _new_bar_count(frame.index, values, state)
+        last_bar = _bar_key(frame.index, -1)
+        if new_count is None:
+            cold.append((symbol, values, {}, last_bar))
+        else:
+            warm.append((symbol, values[len(values) - new_count :], state, last_bar))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for group in (warm, cold):
+        if not group:
+            continue
+        group_symbols = [symbol for symbol, _, _, _ in group]
+        recursive, high_52w, windows, new_states = _advance_group(
+            [values for _, values, _, _ in group],
+            [state for _, _, state, _ in group],
+            [last_bar for _, _, _, last_bar in group],
+        )
+        for symbol, state, (_, _, previous, _) in zip(group_symbols, new_states, group):
+            if state is not previous:
+                store.put(symbol, state)
+        results.update(_summarize(group_symbols, windows, recursive, high_52w))
+    return {symbol: results[symbol] for symbol in symbols}
+
+
+def compute_local_analyses(
+    symbols: Iterable[str],
+    exchange: str,
+    bars: int = LOCAL_INDICATOR_BARS,
+    state_store: Optional[IndicatorStateStore] = None,
+    incremental: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """Local replacement for ``fetch_analyses`` built on the shared OHLCV store.
+
+    Results have the same ``symbol``/``exchange``/``analysis``/``indicators``
+    shape as TradingView results, plus ``source: "local"``; symbols without
+    usable bars get an ``error`` entry instead. With ``incremental`` the
+    persisted indicator state is advanced instead of recomputing history.
+    """
+
+    symbol_list = list(dict.fromkeys(str(symbol or "").upper().strip() for symbol in symbols if symbol))
+    yf_symbols = {symbol: map_symbol_for_yfinance(symbol, exchange) for symbol in symbol_list}
+    download_errors = prefetch_price_histories(yf_symbols.values(), bars)
+    frames: Dict[str, pd.DataFrame] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    for symbol, yf_symbol in yf_symbols.items():
+        error: Optional[str] = download_errors.get(yf_symbol)
+        if error is None:
+            try:
+                frame = extract_yfinance_frame(get_price_history(yf_symbol, bars), yf_symbol)
+                if frame.empty:
+                    error = NO_LOCAL_DATA_ERROR
+                else:
+                    frames[symbol] = frame
+            except Exception as exc:
+                error = str(exc)
+        if error is not None:
+            results[symbol] = {"symbol": symbol, "error": error}
+
+    if incremental:
+        store = state_store or get_indicator_state()
+        # State is keyed by the provider symbol so PTT on SET and a US PTT differ.
+        by_yf_symbol = advance_indicator_states({yf_symbols[symbol]: frame for symbol, frame in frames.items()}, store)
+        computed = {symbol: by_yf_symbol[yf_symbols[symbol]] for symbol in frames}
+        try:
+            store.prune()
+            store.save()
+        except Exception as exc:
+            logger.warning("Could not save indicator state: %s", exc)
+    else:
+        computed = compute_indicator_matrix(frames)
+
+    for symbol, values in computed.items():
+        results[symbol] = {
+            "symbol": symbol,
+            "exchange": exchange,
+            "source": LOCAL_SOURCE,
+            **values,
+        }
+    return results
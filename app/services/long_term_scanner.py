@@ -2,6 +2,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Tuple
 
 from app.analyzers import growth_analyzer, quality_analyzer, valuation_analyzer
+from app.analyzers.requirements import required_statement_kinds
 from app.data_sources import financial_statements, market_data
 from app.models import (
     ErrorDetail,
@@ -11,12 +12,27 @@ from app.models import (
     ValuationMetrics,
 )
 from app.scoring import fundamental_score
+from app.utils.provider_limits import provider_concurrency
+
+
+QUALITY_METRICS = ("roe", "roa", "debt_to_equity", "free_cash_flow", "profit_margins")
+GROWTH_METRICS = ("revenue_cagr", "eps_growth")
+# Statement kinds read by the metrics above; quarterly statements are only
+# fetched as a fallback for symbols without annual data.
+LONG_TERM_STATEMENTS = frozenset(
+    required_statement_kinds(quality_analyzer.STATEMENT_REQUIREMENTS, QUALITY_METRICS)
+    | required_statement_kinds(growth_analyzer.STATEMENT_REQUIREMENTS, GROWTH_METRICS)
+)
 
 
 def analyze_stock(symbol: str, exchange: str = "SET") -> Tuple[str, FundamentalCandidate]:
     """Perform a full fundamental analysis on one stock symbol."""
 
-    financials = financial_statements.get_financials(symbol, exchange)
+    financials = financial_statements.get_financials(
+        symbol,
+        exchange,
+        statements=LONG_TERM_STATEMENTS,
+    )
     if not financials:
         raise ValueError("missing financial statements")
 
@@ -106,9 +122,10 @@ def scan_long_term(
 
     candidates: List[FundamentalCandidate] = []
     errors: List[ErrorDetail] = []
-    with ThreadPoolExecutor(max_workers=4) as executor:
+    controller = provider_concurrency("yfinance")
+    with ThreadPoolExecutor(max_workers=controller.max_limit) as executor:
         future_to_symbol = {
-            executor.submit(analyze_stock, symbol, exchange): symbol
+            executor.submit(controller.call, analyze_stock, symbol, exchange): symbol
             for symbol in symbols
         }
         for future in as_completed(future_to_symbol):
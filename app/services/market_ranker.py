@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-import yfinance as yf
+import numpy as np
+import pandas as pd
 
+from app.data_sources.price_history import get_price_history, prefetch_price_histories
 from app.utils.yfinance_frames import extract_yfinance_series
+from app.utils.ttl_cache import ttl_cache
 
 
 MAX_SYMBOLS_AFTER_RANKING = 75
 MIN_RANKED_SYMBOLS = 30
+# Roughly six months of daily bars.
+RANKING_HISTORY_BARS = 126
+# Rankings read intraday prices, so they go stale within a trading session.
+RANKING_CACHE_TTL_SECONDS = 15 * 60
 
 
 @dataclass
@@ -61,139 +67,245 @@ def _score_volume_ratio(value: Optional[float]) -> float:
     return _clamp01(value / 3.0)
 
 
-@lru_cache(maxsize=10000)
-def rank_symbol(symbol: str) -> MarketRankResult:
-    symbol = symbol.upper().strip()
-    reasons: List[str] = []
-
-    try:
-        history = yf.download(
-            symbol,
-            period="6mo",
-            interval="1d",
-            progress=False,
-            auto_adjust=True,
-        )
-        close_series = extract_yfinance_series(history, "Close", symbol)
-        volume_values = extract_yfinance_series(history, "Volume", symbol)
-        volume_series = None if volume_values.empty else volume_values
-    except Exception as exc:
-        return MarketRankResult(
-            symbol,
-            0.0,
-            None,
-            None,
-            None,
-            None,
-            None,
-            None,
-            [f"Market Ranking error: {exc}"],
-        )
-
-    if close_series.empty:
-        return MarketRankResult(
-            symbol,
-            0.0,
-            None,
-            None,
-            None,
-            None,
-            None,
-            None,
-            ["ไม่มีข้อมูลราคาเพียงพอสำหรับ Market Ranking"],
-        )
+def _rank_error(symbol: str, message: str) -> MarketRankResult:
+    return MarketRankResult(
+        symbol,
+        0.0,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        [message],
+    )
 
-    if len(close_series) < 30:
-        return MarketRankResult(
-            symbol,
-            0.0,
-            None,
-            None,
-            None,
-            None,
-            None,
-            None,
-            ["ข้อมูลราคาน้อยเกินไปสำหรับ Market Ranking"],
-        )
 
-    last_price = _safe_float(close_series.iloc[-1])
-    ret_5d = _pct_return(
-        _safe_float(close_series.iloc[-6]) if len(close_series) >= 6 else None,
-        last_price,
-    )
-    ret_20d = _pct_return(
-        _safe_float(close_series.iloc[-21]) if len(close_series) >= 21 else None,
-        last_price,
-    )
-    ret_60d = _pct_return(
-        _safe_float(close_series.iloc[-61]) if len(close_series) >= 61 else None,
-        last_price,
+def _right_aligned(series_list: Sequence[Optional[pd.Series]]) -> np.ndarray:
+    """Stack series so column -k holds every row's k-th last value (NaN-padded)."""
+
+    width = max([len(series) for series in series_list if series is not None] or [0])
+    matrix = np.full((len(series_list), width), np.nan)
+    for row, series in enumerate(series_list):
+        if series is not None and len(series):
+            matrix[row, width - len(series) :] = series.to_numpy(dtype=float)
+    return matrix
+
+
+def _row_lengths(matrix: np.ndarray) -> np.ndarray:
+    """Rows are right-aligned with NaN only as left padding."""
+
+    if matrix.shape[1] == 0:
+        return np.zeros(len(matrix), dtype=np.int64)
+    padded = np.isnan(matrix)
+    first_value = np.where(padded.all(axis=1), matrix.shape[1], padded.argmin(axis=1))
+    return matrix.shape[1] - first_value
+
+
+def _trailing_mean(matrix: np.ndarray, window: int) -> np.ndarray:
+    # Contiguous rows make NumPy sum each window exactly like Series.tail().mean().
+    if matrix.shape[1] < window:
+        return np.full(len(matrix), np.nan)
+    return np.ascontiguousarray(matrix[:, -window:]).sum(axis=1) / window
+
+
+def _matrix_return(closes: np.ndarray, lengths: np.ndarray, bars_back: int) -> Tuple[np.ndarray, np.ndarray]:
+    if closes.shape[1] <= bars_back:
+        return np.full(len(closes), np.nan), np.zeros(len(closes), dtype=bool)
+    start = closes[:, -1 - bars_back]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (closes[:, -1] - start) / start
+    return returns, (lengths > bars_back) & (start != 0)
+
+
+def _matrix_return_score(
+    values: np.ndarray,
+    valid: np.ndarray,
+    low: float,
+    high: float,
+) -> np.ndarray:
+    """Vectorized ``_score_return``: 0.45 where the return is missing."""
+
+    with np.errstate(invalid="ignore"):
+        scores = np.clip((values - low) / (high - low), 0.0, 1.0)
+    return np.where(valid, scores, 0.45)
+
+
+def rank_market_matrix(
+    symbols: Sequence[str],
+    closes: np.ndarray,
+    volumes: Optional[np.ndarray] = None,
+) -> List[MarketRankResult]:
+    """Rank N symbols at once from right-aligned close and volume matrices.
+
+    Row ``i`` of ``closes`` (and ``volumes``) holds symbol ``i``'s clean
+    daily values, oldest first, ending in the last column and left-padded
+    with NaN; the two matrices may have different widths. Every
+    ``MarketRankResult`` field is computed with array operations and is
+    identical to ranking each symbol's series on its own.
+    """
+
+    closes = np.asarray(closes, dtype=float).reshape(len(symbols), -1)
+    if volumes is None:
+        volumes = np.full((len(symbols), 0), np.nan)
+    volumes = np.asarray(volumes, dtype=float).reshape(len(symbols), -1)
+    close_lengths = _row_lengths(closes)
+    volume_lengths = _row_lengths(volumes)
+
+    last_price = closes[:, -1] if closes.shape[1] else np.full(len(symbols), np.nan)
+    ret_5d, has_5d = _matrix_return(closes, close_lengths, 5)
+    ret_20d, has_20d = _matrix_return(closes, close_lengths, 20)
+    ret_60d, has_60d = _matrix_return(closes, close_lengths, 60)
+
+    ma20 = _trailing_mean(closes, 20)
+    ma50 = _trailing_mean(closes, 50)
+    has_ma50 = close_lengths >= 50
+    above_ma20 = last_price > ma20
+    ma20_above_ma50 = has_ma50 & (ma20 > ma50)
+    price_part = np.where(above_ma20, 1.0, 0.35)
+    trend_score = np.where(has_ma50, (price_part + np.where(ma20_above_ma50, 1.0, 0.35)) / 2, price_part)
+
+    avg_volume_20 = _trailing_mean(volumes, 20)
+    recent_volume = volumes[:, -1] if volumes.shape[1] else np.full(len(symbols), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_volume = (volume_lengths >= 21) & (avg_volume_20 > 0)
+        volume_ratio = recent_volume / avg_volume_20
+        volume_score = np.where(has_volume, np.clip(volume_ratio / 3.0, 0.0, 1.0), 0.45)
+
+    score = np.clip(
+        (_matrix_return_score(ret_5d, has_5d, -0.06, 0.12) * 0.15)
+        + (_matrix_return_score(ret_20d, has_20d, -0.10, 0.20) * 0.30)
+        + (_matrix_return_score(ret_60d, has_60d, -0.15, 0.35) * 0.25)
+        + (volume_score * 0.15)
+        + (trend_score * 0.15),
+        0.0,
+        1.0,
     )
 
-    ma20 = (
-        _safe_float(close_series.tail(20).mean())
-        if len(close_series) >= 20
-        else None
-    )
-    ma50 = (
-        _safe_float(close_series.tail(50).mean())
-        if len(close_series) >= 50
-        else None
-    )
-    trend_parts = []
-    if last_price is not None and ma20 is not None:
-        trend_parts.append(1.0 if last_price > ma20 else 0.35)
-        if last_price > ma20:
+    results: List[MarketRankResult] = []
+    for row, symbol in enumerate(symbols):
+        length = int(close_lengths[row])
+        if length == 0:
+            results.append(_rank_error(symbol, "ไม่มีข้อมูลราคาเพียงพอสำหรับ Market Ranking"))
+            continue
+        if length < 30:
+            results.append(_rank_error(symbol, "ข้อมูลราคาน้อยเกินไปสำหรับ Market Ranking"))
+            continue
+
+        row_ret_20d = float(ret_20d[row]) if has_20d[row] else None
+        row_ret_60d = float(ret_60d[row]) if has_60d[row] else None
+        row_volume_ratio = float(volume_ratio[row]) if has_volume[row] else None
+        row_score = float(score[row])
+        reasons: List[str] = []
+        if above_ma20[row]:
             reasons.append("ราคาอยู่เหนือ MA20")
-    if ma20 is not None and ma50 is not None:
-        trend_parts.append(1.0 if ma20 > ma50 else 0.35)
-        if ma20 > ma50:
+        if ma20_above_ma50[row]:
             reasons.append("MA20 อยู่เหนือ MA50 แนวโน้มระยะสั้นแข็งแรง")
-    trend_score = sum(trend_parts) / len(trend_parts) if trend_parts else 0.45
-
-    volume_ratio = None
-    if volume_series is not None and len(volume_series) >= 21:
-        recent_volume = _safe_float(volume_series.iloc[-1])
-        avg_volume_20 = _safe_float(volume_series.tail(20).mean())
-        if recent_volume is not None and avg_volume_20 and avg_volume_20 > 0:
-            volume_ratio = recent_volume / avg_volume_20
-            if volume_ratio >= 1.3:
-                reasons.append(
-                    f"Volume ล่าสุดสูงกว่าค่าเฉลี่ย ({volume_ratio:.2f}x)"
-                )
-
-    score = _clamp01(
-        (_score_return(ret_5d, -0.06, 0.12) * 0.15)
-        + (_score_return(ret_20d, -0.10, 0.20) * 0.30)
-        + (_score_return(ret_60d, -0.15, 0.35) * 0.25)
-        + (_score_volume_ratio(volume_ratio) * 0.15)
-        + (trend_score * 0.15)
-    )
+        if row_volume_ratio is not None and row_volume_ratio >= 1.3:
+            reasons.append(f"Volume ล่าสุดสูงกว่าค่าเฉลี่ย ({row_volume_ratio:.2f}x)")
+        if row_ret_20d is not None and row_ret_20d > 0:
+            reasons.append(f"ผลตอบแทน 20 วันเป็นบวก ({row_ret_20d:.2%})")
+        if row_ret_60d is not None and row_ret_60d > 0:
+            reasons.append(f"ผลตอบแทน 60 วันเป็นบวก ({row_ret_60d:.2%})")
+        if row_score >= 0.65:
+            reasons.append("Market Ranking สนับสนุนให้ส่งเข้า TradingView")
+
+        results.append(
+            MarketRankResult(
+                symbol=symbol,
+                score=round(row_score, 4),
+                price=float(last_price[row]),
+                return_5d=float(ret_5d[row]) if has_5d[row] else None,
+                return_20d=row_ret_20d,
+                return_60d=row_ret_60d,
+                volume_ratio=row_volume_ratio,
+                trend_score=round(float(trend_score[row]), 4),
+                reason=reasons,
+            )
+        )
+    return results
+
+
+def _history_series(symbol: str, history) -> Tuple[pd.Series, Optional[pd.Series]]:
+    close_series = extract_yfinance_series(history, "Close", symbol)
+    volume_values = extract_yfinance_series(history, "Volume", symbol)
+    return close_series, None if volume_values.empty else volume_values
+
+
+def rank_histories(histories: Mapping[str, object]) -> Dict[str, MarketRankResult]:
+    """Rank many symbols' yfinance histories in one matrix pass."""
+
+    results: Dict[str, MarketRankResult] = {}
+    ready: List[Tuple[str, pd.Series, Optional[pd.Series]]] = []
+    for symbol, history in histories.items():
+        try:
+            close_series, volume_series = _history_series(symbol, history)
+        except Exception as exc:
+            results[symbol] = _rank_error(symbol, f"Market Ranking error: {exc}")
+            continue
+        ready.append((symbol, close_series, volume_series))
+    if ready:
+        ranked = rank_market_matrix(
+            [symbol for symbol, _, _ in ready],
+            _right_aligned([closes for _, closes, _ in ready]),
+            _right_aligned([volumes for _, _, volumes in ready]),
+        )
+        results.update((result.symbol, result) for result in ranked)
+    return results
 
-    if ret_20d is not None and ret_20d > 0:
-        reasons.append(f"ผลตอบแทน 20 วันเป็นบวก ({ret_20d:.2%})")
-    if ret_60d is not None and ret_60d > 0:
-        reasons.append(f"ผลตอบแทน 60 วันเป็นบวก ({ret_60d:.2%})")
-    if score >= 0.65:
-        reasons.append("Market Ranking สนับสนุนให้ส่งเข้า TradingView")
 
-    return MarketRankResult(
-        symbol=symbol,
-        score=round(score, 4),
-        price=last_price,
-        return_5d=ret_5d,
-        return_20d=ret_20d,
-        return_60d=ret_60d,
-        volume_ratio=volume_ratio,
-        trend_score=round(trend_score, 4),
-        reason=reasons,
-    )
+def _rank_history(symbol: str, history) -> MarketRankResult:
+    return rank_histories({symbol: history})[symbol]
+
+
+@ttl_cache(RANKING_CACHE_TTL_SECONDS, maxsize=10000)
+def rank_symbol(symbol: str) -> MarketRankResult:
+    symbol = symbol.upper().strip()
+    try:
+        history = get_price_history(symbol, RANKING_HISTORY_BARS)
+    except Exception as exc:
+        return _rank_error(symbol, f"Market Ranking error: {exc}")
+    return _rank_history(symbol, history)
+
+
+def _rank_uncached(symbols: List[str]) -> Dict[str, MarketRankResult]:
+    """Rank symbols missing from the ``rank_symbol`` cache together and cache them."""
+
+    results: Dict[str, MarketRankResult] = {}
+    histories = {}
+    for symbol in symbols:
+        found, cached = rank_symbol.cache.get((symbol,))
+        if found:
+            results[symbol] = cached
+            continue
+        try:
+            histories[symbol] = get_price_history(symbol, RANKING_HISTORY_BARS)
+        except Exception as exc:
+            results[symbol] = _rank_error(symbol, f"Market Ranking error: {exc}")
+    for symbol, result in rank_histories(histories).items():
+        rank_symbol.cache.set((symbol,), result)
+        results[symbol] = result
+    return results
 
 
 def rank_market_symbols(
     symbols: Iterable[str],
 ) -> Tuple[List[str], Dict[str, Dict[str, object]]]:
-    results = [rank_symbol(symbol) for symbol in symbols]
+    """Rank symbols from batched 6-month histories in one matrix pass."""
+
+    symbol_list = [str(symbol).upper().strip() for symbol in symbols]
+    download_errors = prefetch_price_histories(symbol_list, RANKING_HISTORY_BARS)
+    ranked_by_symbol = _rank_uncached(
+        [symbol for symbol in dict.fromkeys(symbol_list) if symbol not in download_errors]
+    )
+    results = []
+    for symbol in symbol_list:
+        if symbol in download_errors:
+            results.append(
+                _rank_error(symbol, f"Market Ranking error: {download_errors[symbol]}")
+            )
+        else:
+            results.append(ranked_by_symbol[symbol])
     ranked = sorted(results, key=lambda item: item.score, reverse=True)
 
     if len(ranked) < MIN_RANKED_SYMBOLS:
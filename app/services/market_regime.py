@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import Dict, List, Optional
 
-import yfinance as yf
+from app.data_sources.price_history import get_price_history
+from app.utils.market_calendar import US_MARKET, market_session_ttl
+from app.utils.yfinance_frames import extract_yfinance_series
+from app.utils.ttl_cache import ttl_cache
 
 
 BENCHMARKS = ("SPY", "QQQ")
+# Roughly one year of daily bars, enough for MA200.
+REGIME_HISTORY_BARS = 252
+REGIME_CACHE_TTL_SECONDS = 15 * 60
 
 
 @dataclass
@@ -39,8 +44,9 @@ def _pct_return(start: Optional[float], end: Optional[float]) -> Optional[float]
 
 
 def _score_benchmark(symbol: str) -> Dict[str, Optional[float]]:
-    history = yf.download(symbol, period="1y", interval="1d", progress=False, auto_adjust=True)
-    if history is None or history.empty or "Close" not in history:
+    history = get_price_history(symbol, REGIME_HISTORY_BARS)
+    close_series = extract_yfinance_series(history, "Close", symbol)
+    if close_series.empty:
         return {
             "close": None,
             "ma50": None,
@@ -50,7 +56,6 @@ def _score_benchmark(symbol: str) -> Dict[str, Optional[float]]:
             "trend_score": 0.50,
         }
 
-    close_series = history["Close"].dropna()
     if len(close_series) < 60:
         return {
             "close": _safe_float(close_series.iloc[-1]) if len(close_series) else None,
@@ -90,7 +95,11 @@ def _score_benchmark(symbol: str) -> Dict[str, Optional[float]]:
     }
 
 
-@lru_cache(maxsize=1)
+@ttl_cache(
+    REGIME_CACHE_TTL_SECONDS,
+    maxsize=1,
+    ttl_for=market_session_ttl(US_MARKET, REGIME_CACHE_TTL_SECONDS),
+)
 def detect_market_regime() -> MarketRegimeResult:
     details: Dict[str, Dict[str, Optional[float]]] = {}
     reasons: List[str] = []
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import json
+import threading
+import time
+
+
+DEFAULT_NEGATIVE_CACHE_PATH = Path("data/negative_cache.json")
+
+# How long a failure category keeps a symbol out of discovery. Data that is
+# structurally absent stays cached for days; provider pressure for minutes.
+NEGATIVE_CACHE_TTL_SECONDS: Dict[str, float] = {
+    "non_tradable_symbol": 30 * 24 * 60 * 60,
+    "missing_financial_statements": 7 * 24 * 60 * 60,
+    "insufficient_scoring_evidence": 3 * 24 * 60 * 60,
+    "missing_market_data": 24 * 60 * 60,
+    "financial_provider_error": 60 * 60,
+    "provider_rate_limited": 15 * 60,
+    "provider_timeout": 15 * 60,
+}
+_ERROR_TEXT_LIMIT = 300
+
+
+class NegativeCache:
+    """Persistent symbol -> failure category entries with per-category TTLs.
+
+    Discovery records symbols whose analysis ended in a known failure so the
+    next runs skip them until the category's TTL runs out instead of spending
+    provider budget on the same dead names every hour.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_NEGATIVE_CACHE_PATH,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.ttl_seconds = dict(NEGATIVE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds)
+        self._clock = clock
+        self._entries: Optional[Dict[str, Dict[str, Dict[str, object]]]] = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self) -> None:
+        if self._entries is not None:
+            return
+        entries: Dict[str, Dict[str, Dict[str, object]]] = {}
+        if self.path.exists():
+            try:
+                with self.path.open("r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if isinstance(data, dict):
+                    entries = {
+                        str(symbol).upper(): categories
+                        for symbol, categories in data.items()
+                        if isinstance(categories, dict)
+                    }
+            except Exception:
+                entries = {}
+        self._entries = entries
+
+    def active_categories(self, symbol: str) -> List[str]:
+        """Failure categories of ``symbol`` whose TTL has not run out."""
+
+        symbol = str(symbol or "").upper().strip()
+        now = self._clock()
+        with self._lock:
+            self._load()
+            categories = self._entries.get(symbol) or {}
+            return sorted(
+                category
+                for category, entry in categories.items()
+                if float(entry.get("expires_at", 0) or 0) > now
+            )
+
+    def partition(self, symbols: Iterable[str]) -> Tuple[List[str], Dict[str, int]]:
+        """Split symbols into ones to analyze and skip counts per category."""
+
+        kept: List[str] = []
+        skipped: Dict[str, int] = {}
+        for symbol in symbols:
+            categories = self.active_categories(symbol)
+            if categories:
+                skipped[categories[0]] = skipped.get(categories[0], 0) + 1
+            else:
+                kept.append(symbol)
+        return kept, dict(sorted(skipped.items()))
+
+    def record(self, symbol: str, category: str, error: str = "") -> bool:
+        """Cache a failure; categories without a TTL are not cached."""
+
+        symbol = str(symbol or "").upper().strip()
+        ttl = self.ttl_seconds.get(category)
+        if not symbol or not ttl:
+            return False
+        now = self._clock()
+        with self._lock:
+            self._load()
+            self._entries.setdefault(symbol, {})[category] = {
+                "expires_at": now + ttl,
+                "recorded_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+                "error": str(error or "")[:_ERROR_TEXT_LIMIT],
+            }
+            self._dirty = True
+        return True
+
+    def discard(self, symbol: str) -> None:
+        symbol = str(symbol or "").upper().strip()
+        with self._lock:
+            self._load()
+            if self._entries.pop(symbol, None) is not None:
+                self._dirty = True
+
+    def prune(self) -> int:
+        """Drop expired entries; returns how many symbols were removed."""
+
+        now = self._clock()
+        removed = 0
+        with self._lock:
+            self._load()
+            for symbol in list(self._entries):
+                live = {
+                    category: entry
+                    for category, entry in self._entries[symbol].items()
+                    if float(entry.get("expires_at", 0) or 0) > now
+                }
+                if live == self._entries[symbol]:
+                    continue
+                self._dirty = True
+                if live:
+                    self._entries[symbol] = live
+                else:
+                    del self._entries[symbol]
+                    removed += 1
+        return removed
+
+    def save(self) -> bool:
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return False
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with temp_path.open("w", encoding="utf-8") as file:
+                json.dump(self._entries, file, ensure_ascii=False, indent=2, sort_keys=True)
+            temp_path.replace(self.path)
+            self._dirty = False
+            return True
+
+
+_CACHE = NegativeCache()
+
+
+def get_negative_cache() -> NegativeCache:
+    return _CACHE
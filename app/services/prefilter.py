@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import logging
 import yfinance as yf
 
+from app.utils.market_calendar import symbol_session_ttl
+from app.utils.provider_limits import provider_rate_limiter
+from app.utils.ttl_cache import ttl_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Quote-based liquidity checks move with intraday price and volume.
+PREFILTER_CACHE_TTL_SECONDS = 15 * 60
+
 
 @dataclass
 class PrefilterResult:
@@ -23,6 +34,9 @@ MIN_AVG_VOLUME = 500_000
 MIN_MARKET_CAP = 300_000_000
 MAX_SYMBOLS_AFTER_FILTER = 500
 MIN_SYMBOLS_TO_FORCE_SELECT = 250
+PREFILTER_MAX_WORKERS = 8
+QUOTE_BATCH_SIZE = 100
+QUOTE_BATCH_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
 
 
 def _clamp01(value: float) -> float:
@@ -43,15 +57,105 @@ def _has_bad_symbol_pattern(symbol: str) -> bool:
     return any(token in symbol for token in bad_tokens)
 
 
-@lru_cache(maxsize=10000)
+def _score_prefilter_fields(
+    symbol: str,
+    fast_info: Dict,
+    info: Dict,
+) -> PrefilterResult:
+    reasons: List[str] = []
+    price = _safe_float(
+        fast_info.get("last_price")
+        or fast_info.get("lastPrice")
+        or info.get("currentPrice")
+        or info.get("regularMarketPrice")
+    )
+    avg_volume = _safe_float(
+        fast_info.get("ten_day_average_volume")
+        or fast_info.get("three_month_average_volume")
+        or info.get("averageVolume")
+        or info.get("averageDailyVolume10Day")
+    )
+    market_cap = _safe_float(
+        fast_info.get("market_cap")
+        or info.get("marketCap")
+    )
+
+    quote_type = str(info.get("quoteType") or info.get("typeDisp") or "EQUITY").upper()
+    if quote_type and quote_type not in {"EQUITY", "COMMON STOCK", "STOCK"}:
+        reasons.append(f"ตัดออกเพราะประเภทสินทรัพย์ไม่ใช่หุ้นสามัญ ({quote_type})")
+        return PrefilterResult(symbol, False, 0.0, price, avg_volume, market_cap, reasons)
+
+    hard_fail_count = 0
+    passed = True
+    if price is not None and price < MIN_PRICE:
+        hard_fail_count += 1
+        reasons.append(f"ราคาต่ำกว่า ${MIN_PRICE:.0f}")
+    elif price is not None:
+        reasons.append(f"ราคาผ่านเกณฑ์ (${price:.2f})")
+
+    if avg_volume is not None and avg_volume < MIN_AVG_VOLUME:
+        hard_fail_count += 1
+        reasons.append(f"Volume เฉลี่ยต่ำกว่า {MIN_AVG_VOLUME:,}")
+    elif avg_volume is not None:
+        reasons.append(f"Volume เฉลี่ยผ่านเกณฑ์ ({avg_volume:,.0f})")
+
+    if market_cap is not None and market_cap < MIN_MARKET_CAP:
+        hard_fail_count += 1
+        reasons.append(f"Market Cap ต่ำกว่า ${MIN_MARKET_CAP:,.0f}")
+    elif market_cap is not None:
+        reasons.append(f"Market Cap ผ่านเกณฑ์ (${market_cap:,.0f})")
+
+    if price is None and avg_volume is None and market_cap is None:
+        passed = False
+        reasons.append("ไม่มีข้อมูลราคา/Volume/Market Cap เพียงพอสำหรับ Pre-filter")
+    elif hard_fail_count >= 2:
+        passed = False
+
+    price_score = _clamp01((price or 0) / 50.0) if price is not None else 0.45
+    volume_score = _clamp01((avg_volume or 0) / 5_000_000.0) if avg_volume is not None else 0.45
+    cap_score = _clamp01((market_cap or 0) / 10_000_000_000.0) if market_cap is not None else 0.45
+    score = _clamp01((price_score * 0.15) + (volume_score * 0.55) + (cap_score * 0.30))
+
+    return PrefilterResult(
+        symbol=symbol,
+        passed=passed,
+        score=round(score, 4),
+        price=price,
+        avg_volume=avg_volume,
+        market_cap=market_cap,
+        reason=reasons,
+    )
+
+
+def _error_result(symbol: str, exc: Exception) -> PrefilterResult:
+    return PrefilterResult(
+        symbol=symbol,
+        passed=False,
+        score=0.0,
+        price=None,
+        avg_volume=None,
+        market_cap=None,
+        reason=[f"Pre-filter error: {exc}"],
+    )
+
+
+def _bad_pattern_result(symbol: str) -> PrefilterResult:
+    return PrefilterResult(symbol, False, 0.0, None, None, None, ["ตัดออกเพราะรูปแบบ symbol คล้าย warrant/unit/right"])
+
+
+@ttl_cache(
+    PREFILTER_CACHE_TTL_SECONDS,
+    maxsize=10000,
+    ttl_for=symbol_session_ttl(PREFILTER_CACHE_TTL_SECONDS),
+)
 def evaluate_symbol(symbol: str) -> PrefilterResult:
     symbol = symbol.upper().strip()
-    reasons: List[str] = []
 
     if _has_bad_symbol_pattern(symbol):
-        return PrefilterResult(symbol, False, 0.0, None, None, None, ["ตัดออกเพราะรูปแบบ symbol คล้าย warrant/unit/right"])
+        return _bad_pattern_result(symbol)
 
     try:
+        provider_rate_limiter("yfinance").acquire()
         ticker = yf.Ticker(symbol)
         fast_info = getattr(ticker, "fast_info", {}) or {}
         info: Dict = {}
@@ -59,83 +163,154 @@ def evaluate_symbol(symbol: str) -> PrefilterResult:
             info = ticker.get_info() or {}
         except Exception:
             info = {}
+        return _score_prefilter_fields(symbol, fast_info, info)
+    except Exception as exc:
+        return _error_result(symbol, exc)
 
-        price = _safe_float(
-            fast_info.get("last_price")
-            or fast_info.get("lastPrice")
-            or info.get("currentPrice")
-            or info.get("regularMarketPrice")
-        )
-        avg_volume = _safe_float(
-            fast_info.get("ten_day_average_volume")
-            or fast_info.get("three_month_average_volume")
-            or info.get("averageVolume")
-            or info.get("averageDailyVolume10Day")
-        )
-        market_cap = _safe_float(
-            fast_info.get("market_cap")
-            or info.get("marketCap")
-        )
 
-        quote_type = str(info.get("quoteType") or info.get("typeDisp") or "EQUITY").upper()
-        if quote_type and quote_type not in {"EQUITY", "COMMON STOCK", "STOCK"}:
-            reasons.append(f"ตัดออกเพราะประเภทสินทรัพย์ไม่ใช่หุ้นสามัญ ({quote_type})")
-            return PrefilterResult(symbol, False, 0.0, price, avg_volume, market_cap, reasons)
-
-        hard_fail_count = 0
-        passed = True
-        if price is not None and price < MIN_PRICE:
-            hard_fail_count += 1
-            reasons.append(f"ราคาต่ำกว่า ${MIN_PRICE:.0f}")
-        elif price is not None:
-            reasons.append(f"ราคาผ่านเกณฑ์ (${price:.2f})")
-
-        if avg_volume is not None and avg_volume < MIN_AVG_VOLUME:
-            hard_fail_count += 1
-            reasons.append(f"Volume เฉลี่ยต่ำกว่า {MIN_AVG_VOLUME:,}")
-        elif avg_volume is not None:
-            reasons.append(f"Volume เฉลี่ยผ่านเกณฑ์ ({avg_volume:,.0f})")
-
-        if market_cap is not None and market_cap < MIN_MARKET_CAP:
-            hard_fail_count += 1
-            reasons.append(f"Market Cap ต่ำกว่า ${MIN_MARKET_CAP:,.0f}")
-        elif market_cap is not None:
-            reasons.append(f"Market Cap ผ่านเกณฑ์ (${market_cap:,.0f})")
-
-        if price is None and avg_volume is None and market_cap is None:
-            passed = False
-            reasons.append("ไม่มีข้อมูลราคา/Volume/Market Cap เพียงพอสำหรับ Pre-filter")
-        elif hard_fail_count >= 2:
-            passed = False
-
-        price_score = _clamp01((price or 0) / 50.0) if price is not None else 0.45
-        volume_score = _clamp01((avg_volume or 0) / 5_000_000.0) if avg_volume is not None else 0.45
-        cap_score = _clamp01((market_cap or 0) / 10_000_000_000.0) if market_cap is not None else 0.45
-        score = _clamp01((price_score * 0.15) + (volume_score * 0.55) + (cap_score * 0.30))
-
-        return PrefilterResult(
-            symbol=symbol,
-            passed=passed,
-            score=round(score, 4),
-            price=price,
-            avg_volume=avg_volume,
-            market_cap=market_cap,
-            reason=reasons,
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    size = max(1, int(size))
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _quote_session():
+    """yfinance's cookie/crumb-aware session, or None if this yfinance lacks it."""
+
+    try:
+        session = yf.data.YfData()
+        if not callable(getattr(session, "get_raw_json", None)):
+            raise AttributeError("YfData.get_raw_json")
+    except (AttributeError, TypeError) as exc:
+        logger.warning("yfinance has no usable batched quote session (%s); prefiltering per symbol", exc)
+        return None
+    return session
+
+
+def _fetch_quote_batch(symbols: List[str]) -> Dict[str, Dict]:
+    """Fetch quote-level fields for many symbols in one Yahoo quote request.
+
+    yfinance has no public multi-symbol quote call, so this reuses its
+    internal session. If a yfinance release changes or drops that API, or
+    the request fails, the map is empty and the affected symbols go through
+    the per-symbol ``evaluate_symbol`` path.
+    """
+
+    session = _quote_session()
+    if session is None:
+        return {}
+    try:
+        provider_rate_limiter("yfinance").acquire()
+        payload = session.get_raw_json(
+            QUOTE_BATCH_URL,
+            params={"symbols": ",".join(symbols), "formatted": "false"},
         )
+        quotes = ((payload or {}).get("quoteResponse") or {}).get("result") or []
+    except (AttributeError, TypeError) as exc:
+        logger.warning("yfinance batched quote API changed (%s); prefiltering per symbol", exc)
+        return {}
     except Exception as exc:
-        return PrefilterResult(
-            symbol=symbol,
-            passed=False,
-            score=0.0,
-            price=None,
-            avg_volume=None,
-            market_cap=None,
-            reason=[f"Pre-filter error: {exc}"],
-        )
+        logger.debug("Batched quote request failed for %d symbols: %s", len(symbols), exc)
+        return {}
+    return {
+        str(quote.get("symbol")).upper(): quote
+        for quote in quotes
+        if isinstance(quote, dict) and quote.get("symbol")
+    }
+
+
+def _quote_fast_info(quote: Dict) -> Dict:
+    return {
+        "last_price": quote.get("regularMarketPrice"),
+        "ten_day_average_volume": quote.get("averageDailyVolume10Day"),
+        "three_month_average_volume": quote.get("averageDailyVolume3Month"),
+        "market_cap": quote.get("marketCap"),
+    }
+
+
+def _quote_is_complete(quote: Dict) -> bool:
+    fields = _quote_fast_info(quote)
+    has_volume = (
+        fields["ten_day_average_volume"] is not None
+        or fields["three_month_average_volume"] is not None
+    )
+    return (
+        fields["last_price"] is not None
+        and has_volume
+        and fields["market_cap"] is not None
+        and bool(quote.get("quoteType"))
+    )
+
+
+def _evaluate_quote(symbol: str, quote: Dict) -> PrefilterResult:
+    """Score a symbol from batched quote fields, calling get_info only for gaps."""
+
+    try:
+        info: Dict = {"quoteType": quote.get("quoteType")}
+        if not _quote_is_complete(quote):
+            provider_rate_limiter("yfinance").acquire()
+            try:
+                info = yf.Ticker(symbol).get_info() or info
+            except Exception:
+                pass
+        return _score_prefilter_fields(symbol, _quote_fast_info(quote), info)
+    except Exception as exc:
+        return _error_result(symbol, exc)
+
+
+def _evaluate_with_quote(symbol: str, quotes: Dict[str, Dict]) -> PrefilterResult:
+    quote = quotes.get(symbol)
+    if quote is None:
+        return evaluate_symbol(symbol)
+    result = _evaluate_quote(symbol, quote)
+    # Shares the per-symbol cache (and its session-aware TTL) with evaluate_symbol.
+    evaluate_symbol.cache.set((symbol,), result)
+    return result
+
+
+def prefilter_symbols(
+    symbols: Iterable[str],
+    max_workers: int = PREFILTER_MAX_WORKERS,
+    batch_size: int = QUOTE_BATCH_SIZE,
+) -> Tuple[List[str], Dict[str, Dict[str, object]]]:
+    """Pre-filter a large universe with batched quotes and bounded concurrency.
+
+    Symbols still in the ``evaluate_symbol`` cache are not fetched again; for
+    the rest, quote-level fields for ``batch_size`` symbols arrive in one
+    request. Only symbols the batch could not fully describe fall back to
+    ``get_info`` or to the per-symbol ``evaluate_symbol`` path. All provider
+    calls share the process-wide yfinance rate limit, so raising
+    ``max_workers`` cannot exceed it.
+    """
+
+    symbol_list = [str(symbol).upper().strip() for symbol in symbols]
+    quotable = []
+    seen = set()
+    evaluated: Dict[str, PrefilterResult] = {}
+    for symbol in symbol_list:
+        if not symbol or symbol in seen or _has_bad_symbol_pattern(symbol):
+            continue
+        seen.add(symbol)
+        found, cached = evaluate_symbol.cache.get((symbol,))
+        if found:
+            evaluated[symbol] = cached
+        else:
+            quotable.append(symbol)
 
+    quotes: Dict[str, Dict] = {}
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        for batch in executor.map(_fetch_quote_batch, _chunks(quotable, batch_size)):
+            quotes.update(batch)
+        for symbol, result in zip(
+            quotable,
+            executor.map(lambda item: _evaluate_with_quote(item, quotes), quotable),
+        ):
+            evaluated[symbol] = result
 
-def prefilter_symbols(symbols: Iterable[str]) -> Tuple[List[str], Dict[str, Dict[str, object]]]:
-    results = [evaluate_symbol(symbol) for symbol in symbols]
+    results = [
+        evaluated[symbol] if symbol in evaluated else evaluate_symbol(symbol)
+        for symbol in symbol_list
+    ]
     passed_results = [result for result in results if result.passed]
 
     passed_results.sort(key=lambda item: item.score, reverse=True)
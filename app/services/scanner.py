@@ -1,20 +1,46 @@
-from tradingview_ta import TA_Handler, Interval
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from tradingview_ta import TA_Handler, Interval, get_multiple_analysis
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
 from typing import List, Tuple, Dict, Any, Optional
 
+import time
+
+import numpy as np
+
 from app.models import Candidate, ErrorDetail
 from app.universe import resolve_universe
-from app.services.backtest import get_backtest_result, result_to_metadata
+from app.data_sources.price_history import prefetch_price_histories
+from app.services.exchange_index import get_exchange_index
+from app.services.backtest import BACKTEST_HISTORY_BARS, get_backtest_result, get_backtest_results, result_to_metadata
+from app.services.local_indicators import LOCAL_INDICATOR_BARS, compute_local_analyses
 from app.services.prefilter import prefilter_symbols
 from app.services.market_ranker import rank_market_symbols
 from app.services.feedback_loop import append_feedback_seeds
 from app.services.weight_tuner import load_score_weights
 from app.services.fundamental_score import get_fundamental_score, result_to_metadata as fundamental_to_metadata
 from app.services.sector_rotation import get_sector_rotation_score, result_to_metadata as sector_to_metadata
+from app.utils.market_calendar import market_for_exchange, session_ttl
+from app.utils.provider_limits import provider_concurrency, provider_rate_limiter, reasons_outcome
+from app.utils.ttl_cache import TTLCache, register_cache
 
 
 DISCOVERY_THRESHOLD = 0.55
 EXCHANGE_FALLBACKS = ["NASDAQ", "NYSE", "AMEX"]
+TECHNICAL_MAX_WORKERS = 10
+TRADINGVIEW_BATCH_SIZE = 150
+TRADINGVIEW_TIMEOUT_SECONDS = 20
+# A failed batch is retried in halves after an exponential pause, this many times.
+TRADINGVIEW_CHUNK_RETRIES = 2
+TRADINGVIEW_RETRY_BACKOFF_SECONDS = 1.0
+# Delay before an unresolved symbol starts probing its next exchange candidate.
+EXCHANGE_HEDGE_DELAY_SECONDS = 0.25
+# TradingView daily analysis refreshes intraday; closed sessions keep it until the next open.
+ANALYSIS_CACHE_TTL_SECONDS = 15 * 60
+NO_ANALYSIS_ERROR = "No TradingView analysis found on supported exchanges"
+TECHNICAL_SOURCE_TRADINGVIEW = "tradingview"
+TECHNICAL_SOURCE_LOCAL = "local"
+TECHNICAL_SOURCES = (TECHNICAL_SOURCE_TRADINGVIEW, TECHNICAL_SOURCE_LOCAL)
 
 RECOMMENDATION_SCORE = {
     "STRONG_BUY": 1.0,
@@ -24,13 +50,29 @@ RECOMMENDATION_SCORE = {
     "SELL": 0.25,
     "STRONG_SELL": 0.05,
 }
+MOMENTUM_BASE_SCORE = {
+    "STRONG_BUY": 0.90,
+    "BUY": 0.72,
+    "NEUTRAL": 0.50,
+    "HOLD": 0.50,
+    "SELL": 0.25,
+}
 
 
-def _exchange_candidates(requested_exchange: str) -> List[str]:
+def _exchange_candidates(requested_exchange: str, symbol: Optional[str] = None) -> List[str]:
     requested = (requested_exchange or "NASDAQ").upper()
     if requested == "SET":
         return ["SET"]
-    return [requested] + [exchange for exchange in EXCHANGE_FALLBACKS if exchange != requested]
+    candidates = [requested] + [exchange for exchange in EXCHANGE_FALLBACKS if exchange != requested]
+    if symbol:
+        return get_exchange_index().order_candidates(symbol, candidates)
+    return candidates
+
+
+def _is_resolved_symbol(symbol: str, requested_exchange: str) -> bool:
+    if (requested_exchange or "").upper() == "SET":
+        return True
+    return get_exchange_index().is_resolved(symbol, _exchange_candidates(requested_exchange))
 
 
 def _clamp01(value: float) -> float:
@@ -210,16 +252,7 @@ def _growth_score(indicators: Dict[str, Any]) -> Dict[str, Any]:
 
 def _momentum_score(summary: Dict[str, Any], indicator_score: float, relative_strength: float, sector_score: float) -> float:
     recommendation = str(summary.get("RECOMMENDATION", "HOLD")).upper()
-    if recommendation == "STRONG_BUY":
-        base = 0.90
-    elif recommendation == "BUY":
-        base = 0.72
-    elif recommendation in {"NEUTRAL", "HOLD"}:
-        base = 0.50
-    elif recommendation == "SELL":
-        base = 0.25
-    else:
-        base = 0.10
+    base = MOMENTUM_BASE_SCORE.get(recommendation, 0.10)
     return _clamp01((base * 0.38) + (indicator_score * 0.32) + (relative_strength * 0.18) + (sector_score * 0.12))
 
 
@@ -277,30 +310,51 @@ def _build_reasons(symbol: str, raw_recommendation: str, scores: Dict[str, float
     return reasons[:28]
 
 
-def _weighted_final_score(score_values: Dict[str, float]) -> float:
-    weights = load_score_weights()
+def _weighted_final_score(score_values: Dict[str, float], weights: Optional[Dict[str, float]] = None) -> float:
+    weights = weights if weights is not None else load_score_weights()
     return _clamp01(sum(float(score_values.get(key, 0.0)) * float(weight) for key, weight in weights.items()))
 
 
+def _enrich_symbol(symbol: str) -> Dict[str, Any]:
+    """Run the provider-backed enrichment that does not depend on TradingView."""
+
+    return {
+        "backtest": get_backtest_result(symbol),
+        "fundamental": get_fundamental_score(symbol),
+        "sector_rotation": get_sector_rotation_score(symbol),
+    }
+
+
+def _enrichment_outcome(enrichment: Dict[str, Any]) -> str:
+    # The enrichment providers catch their own errors and report them as reasons.
+    return reasons_outcome(
+        reason for result in enrichment.values() for reason in (getattr(result, "reason", None) or [])
+    )
+
+
 def _rank_candidate(
     symbol: str,
     analysis: Dict[str, Any],
     indicators: Dict[str, Any],
     prefilter_data: Optional[Dict[str, Any]] = None,
     market_rank_data: Optional[Dict[str, Any]] = None,
+    enrichment: Optional[Dict[str, Any]] = None,
+    score_weights: Optional[Dict[str, float]] = None,
 ) -> Candidate:
     prefilter_data = prefilter_data or {}
+    score_weights = score_weights if score_weights is not None else load_score_weights()
     market_rank_data = market_rank_data or {}
+    enrichment = enrichment or _enrich_symbol(symbol)
     raw_recommendation = str(analysis.get("RECOMMENDATION", "HOLD")).upper()
     vote_score = _technical_score(analysis)
     indicator_result = _indicator_score(indicators)
     relative_result = _relative_strength_score(indicators)
     growth_result = _growth_score(indicators)
-    backtest_result = get_backtest_result(symbol)
+    backtest_result = enrichment["backtest"]
     backtest_metadata = result_to_metadata(backtest_result)
-    fundamental_result = get_fundamental_score(symbol)
+    fundamental_result = enrichment["fundamental"]
     fundamental_metadata = fundamental_to_metadata(fundamental_result)
-    sector_result = get_sector_rotation_score(symbol)
+    sector_result = enrichment["sector_rotation"]
     sector_metadata = sector_to_metadata(sector_result)
     prefilter_score = float(prefilter_data.get("prefilter_score", 0.50) or 0.50)
     market_rank_score = float(market_rank_data.get("market_rank_score", 0.50) or 0.50)
@@ -320,7 +374,7 @@ def _rank_candidate(
         "fundamental_score": fundamental_result.score,
         "risk_score": risk,
     }
-    final_score = _weighted_final_score(score_values)
+    final_score = _weighted_final_score(score_values, score_weights)
     recommendation = _rank_recommendation(final_score)
 
     scores = {
@@ -341,7 +395,7 @@ def _rank_candidate(
     details = {
         **analysis,
         **scores,
-        "score_weights": load_score_weights(),
+        "score_weights": dict(score_weights),
         "raw_recommendation": raw_recommendation,
         "recommendation": recommendation,
         "scanner_v50": {
@@ -371,39 +425,552 @@ def _rank_candidate(
     return Candidate(symbol=symbol, recommendation=recommendation, details=details)
 
 
-def fetch_analysis(symbol: str, screener: str, exchange: str) -> Dict[str, Any]:
-    """Fetches technical analysis and indicators for a single stock symbol, trying common US exchanges when needed."""
+# Indicator fields read by the scalar scorers, with the same name fallbacks.
+_SCORE_INDICATOR_FIELDS = {
+    "close": ("close", "Close"),
+    "rsi": ("RSI", "RSI[1]"),
+    "macd": ("MACD.macd", "MACD"),
+    "macd_signal": ("MACD.signal",),
+    "sma50": ("SMA50", "SMA50[1]"),
+    "sma200": ("SMA200", "SMA200[1]"),
+    "volume": ("volume", "Volume"),
+    "volume_ma": ("Volume MA", "volume_ma", "SMA20.volume"),
+    "atr": ("ATR", "ATR[1]"),
+    "high_52w": ("High.52W", "52 Week High", "high_52w"),
+    "perf_1m": ("Perf.W", "Perf.1M", "change_1m"),
+    "perf_3m": ("Perf.3M", "change_3m"),
+    "perf_6m": ("Perf.6M", "change_6m"),
+    "earnings_growth": ("EPS Diluted Growth TTM YoY", "earnings_growth", "EPS growth"),
+    "revenue_growth": ("Revenue Growth TTM YoY", "revenue_growth", "Revenue growth"),
+}
+
+
+@dataclass
+class CandidateInputs:
+    symbol: str
+    analysis: Dict[str, Any]
+    indicators: Dict[str, Any]
+    prefilter: Dict[str, Any]
+    market_rank: Dict[str, Any]
+    enrichment: Dict[str, Any]
+
+
+@dataclass
+class ScoreInputs:
+    """Struct-of-arrays view of every input ``_rank_candidate`` scores.
+
+    Element ``i`` of each array belongs to ``rows[i]``. Indicator columns hold
+    NaN where the scalar scorers see ``None``; ``present`` keeps that apart
+    from a provider NaN, which the scalar code still treats as a value.
+    """
+
+    rows: List[CandidateInputs]
+    recommendations: List[str]
+    values: Dict[str, np.ndarray]
+    present: Dict[str, np.ndarray]
+
+
+def _score_inputs(rows: List[CandidateInputs]) -> Tuple[ScoreInputs, List[ErrorDetail]]:
+    kept: List[CandidateInputs] = []
+    recommendations: List[str] = []
+    columns: Dict[str, List[Optional[float]]] = {
+        name: []
+        for name in (
+            *_SCORE_INDICATOR_FIELDS,
+            "buy",
+            "neutral",
+            "sell",
+            "prefilter_score",
+            "market_rank_score",
+            "sector_rotation_score",
+            "backtest_score",
+            "fundamental_score",
+        )
+    }
+    errors = []
+    for row in rows:
+        try:
+            analysis = row.analysis
+            extracted = {name: _get_indicator(row.indicators, *names) for name, names in _SCORE_INDICATOR_FIELDS.items()}
+            extracted.update(
+                buy=float(analysis.get("BUY", 0) or 0),
+                neutral=float(analysis.get("NEUTRAL", 0) or 0),
+                sell=float(analysis.get("SELL", 0) or 0),
+                prefilter_score=float((row.prefilter or {}).get("prefilter_score", 0.50) or 0.50),
+                market_rank_score=float((row.market_rank or {}).get("market_rank_score", 0.50) or 0.50),
+                sector_rotation_score=float(row.enrichment["sector_rotation"].score),
+                backtest_score=float(row.enrichment["backtest"].score),
+                fundamental_score=float(row.enrichment["fundamental"].score),
+            )
+            recommendation = str(analysis.get("RECOMMENDATION", "HOLD")).upper()
+        except Exception as e:
+            errors.append(ErrorDetail(symbol=row.symbol, error=str(e)))
+            continue
+        kept.append(row)
+        recommendations.append(recommendation)
+        for name, value in extracted.items():
+            columns[name].append(value)
+    values = {name: np.array([np.nan if v is None else v for v in column], dtype=float) for name, column in columns.items()}
+    present = {name: np.array([v is not None for v in column], dtype=bool) for name, column in columns.items()}
+    return ScoreInputs(kept, recommendations, values, present), errors
+
+
+def _clamp01_array(values: np.ndarray) -> np.ndarray:
+    # Same comparisons as ``_clamp01``, so NaN also comes out as 1.0.
+    upper = np.where(values < 1.0, values, 1.0)
+    return np.where(upper > 0.0, upper, 0.0)
+
+
+def _round4_array(values: np.ndarray) -> np.ndarray:
+    # np.round scales before rounding and can disagree with round() in the last digit.
+    return np.array([round(value, 4) for value in values.tolist()], dtype=float)
+
+
+def _mean_of_present(parts: List[Tuple[np.ndarray, np.ndarray]], size: int) -> np.ndarray:
+    """Per-row mean of the present parts, summed in the scalar scorers' order."""
+
+    total = np.zeros(size)
+    count = np.zeros(size)
+    for part, mask in parts:
+        total = total + np.where(mask, part, 0.0)
+        count = count + mask
+    return np.where(count > 0, total / np.where(count > 0, count, 1.0), 0.50)
+
+
+def _score_candidate_batch(inputs: ScoreInputs, weights: Dict[str, float]) -> Dict[str, np.ndarray]:
+    """Vectorized ``_rank_candidate`` scoring; returns every component and ``final_score``.
+
+    Each step mirrors its scalar scorer operation for operation, so the
+    results are bit-identical to scoring the rows one by one.
+    """
+
+    size = len(inputs.rows)
+    v, p = inputs.values, inputs.present
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base = np.array([RECOMMENDATION_SCORE.get(r, 0.50) for r in inputs.recommendations], dtype=float)
+        buy, neutral, sell = v["buy"], v["neutral"], v["sell"]
+        vote_total = buy + neutral + sell
+        # ``if total`` is true for NaN as well, hence ``!= 0`` rather than ``> 0``.
+        votes = np.where(vote_total != 0, (buy + 0.5 * neutral) / np.where(vote_total != 0, vote_total, 1.0), base)
+        technical = _clamp01_array((base * 0.65) + (votes * 0.35))
+
+        close, rsi = v["close"], v["rsi"]
+        volume_mask = p["volume"] & p["volume_ma"] & (v["volume_ma"] > 0)
+        breakout_mask = p["close"] & p["high_52w"] & (v["high_52w"] > 0)
+        atr_mask = p["close"] & p["atr"] & (close > 0)
+        volume_ratio = v["volume"] / v["volume_ma"]
+        breakout_ratio = close / v["high_52w"]
+        atr_pct = v["atr"] / close
+        indicator_parts = [
+            (
+                np.select([(45 <= rsi) & (rsi <= 70), (35 <= rsi) & (rsi < 45), rsi > 70], [0.85, 0.60, 0.45], 0.30),
+                p["rsi"],
+            ),
+            (np.where(v["macd"] > v["macd_signal"], 0.85, 0.35), p["macd"] & p["macd_signal"]),
+            (np.where(close > v["sma50"], 0.80, 0.35), p["close"] & p["sma50"]),
+            (np.where(close > v["sma200"], 0.85, 0.30), p["close"] & p["sma200"]),
+            (np.select([volume_ratio >= 1.5, volume_ratio >= 1.1], [0.85, 0.65], 0.45), volume_mask),
+            (np.select([breakout_ratio >= 0.98, breakout_ratio >= 0.90], [0.85, 0.65], 0.45), breakout_mask),
+            (np.where(atr_pct <= 0.06, 0.70, 0.40), atr_mask),
+        ]
+        indicator = _round4_array(_clamp01_array(_mean_of_present(indicator_parts, size)))
+
+        relative_strength = _round4_array(
+            _mean_of_present(
+                [(_clamp01_array((v[name] + 20.0) / 40.0), p[name]) for name in ("perf_1m", "perf_3m", "perf_6m")],
+                size,
+            )
+        )
+        growth = _round4_array(
+            _mean_of_present(
+                [
+                    (_clamp01_array((v["earnings_growth"] + 20.0) / 60.0), p["earnings_growth"]),
+                    (_clamp01_array((v["revenue_growth"] + 10.0) / 50.0), p["revenue_growth"]),
+                ],
+                size,
+            )
+        )
+
+        sector = v["sector_rotation_score"]
+        momentum_base = np.array([MOMENTUM_BASE_SCORE.get(r, 0.10) for r in inputs.recommendations], dtype=float)
+        momentum = _clamp01_array((momentum_base * 0.38) + (indicator * 0.32) + (relative_strength * 0.18) + (sector * 0.12))
+
+        risk_total = sell + buy + neutral
+        sell_pressure = np.where(risk_total != 0, sell / np.where(risk_total != 0, risk_total, 1.0), 0.0)
+        rounded_atr_pct = _round4_array(atr_pct)
+        atr_risk = np.where(
+            atr_mask, np.select([rounded_atr_pct <= 0.04, rounded_atr_pct <= 0.08], [0.80, 0.55], 0.30), 0.70
+        )
+        risk = _clamp01_array(((1.0 - sell_pressure) * 0.70) + (atr_risk * 0.30))
+
+    scores = {
+        "prefilter_score": v["prefilter_score"],
+        "market_rank_score": v["market_rank_score"],
+        "technical_vote_score": technical,
+        "indicator_score": indicator,
+        "momentum_score": momentum,
+        "relative_strength_score": relative_strength,
+        "sector_rotation_score": sector,
+        "growth_score": growth,
+        "backtest_score": v["backtest_score"],
+        "fundamental_score": v["fundamental_score"],
+        "risk_score": risk,
+    }
+    final = np.zeros(size)
+    for key, weight in weights.items():
+        final = final + (scores[key] if key in scores else 0.0) * float(weight)
+    scores["final_score"] = _clamp01_array(final)
+    return scores
+
+
+def _rank_recommendations(final_scores: np.ndarray) -> List[str]:
+    return np.select(
+        [final_scores >= 0.82, final_scores >= DISCOVERY_THRESHOLD, final_scores >= 0.45, final_scores >= 0.25],
+        ["STRONG_BUY", "BUY", "HOLD", "SELL"],
+        "STRONG_SELL",
+    ).tolist()
+
+
+def _rank_candidates(
+    rows: List[CandidateInputs],
+    score_weights: Optional[Dict[str, float]] = None,
+) -> Tuple[List[Candidate], List[ErrorDetail]]:
+    """Score all rows in one columnar pass and build only the passing candidates.
+
+    ``Candidate`` objects, reasons and metadata are materialized through
+    ``_rank_candidate`` for rows whose final score reaches
+    ``DISCOVERY_THRESHOLD``; the rest never leave the arrays.
+    """
+
+    score_weights = score_weights if score_weights is not None else load_score_weights()
+    inputs, errors = _score_inputs(rows)
+    final_scores = _score_candidate_batch(inputs, score_weights)["final_score"]
+    candidates = []
+    for index in np.flatnonzero(final_scores >= DISCOVERY_THRESHOLD):
+        row = inputs.rows[index]
+        try:
+            candidates.append(
+                _rank_candidate(
+                    row.symbol,
+                    row.analysis,
+                    row.indicators,
+                    row.prefilter,
+                    row.market_rank,
+                    enrichment=row.enrichment,
+                    score_weights=score_weights,
+                )
+            )
+        except Exception as e:
+            errors.append(ErrorDetail(symbol=row.symbol, error=str(e)))
+    return candidates, errors
+
+
+def _probe_exchange(symbol: str, screener: str, exchange: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    try:
+        handler = TA_Handler(
+            symbol=symbol,
+            screener=screener,
+            exchange=exchange,
+            interval=Interval.INTERVAL_1_DAY,
+        )
+        analysis_obj = handler.get_analysis()
+    except Exception as e:
+        return None, str(e)
+    summary = analysis_obj.summary or {}
+    indicators = analysis_obj.indicators or {}
+    if summary or indicators:
+        return {
+            "symbol": symbol,
+            "exchange": exchange,
+            "analysis": summary,
+            "indicators": indicators,
+        }, None
+    return None, None
+
+
+def _hedged_probe(
+    symbol: str,
+    screener: str,
+    candidates: List[str],
+    hedge_delay: float,
+) -> Tuple[Optional[Dict[str, Any]], List[str], Optional[str]]:
+    """Start one probe per exchange, each ``hedge_delay`` after the previous one.
+
+    A probe that finishes empty starts the next candidate immediately. The first
+    non-empty analysis wins; probes not yet started are cancelled and running
+    ones are abandoned instead of awaited.
+    """
+
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    remaining = list(candidates)
+    pending: Dict[Any, str] = {}
+    empty_exchanges: List[str] = []
     last_error = None
-    for exchange_candidate in _exchange_candidates(exchange):
+    try:
+        while remaining or pending:
+            if remaining:
+                exchange_candidate = remaining.pop(0)
+                pending[executor.submit(_probe_exchange, symbol, screener, exchange_candidate)] = exchange_candidate
+            done, _ = wait(
+                list(pending),
+                timeout=hedge_delay if remaining else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                exchange_candidate = pending.pop(future)
+                result, error = future.result()
+                if result is not None:
+                    return result, empty_exchanges, None
+                if error is None:
+                    empty_exchanges.append(exchange_candidate)
+                else:
+                    last_error = error
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None, empty_exchanges, last_error
+
+
+def fetch_analysis(
+    symbol: str,
+    screener: str,
+    exchange: str,
+    hedge_delay: float = EXCHANGE_HEDGE_DELAY_SECONDS,
+) -> Dict[str, Any]:
+    """Fetches technical analysis and indicators for a single stock symbol, trying common US exchanges when needed.
+
+    Symbols with a known exchange are probed in order. Unresolved symbols
+    probe their candidates as hedged concurrent requests so a non-NASDAQ name
+    does not wait out a full timeout per wrong exchange.
+    """
+    candidates = _exchange_candidates(exchange, symbol)
+    if len(candidates) > 1 and not _is_resolved_symbol(symbol, exchange):
+        result, empty_exchanges, last_error = _hedged_probe(symbol, screener, candidates, hedge_delay)
+    else:
+        result, empty_exchanges, last_error = None, [], None
+        for exchange_candidate in candidates:
+            result, error = _probe_exchange(symbol, screener, exchange_candidate)
+            if result is not None:
+                break
+            if error is None:
+                empty_exchanges.append(exchange_candidate)
+            else:
+                last_error = error
+
+    get_exchange_index().record_failure(symbol, empty_exchanges)
+    if result is not None:
+        get_exchange_index().record_success(symbol, result["exchange"])
+        return result
+    return {"symbol": symbol, "error": last_error or NO_ANALYSIS_ERROR}
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    size = max(1, int(size))
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def _analysis_result(symbol: str, exchange: str, analysis_obj: Any) -> Optional[Dict[str, Any]]:
+    summary = getattr(analysis_obj, "summary", None) or {}
+    indicators = getattr(analysis_obj, "indicators", None) or {}
+    if not (summary or indicators):
+        return None
+    return {
+        "symbol": symbol,
+        "exchange": exchange,
+        "analysis": summary,
+        "indicators": indicators,
+    }
+
+
+def _fetch_analysis_round(
+    pairs_by_symbol: Dict[str, List[str]],
+    screener: str,
+    batch_size: int,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Request every ``EXCHANGE:SYMBOL`` pair; returns analyses and failed pairs with their error.
+
+    A failing batch is almost always TradingView rate limiting, which
+    tradingview_ta reports as a JSON or KeyError rather than a 429, so every
+    batch-level error counts as a throttle for the AIMD controller. The batch
+    is then retried in halves after an exponential backoff instead of falling
+    apart into one request per symbol.
+    """
+
+    pairs = [f"{exchange}:{symbol}".upper() for symbol, exchanges in pairs_by_symbol.items() for exchange in exchanges]
+    analyses: Dict[str, Any] = {}
+    failed_pairs: Dict[str, str] = {}
+    controller = provider_concurrency("tradingview")
+    queue = deque((chunk, 0) for chunk in _chunks(pairs, batch_size))
+    while queue:
+        chunk, attempt = queue.popleft()
+        provider_rate_limiter("tradingview").acquire()
+        token = controller.acquire()
         try:
-            handler = TA_Handler(
-                symbol=symbol,
+            response = get_multiple_analysis(
                 screener=screener,
-                exchange=exchange_candidate,
                 interval=Interval.INTERVAL_1_DAY,
+                symbols=chunk,
+                timeout=TRADINGVIEW_TIMEOUT_SECONDS,
             )
-            analysis_obj = handler.get_analysis()
-            summary = analysis_obj.summary or {}
-            indicators = analysis_obj.indicators or {}
-            if summary or indicators:
-                return {
-                    "symbol": symbol,
-                    "exchange": exchange_candidate,
-                    "analysis": summary,
-                    "indicators": indicators,
-                }
         except Exception as e:
-            last_error = str(e)
+            controller.release(token, "throttle")
+            if attempt >= TRADINGVIEW_CHUNK_RETRIES:
+                failed_pairs.update(dict.fromkeys(chunk, f"TradingView batch request failed: {e!r}"))
+                continue
+            time.sleep(TRADINGVIEW_RETRY_BACKOFF_SECONDS * (2**attempt))
+            half = (len(chunk) + 1) // 2
+            queue.extend((part, attempt + 1) for part in (chunk[:half], chunk[half:]) if part)
             continue
-    return {"symbol": symbol, "error": last_error or "No TradingView analysis found on supported exchanges"}
+        controller.release(token, "success")
+        analyses.update(response or {})
+    return analyses, failed_pairs
+
+
+def _analysis_cache_key(symbol: str, screener: str, exchange: str) -> Tuple[str, str, str]:
+    return (market_for_exchange(exchange, screener), (screener or "").lower(), symbol.upper())
+
+
+def _analysis_ttl(key: Tuple[str, str, str]) -> float:
+    return session_ttl(key[0], ANALYSIS_CACHE_TTL_SECONDS)
+
+
+_ANALYSIS_CACHE = register_cache(
+    TTLCache(
+        "tradingview_analysis",
+        ANALYSIS_CACHE_TTL_SECONDS,
+        maxsize=20000,
+        ttl_for=_analysis_ttl,
+    )
+)
+
+
+def fetch_analyses(
+    symbols: List[str],
+    screener: str,
+    exchange: str,
+    batch_size: int = TRADINGVIEW_BATCH_SIZE,
+    max_workers: int = TECHNICAL_MAX_WORKERS,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetches technical analysis for many symbols, serving fresh results from cache.
+
+    Successful analyses are cached until the next session boundary of the
+    market (at most ``ANALYSIS_CACHE_TTL_SECONDS`` while it is open), so scans
+    outside trading hours do not call TradingView again. Results use the same
+    shape as ``fetch_analysis``.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for symbol in dict.fromkeys(symbols):
+        found, cached = _ANALYSIS_CACHE.get(_analysis_cache_key(symbol, screener, exchange))
+        if found:
+            results[symbol] = cached
+        else:
+            missing.append(symbol)
+    if not missing:
+        return results
+
+    fetched = _fetch_uncached_analyses(missing, screener, exchange, batch_size, max_workers)
+    for symbol, result in fetched.items():
+        if "error" not in result:
+            _ANALYSIS_CACHE.set(_analysis_cache_key(symbol, screener, exchange), result)
+    results.update(fetched)
+    return results
 
 
-def scan_market(symbols: List[str], screener: str = "america", exchange: str = "NASDAQ") -> Tuple[List[Candidate], List[ErrorDetail]]:
+def _fetch_uncached_analyses(
+    symbols: List[str],
+    screener: str,
+    exchange: str,
+    batch_size: int,
+    max_workers: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetches technical analysis for many symbols with multi-symbol TradingView requests.
+
+    Symbols whose exchange is known from the exchange index are requested on
+    that exchange only. Unresolved symbols send every exchange candidate as an
+    ``EXCHANGE:SYMBOL`` pair in the same round, so a NYSE name no longer pays
+    for failed NASDAQ requests first. A known exchange that returns nothing
+    gets one more round with the remaining candidates. Symbols whose batch
+    still failed after ``_fetch_analysis_round``'s retries get that error;
+    only pairs a successful response left out entirely go through the
+    per-symbol ``fetch_analysis`` path.
+    """
+    index = get_exchange_index()
+    candidates_by_symbol = {symbol: _exchange_candidates(exchange, symbol) for symbol in dict.fromkeys(symbols)}
+    pending = {
+        symbol: candidates[:1] if _is_resolved_symbol(symbol, exchange) else candidates
+        for symbol, candidates in candidates_by_symbol.items()
+    }
+
+    results: Dict[str, Dict[str, Any]] = {}
+    retry_symbols = set()
+    batch_errors: Dict[str, str] = {}
+    tried: Dict[str, List[str]] = {symbol: [] for symbol in candidates_by_symbol}
+    while pending:
+        analyses, failed_pairs = _fetch_analysis_round(pending, screener, batch_size)
+        next_round: Dict[str, List[str]] = {}
+        for symbol, exchanges in pending.items():
+            empty_exchanges = []
+            for exchange_candidate in exchanges:
+                pair = f"{exchange_candidate}:{symbol}".upper()
+                if pair in failed_pairs:
+                    batch_errors[symbol] = failed_pairs[pair]
+                    continue
+                if pair not in analyses:
+                    retry_symbols.add(symbol)
+                    continue
+                tried[symbol].append(exchange_candidate)
+                result = _analysis_result(symbol, exchange_candidate, analyses.get(pair))
+                if result is not None:
+                    results[symbol] = result
+                    index.record_success(symbol, exchange_candidate)
+                    break
+                empty_exchanges.append(exchange_candidate)
+            index.record_failure(symbol, empty_exchanges)
+            if symbol in results:
+                retry_symbols.discard(symbol)
+                batch_errors.pop(symbol, None)
+                continue
+            untried = [
+                candidate
+                for candidate in candidates_by_symbol[symbol]
+                if candidate not in tried[symbol] and candidate not in exchanges
+            ]
+            if untried and symbol not in retry_symbols and symbol not in batch_errors:
+                next_round[symbol] = untried
+        pending = next_round
+
+    for symbol in candidates_by_symbol:
+        if symbol not in results and symbol not in retry_symbols:
+            results[symbol] = {"symbol": symbol, "error": batch_errors.get(symbol, NO_ANALYSIS_ERROR)}
+
+    if retry_symbols:
+        retry_list = sorted(retry_symbols)
+        controller = provider_concurrency("tradingview")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for symbol, result in zip(
+                retry_list,
+                executor.map(lambda item: controller.call(fetch_analysis, item, screener, exchange), retry_list),
+            ):
+                results[symbol] = result
+    return results
+
+
+def scan_market(
+    symbols: List[str],
+    screener: str = "america",
+    exchange: str = "NASDAQ",
+    technical_source: str = TECHNICAL_SOURCE_TRADINGVIEW,
+) -> Tuple[List[Candidate], List[ErrorDetail]]:
     """
     Scanner V5.0: loads a broad universe, applies learned score weights,
     ranks by market momentum, sends only the strongest names into TradingView,
     then records selected candidates for feedback learning.
+
+    ``technical_source="local"`` computes the same indicators and vote summary
+    from the shared OHLCV store instead of one TradingView request per batch.
     """
+    if technical_source not in TECHNICAL_SOURCES:
+        raise ValueError(f"unknown technical_source: {technical_source!r}")
     raw_symbols = resolve_universe(symbols, screener=screener, exchange=exchange)
     symbols_to_scan = raw_symbols
     prefilter_metadata: Dict[str, Dict[str, Any]] = {}
@@ -414,36 +981,70 @@ def scan_market(symbols: List[str], screener: str = "america", exchange: str = "
         filtered_symbols, prefilter_metadata = prefilter_symbols(raw_symbols)
         ranked_symbols, market_rank_metadata = rank_market_symbols(filtered_symbols or raw_symbols[:500])
         symbols_to_scan = ranked_symbols or filtered_symbols or raw_symbols[:75]
+    local_technicals = technical_source == TECHNICAL_SOURCE_LOCAL
+    history_bars = max(BACKTEST_HISTORY_BARS, LOCAL_INDICATOR_BARS) if local_technicals else BACKTEST_HISTORY_BARS
+    prefetch_price_histories(symbols_to_scan, history_bars)
+    # One matrix pass over all closes; enrichment then reads the cached results.
+    get_backtest_results(symbols_to_scan)
 
-    candidates = []
     errors = []
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_symbol = {executor.submit(fetch_analysis, symbol, screener, exchange): symbol for symbol in symbols_to_scan}
+    # Enrichment (backtest, fundamentals, sector rotation) does not need the
+    # TradingView result, so it runs in its own pool while the batched
+    # technical fetch is in flight; the consumer only joins the two stages.
+    # The pool is sized to the yfinance controller's ceiling; its AIMD window
+    # decides how many enrichments call the provider at once.
+    controller = provider_concurrency("yfinance")
+    with ThreadPoolExecutor(max_workers=controller.max_limit) as enrichment_executor:
+        enrichment_futures = {
+            symbol: enrichment_executor.submit(controller.call_with_outcome, _enrich_symbol, _enrichment_outcome, symbol)
+            for symbol in symbols_to_scan
+        }
+        if local_technicals:
+            technical_results = compute_local_analyses(symbols_to_scan, exchange)
+        else:
+            technical_results = fetch_analyses(symbols_to_scan, screener, exchange)
+        future_to_symbol = {}
+        for symbol, future in enrichment_futures.items():
+            result = technical_results.get(symbol) or {"symbol": symbol, "error": NO_ANALYSIS_ERROR}
+            if "error" in result:
+                future.cancel()
+                errors.append(ErrorDetail(symbol=symbol, error=result.get("error", "Unknown error")))
+            else:
+                future_to_symbol[future] = symbol
+        rows = []
         for future in as_completed(future_to_symbol):
             symbol = future_to_symbol[future]
+            result = technical_results[symbol]
             try:
-                result = future.result()
-                if "error" in result:
-                    error_message = result.get("error", "Unknown error")
-                    errors.append(ErrorDetail(symbol=symbol, error=error_message))
-                else:
-                    candidate = _rank_candidate(
-                        symbol,
-                        result.get("analysis", {}),
-                        result.get("indicators", {}),
-                        prefilter_metadata.get(symbol, {}),
-                        market_rank_metadata.get(symbol, {}),
-                    )
-                    candidate.details["resolved_exchange"] = result.get("exchange", exchange)
-                    final_score = float(candidate.details.get("final_score", 0.0))
-                    if candidate.recommendation in ["BUY", "STRONG_BUY"] and final_score >= DISCOVERY_THRESHOLD:
-                        candidates.append(candidate)
+                enrichment = future.result()
             except Exception as e:
                 errors.append(ErrorDetail(symbol=symbol, error=str(e)))
+                continue
+            rows.append(
+                CandidateInputs(
+                    symbol,
+                    result.get("analysis", {}),
+                    result.get("indicators", {}),
+                    prefilter_metadata.get(symbol, {}),
+                    market_rank_metadata.get(symbol, {}),
+                    enrichment,
+                )
+            )
+    # Every row is scored in one columnar pass; only those reaching
+    # DISCOVERY_THRESHOLD (BUY or STRONG_BUY) become Candidate objects.
+    candidates, ranking_errors = _rank_candidates(rows)
+    errors.extend(ranking_errors)
+    for candidate in candidates:
+        candidate.details["resolved_exchange"] = technical_results[candidate.symbol].get("exchange", exchange)
+        candidate.details["technical_source"] = technical_source
     candidates.sort(key=lambda c: c.details.get("final_score", 0.0), reverse=True)
     top_candidates = candidates[:10]
     try:
         append_feedback_seeds(top_candidates)
     except Exception as e:
         errors.append(ErrorDetail(symbol="FEEDBACK_LOOP", error=str(e)))
+    try:
+        get_exchange_index().save()
+    except Exception as e:
+        errors.append(ErrorDetail(symbol="EXCHANGE_INDEX", error=str(e)))
     return top_candidates, errors
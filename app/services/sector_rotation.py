@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import Dict, List, Optional
 
 import yfinance as yf
 
+from app.data_sources.price_history import get_price_history
 from app.utils.yfinance_frames import extract_yfinance_series
+from app.utils.ttl_cache import ttl_cache
 
 
 SECTOR_ETF_MAP = {
@@ -24,6 +25,14 @@ SECTOR_ETF_MAP = {
 }
 
 DEFAULT_BENCHMARK = "SPY"
+# Roughly three months of daily bars.
+ROTATION_HISTORY_BARS = 63
+# Sector classification rarely changes; relative returns move intraday.
+PROFILE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# A failed lookup (429, timeout) is only cached briefly so it is retried soon.
+PROFILE_ERROR_CACHE_TTL_SECONDS = 5 * 60
+RETURN_CACHE_TTL_SECONDS = 60 * 60
+ROTATION_CACHE_TTL_SECONDS = 60 * 60
 
 
 @dataclass
@@ -49,7 +58,11 @@ def _pct_return(start: Optional[float], end: Optional[float]) -> Optional[float]
     return (end - start) / start
 
 
-@lru_cache(maxsize=512)
+def _profile_ttl(profile: Dict[str, Optional[str]]) -> Optional[float]:
+    return PROFILE_ERROR_CACHE_TTL_SECONDS if profile.get("error") else None
+
+
+@ttl_cache(PROFILE_CACHE_TTL_SECONDS, maxsize=512, ttl_for_value=_profile_ttl)
 def _get_symbol_profile(symbol: str) -> Dict[str, Optional[str]]:
     try:
         info = yf.Ticker(symbol).get_info() or {}
@@ -57,20 +70,14 @@ def _get_symbol_profile(symbol: str) -> Dict[str, Optional[str]]:
             "sector": info.get("sector"),
             "industry": info.get("industry"),
         }
-    except Exception:
-        return {"sector": None, "industry": None}
+    except Exception as exc:
+        return {"sector": None, "industry": None, "error": str(exc)}
 
 
-@lru_cache(maxsize=128)
+@ttl_cache(RETURN_CACHE_TTL_SECONDS, maxsize=128)
 def _return_20d(symbol: str) -> Optional[float]:
     try:
-        history = yf.download(
-            symbol,
-            period="3mo",
-            interval="1d",
-            progress=False,
-            auto_adjust=True,
-        )
+        history = get_price_history(symbol, ROTATION_HISTORY_BARS)
         closes = extract_yfinance_series(history, "Close", symbol)
         if len(closes) < 21:
             return None
@@ -79,7 +86,7 @@ def _return_20d(symbol: str) -> Optional[float]:
         return None
 
 
-@lru_cache(maxsize=1024)
+@ttl_cache(ROTATION_CACHE_TTL_SECONDS, maxsize=1024)
 def get_sector_rotation_score(symbol: str) -> SectorRotationResult:
     symbol = symbol.upper().strip()
     profile = _get_symbol_profile(symbol)
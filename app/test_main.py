@@ -1,13 +1,25 @@
 from datetime import datetime
 
+import pytest
 from fastapi.testclient import TestClient
 
+from app.data_sources import financial_statements
+from app.data_sources.statement_warehouse import StatementWarehouse
 from app.main import app
 
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def statement_warehouse(tmp_path, monkeypatch):
+    """Keep endpoint scans off the real data/financial_statements.sqlite3."""
+
+    warehouse = StatementWarehouse(tmp_path / "financial_statements.sqlite3")
+    monkeypatch.setattr(financial_statements, "get_statement_warehouse", lambda: warehouse)
+    return warehouse
+
+
 def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections import defaultdict, deque
 from functools import lru_cache
 import re
-from typing import Iterable, List
+from typing import Dict, Iterable, List
 
 import pandas as pd
 
@@ -34,6 +34,14 @@ US_LARGE_CAP_FALLBACK = sorted(set(US_GROWTH_UNIVERSE + [
 
 NASDAQ_TRADER_BASE_URL = "https://www.nasdaqtrader.com/dynamic/SymDir"
 
+# otherlisted.txt exchange codes mapped to TradingView exchange prefixes.
+OTHER_LISTED_TRADINGVIEW_EXCHANGES = {
+    "A": "AMEX",
+    "N": "NYSE",
+    "P": "AMEX",
+    "Z": "CBOE",
+}
+
 _NON_COMMON_SECURITY_PATTERNS = (
     re.compile(r"\bwarrants?\b", re.IGNORECASE),
     re.compile(r"\brights?\b", re.IGNORECASE),
@@ -86,11 +94,16 @@ def diversify_symbols_by_initial(symbols: Iterable[str] | None) -> List[str]:
     return ordered
 
 
-def _read_nasdaq_trader_file(file_name: str) -> pd.DataFrame:
+@lru_cache(maxsize=4)
+def _load_nasdaq_trader_file(file_name: str) -> pd.DataFrame:
     url = f"{NASDAQ_TRADER_BASE_URL}/{file_name}"
     return pd.read_csv(url, sep="|", dtype=str)
 
 
+def _read_nasdaq_trader_file(file_name: str) -> pd.DataFrame:
+    return _load_nasdaq_trader_file(file_name).copy()
+
+
 def _is_common_equity_security_name(value: object) -> bool:
     """Reject explicit derivative/debt classes without guessing from ticker suffix."""
 
@@ -145,6 +158,35 @@ def load_other_listed_symbols() -> List[str]:
         return []
 
 
+@lru_cache(maxsize=1)
+def load_listing_exchanges() -> Dict[str, str]:
+    """Map listed US symbols to their TradingView exchange prefix.
+
+    NASDAQ listings come from nasdaqlisted.txt; every other venue comes from
+    the listing-exchange column of otherlisted.txt.
+    """
+
+    exchanges: Dict[str, str] = {}
+    try:
+        table = _read_nasdaq_trader_file("otherlisted.txt")
+        if {"ACT Symbol", "Exchange"}.issubset(table.columns):
+            for raw_symbol, code in zip(table["ACT Symbol"], table["Exchange"]):
+                exchange = OTHER_LISTED_TRADINGVIEW_EXCHANGES.get(str(code).strip().upper())
+                symbols = normalize_symbols([raw_symbol])
+                if exchange and symbols:
+                    exchanges[symbols[0]] = exchange
+    except Exception:
+        pass
+    try:
+        table = _read_nasdaq_trader_file("nasdaqlisted.txt")
+        if "Symbol" in table.columns:
+            for symbol in normalize_symbols(table["Symbol"].dropna().tolist()):
+                exchanges[symbol] = "NASDAQ"
+    except Exception:
+        pass
+    return exchanges
+
+
 @lru_cache(maxsize=1)
 def load_sp500_symbols() -> List[str]:
     try:
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, FrozenSet, Hashable, Optional
+from zoneinfo import ZoneInfo
+
+
+US_MARKET = "US"
+SET_MARKET = "SET"
+SET_YFINANCE_SUFFIX = ".BK"
+# Never keep a closed-market entry longer than this, so a missing holiday in
+# the tables below costs one extra refresh instead of a stale week.
+MAX_CLOSED_TTL_SECONDS = 4 * 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class MarketSession:
+    market: str
+    timezone: ZoneInfo
+    open_time: time
+    close_time: time
+    holidays: Callable[[int], FrozenSet[date]]
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    offset = (weekday - first.weekday()) % 7
+    return first + timedelta(days=offset + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm.
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=16)
+def us_holidays(year: int) -> FrozenSet[date]:
+    """Full-day NYSE holidays computed from the exchange's standing rules."""
+
+    days = {
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _last_weekday(year, 5, 0),  # Memorial Day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    }
+    # NYSE does not observe New Year's Day on the prior Friday.
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))
+    return frozenset(days)
+
+
+_SET_FIXED_HOLIDAYS = (
+    (1, 1),
+    (4, 6),
+    (4, 13),
+    (4, 14),
+    (4, 15),
+    (5, 1),
+    (5, 4),
+    (6, 3),
+    (7, 28),
+    (8, 12),
+    (10, 13),
+    (10, 23),
+    (12, 5),
+    (12, 10),
+    (12, 31),
+)
+
+
+@lru_cache(maxsize=16)
+def set_holidays(year: int) -> FrozenSet[date]:
+    """Fixed-date SET holidays with weekend substitution to the next weekday.
+
+    Lunar holidays (Makha Bucha, Visakha Bucha, Asarnha Bucha) are announced
+    yearly and are not listed; ``MAX_CLOSED_TTL_SECONDS`` bounds the cost.
+    """
+
+    days = set()
+    for month, day in _SET_FIXED_HOLIDAYS:
+        holiday = date(year, month, day)
+        while holiday.weekday() >= 5 or holiday in days:
+            holiday += timedelta(days=1)
+        days.add(holiday)
+    return frozenset(days)
+
+
+SESSIONS = {
+    US_MARKET: MarketSession(US_MARKET, ZoneInfo("America/New_York"), time(9, 30), time(16, 0), us_holidays),
+    SET_MARKET: MarketSession(SET_MARKET, ZoneInfo("Asia/Bangkok"), time(10, 0), time(16, 30), set_holidays),
+}
+
+
+def market_for_symbol(symbol: str) -> str:
+    return SET_MARKET if str(symbol or "").upper().endswith(SET_YFINANCE_SUFFIX) else US_MARKET
+
+
+def market_for_exchange(exchange: str, screener: str = "") -> str:
+    if str(exchange or "").upper() == SET_MARKET or str(screener or "").lower() == "thailand":
+        return SET_MARKET
+    return US_MARKET
+
+
+def _now(at: Optional[datetime]) -> datetime:
+    if at is None:
+        return datetime.now(timezone.utc)
+    return at if at.tzinfo else at.replace(tzinfo=timezone.utc)
+
+
+def is_trading_day(market: str, day: date) -> bool:
+    session = SESSIONS[market]
+    return day.weekday() < 5 and day not in session.holidays(day.year)
+
+
+def is_open(market: str, at: Optional[datetime] = None) -> bool:
+    session = SESSIONS[market]
+    local = _now(at).astimezone(session.timezone)
+    return is_trading_day(market, local.date()) and session.open_time <= local.time() < session.close_time
+
+
+def next_session_boundary(market: str, at: Optional[datetime] = None) -> datetime:
+    """Return the next close while the market is open, otherwise the next open."""
+
+    session = SESSIONS[market]
+    local = _now(at).astimezone(session.timezone)
+    if is_open(market, local):
+        return datetime.combine(local.date(), session.close_time, session.timezone)
+    day = local.date()
+    if local.time() >= session.open_time:
+        day += timedelta(days=1)
+    while not is_trading_day(market, day):
+        day += timedelta(days=1)
+    return datetime.combine(day, session.open_time, session.timezone)
+
+
+def session_ttl(market: str, open_ttl_seconds: float, at: Optional[datetime] = None) -> float:
+    """Seconds a cached market-data entry stays valid.
+
+    During the session entries live ``open_ttl_seconds`` but never past the
+    close, so the final bar is always refetched. Outside the session nothing
+    changes until the next open.
+    """
+
+    now = _now(at)
+    remaining = (next_session_boundary(market, now) - now).total_seconds()
+    if is_open(market, now):
+        return max(1.0, min(float(open_ttl_seconds), remaining))
+    return max(1.0, min(remaining, MAX_CLOSED_TTL_SECONDS))
+
+
+def _symbol_from_key(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return next((str(part) for part in key if isinstance(part, str)), "")
+    return str(key)
+
+
+def symbol_session_ttl(open_ttl_seconds: float) -> Callable[[Hashable], float]:
+    """Per-entry TTL for caches keyed by a yfinance symbol (``.BK`` means SET)."""
+
+    def ttl_for(key: Hashable) -> float:
+        return session_ttl(market_for_symbol(_symbol_from_key(key)), open_ttl_seconds)
+
+    return ttl_for
+
+
+def market_session_ttl(market: str, open_ttl_seconds: float) -> Callable[[Hashable], float]:
+    """Per-entry TTL for caches whose entries all belong to one market."""
+
+    def ttl_for(key: Hashable) -> float:
+        return session_ttl(market, open_ttl_seconds)
+
+    return ttl_for
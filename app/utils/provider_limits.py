@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
+
+
+# Sustained request starts per second allowed for each upstream provider.
+PROVIDER_RATE_LIMITS: Dict[str, float] = {
+    "yfinance": 8.0,
+    "tradingview": 5.0,
+}
+DEFAULT_RATE_LIMIT = 5.0
+
+
+class RateLimiter:
+    """Space request starts so at most ``rate_per_second`` begin each second.
+
+    Callers reserve the next free slot under a lock and sleep outside it, so
+    concurrent workers queue fairly without holding the lock while waiting.
+    """
+
+    def __init__(self, rate_per_second: float):
+        self.rate_per_second = max(0.001, float(rate_per_second))
+        self._interval = 1.0 / self.rate_per_second
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def provider_rate_limiter(provider: str) -> RateLimiter:
+    """Return the shared process-wide limiter for one provider."""
+
+    name = str(provider or "").lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            limiter = RateLimiter(PROVIDER_RATE_LIMITS.get(name, DEFAULT_RATE_LIMIT))
+            _LIMITERS[name] = limiter
+        return limiter
+
+
+# (minimum, initial, maximum) concurrent calls per provider for the AIMD
+# controllers below. The maximum also sizes the worker pools.
+PROVIDER_CONCURRENCY_LIMITS: Dict[str, Tuple[int, int, int]] = {
+    "yfinance": (1, 4, 16),
+    "tradingview": (1, 4, 10),
+}
+DEFAULT_CONCURRENCY_LIMITS = (1, 4, 8)
+AIMD_ADDITIVE_INCREASE = 1.0
+AIMD_DECREASE_FACTOR = 0.5
+THROTTLE_ERROR_MARKERS = ("429", "too many requests", "rate limit", "timeout", "timed out")
+
+
+def is_throttle_error(error: Any) -> bool:
+    """True for provider errors that signal overload (HTTP 429 or timeouts)."""
+
+    if isinstance(error, TimeoutError):
+        return True
+    text = str(error or "").lower()
+    return any(marker in text for marker in THROTTLE_ERROR_MARKERS)
+
+
+def reasons_outcome(reasons: Iterable[Any]) -> str:
+    """AIMD outcome for a call that reports provider errors as reason strings."""
+
+    return "throttle" if any(is_throttle_error(reason) for reason in reasons or ()) else "success"
+
+
+class AIMDController:
+    """Additive-increase/multiplicative-decrease limit on concurrent provider calls.
+
+    Each successful call grows the window by ``increase / window``, i.e. by
+    about ``increase`` per window of successes. A throttled call (429 or
+    timeout) multiplies the window by ``decrease_factor``. Only one decrease
+    is applied per congestion event: throttles from calls that started before
+    the latest decrease are already accounted for and are ignored.
+    Other errors leave the window unchanged.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase: float = AIMD_ADDITIVE_INCREASE,
+        decrease_factor: float = AIMD_DECREASE_FACTOR,
+    ):
+        self.name = name
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.increase = float(increase)
+        self.decrease_factor = min(max(float(decrease_factor), 0.01), 1.0)
+        self._window = float(min(max(int(initial), self.min_limit), self.max_limit))
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._epoch = 0
+        self._successes = 0
+        self._throttles = 0
+        self._decreases = 0
+        self._peak_limit = self.limit
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self._window)))
+
+    def acquire(self) -> int:
+        """Block until a slot is free; returns the token passed to ``release``."""
+
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            return self._epoch
+
+    def release(self, token: int, outcome: str = "success") -> None:
+        """Free a slot and adjust the window; ``outcome`` is success, throttle or neutral."""
+
+        with self._condition:
+            self._in_flight -= 1
+            if outcome == "success":
+                self._successes += 1
+                self._window = min(float(self.max_limit), self._window + self.increase / max(self._window, 1.0))
+                self._peak_limit = max(self._peak_limit, self.limit)
+            elif outcome == "throttle":
+                self._throttles += 1
+                if token == self._epoch:
+                    self._window = max(float(self.min_limit), self._window * self.decrease_factor)
+                    self._epoch += 1
+                    self._decreases += 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        token = self.acquire()
+        try:
+            yield
+        except BaseException as exc:
+            self.release(token, "throttle" if is_throttle_error(exc) else "neutral")
+            raise
+        self.release(token, "success")
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self.slot():
+            return func(*args, **kwargs)
+
+    def call_with_outcome(
+        self,
+        func: Callable[..., Any],
+        outcome_for: Callable[[Any], str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Like ``call`` for functions that swallow provider errors.
+
+        ``outcome_for`` maps the returned value to success, throttle or
+        neutral, so a 429 turned into a fallback result still shrinks the
+        window instead of counting as a success.
+        """
+
+        token = self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            self.release(token, "throttle" if is_throttle_error(exc) else "neutral")
+            raise
+        self.release(token, outcome_for(result))
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "provider": self.name,
+                "window": round(self._window, 2),
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "peak_limit": self._peak_limit,
+                "successes": self._successes,
+                "throttles": self._throttles,
+                "decreases": self._decreases,
+            }
+
+
+_CONTROLLERS: Dict[str, AIMDController] = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def provider_concurrency(provider: str) -> AIMDController:
+    """Return the shared process-wide concurrency controller for one provider."""
+
+    name = str(provider or "").lower()
+    with _CONTROLLERS_LOCK:
+        controller = _CONTROLLERS.get(name)
+        if controller is None:
+            min_limit, initial, max_limit = PROVIDER_CONCURRENCY_LIMITS.get(name, DEFAULT_CONCURRENCY_LIMITS)
+            controller = AIMDController(name, initial, min_limit=min_limit, max_limit=max_limit)
+            _CONTROLLERS[name] = controller
+        return controller
+
+
+def provider_concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    with _CONTROLLERS_LOCK:
+        controllers = dict(_CONTROLLERS)
+    return {name: controller.snapshot() for name, controller in sorted(controllers.items())}
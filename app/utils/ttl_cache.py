@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields, is_dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from app.utils.singleflight import SingleFlight
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    name: str
+    hits: int
+    misses: int
+    expirations: int
+    evictions: int
+    coalesced: int
+    currsize: int
+    current_bytes: int
+    maxsize: Optional[int]
+    max_bytes: Optional[int]
+    ttl_seconds: float
+
+
+_REGISTRY: Dict[str, "TTLCache"] = {}
+_REGISTRY_LOCK = threading.Lock()
+_MAX_SIZE_DEPTH = 4
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Rough retained size of a cached value in bytes.
+
+    DataFrames and Series report their own deep memory usage; containers and
+    dataclasses are walked a few levels deep. It is an estimate for eviction,
+    not an exact accounting.
+    """
+
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    size = sys.getsizeof(value, 0)
+    if _depth >= _MAX_SIZE_DEPTH:
+        return size
+    if isinstance(value, dict):
+        return size + sum(
+            estimate_size(key, _depth + 1) + estimate_size(item, _depth + 1)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _depth + 1) for item in value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return size + sum(
+            estimate_size(getattr(value, field.name, None), _depth + 1)
+            for field in fields(value)
+        )
+    return size
+
+
+def _make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    if not kwargs:
+        return args
+    return args + tuple(sorted(kwargs.items()))
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl_seconds``.
+
+    Entries are evicted least-recently-used first when either the entry count
+    exceeds ``maxsize`` or the estimated total size exceeds ``max_bytes``.
+    ``ttl_for`` computes a per-entry lifetime from the key, e.g. until the next
+    market session boundary; ``ttl_seconds`` is used when it is not given.
+    ``ttl_for_value`` may shorten that lifetime from the loaded value, e.g. so a
+    provider-error fallback is retried after minutes; ``None`` keeps it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        maxsize: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        ttl_for: Optional[Callable[[Hashable], float]] = None,
+        ttl_for_value: Optional[Callable[[Any], Optional[float]]] = None,
+    ):
+        self.name = name
+        self.ttl_seconds = float(ttl_seconds)
+        self.ttl_for = ttl_for
+        self.ttl_for_value = ttl_for_value
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+        self._flight = SingleFlight()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            if entry.expires_at <= self._clock():
+                self._drop(key)
+                self._expirations += 1
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, entry.value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = estimate_size(value)
+        ttl = self.ttl_seconds if self.ttl_for is None else float(self.ttl_for(key))
+        if self.ttl_for_value is not None:
+            value_ttl = self.ttl_for_value(value)
+            if value_ttl is not None:
+                ttl = min(ttl, float(value_ttl))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = _Entry(value, self._clock() + ttl, size)
+            self._bytes += size
+            self._evict()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value or run ``loader`` once for all concurrent misses.
+
+        Callers that miss while another thread is loading the same key wait
+        for that load and share its value or exception. The value is stored
+        before waiters are released, so late arrivals hit the cache.
+        """
+
+        found, value = self.get(key)
+        if found:
+            return value
+
+        def load() -> Any:
+            # Another caller may have finished loading between get() and do().
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at > self._clock():
+                    return entry.value
+            loaded = loader()
+            self.set(key, loaded)
+            return loaded
+
+        value, _ = self._flight.do(key, load)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._expirations = 0
+            self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                name=self.name,
+                hits=self._hits,
+                misses=self._misses,
+                expirations=self._expirations,
+                evictions=self._evictions,
+                coalesced=self._flight.coalesced,
+                currsize=len(self._entries),
+                current_bytes=self._bytes,
+                maxsize=self.maxsize,
+                max_bytes=self.max_bytes,
+                ttl_seconds=self.ttl_seconds,
+            )
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _over_budget(self) -> bool:
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        if not self._over_budget():
+            return
+        now = self._clock()
+        for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+            self._drop(key)
+            self._expirations += 1
+        while self._entries and self._over_budget():
+            key = next(iter(self._entries))
+            self._drop(key)
+            self._evictions += 1
+
+
+def ttl_cache(
+    ttl_seconds: float,
+    maxsize: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    name: Optional[str] = None,
+    ttl_for: Optional[Callable[[Hashable], float]] = None,
+    ttl_for_value: Optional[Callable[[Any], Optional[float]]] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Memoize a provider call for ``ttl_seconds`` instead of the process lifetime.
+
+    Concurrent misses on the same arguments share one call to ``func``.
+    The wrapped function keeps the ``cache_clear()`` and ``cache_info()`` hooks
+    of ``functools.lru_cache`` and adds ``cache_invalidate(*args, **kwargs)``
+    for dropping a single entry. ``ttl_for`` receives the argument tuple and
+    ``ttl_for_value`` the returned value.
+    Every cache is registered by name so ``cache_stats()`` and
+    ``clear_all_caches()`` can reach it.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        cache = TTLCache(
+            name or f"{func.__module__}.{func.__qualname__}",
+            ttl_seconds,
+            maxsize=maxsize,
+            max_bytes=max_bytes,
+            ttl_for=ttl_for,
+            ttl_for_value=ttl_for_value,
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return cache.get_or_load(_make_key(args, kwargs), lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_info = cache.info
+        wrapper.cache_invalidate = lambda *args, **kwargs: cache.invalidate(_make_key(args, kwargs))
+        register_cache(cache)
+        return wrapper
+
+    return decorator
+
+
+def register_cache(cache: TTLCache) -> TTLCache:
+    with _REGISTRY_LOCK:
+        _REGISTRY[cache.name] = cache
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters and sizes for every registered TTL cache."""
+
+    with _REGISTRY_LOCK:
+        caches = dict(_REGISTRY)
+    return {name: asdict(cache.info()) for name, cache in sorted(caches.items())}
+
+
+def clear_all_caches() -> None:
+    with _REGISTRY_LOCK:
+        caches = list(_REGISTRY.values())
+    for cache in caches:
+        cache.clear()
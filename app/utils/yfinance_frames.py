@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Hashable, Optional
+from typing import Any, Hashable, Iterable, Optional
 
 import pandas as pd
 
@@ -103,3 +103,32 @@ def extract_yfinance_series(
     normalized = pd.to_numeric(selected, errors="coerce").dropna().astype(float)
     normalized.name = field
     return normalized
+
+
+OHLCV_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def extract_yfinance_frame(
+    frame: Any,
+    symbol: str,
+    fields: Iterable[str] = OHLCV_FIELDS,
+) -> pd.DataFrame:
+    """Return one symbol's OHLCV columns from single- or multi-ticker output.
+
+    Batched ``download`` calls return every ticker side by side. Each field is
+    selected with :func:`extract_yfinance_series`, so the same layout handling
+    and ambiguity checks apply. Rows where the symbol has no close are dropped,
+    which keeps the result equivalent to a single-symbol download.
+    """
+
+    columns = {}
+    for field in fields:
+        series = extract_yfinance_series(frame, field, symbol)
+        if not series.empty:
+            columns[field] = series
+
+    if "Close" not in columns:
+        return pd.DataFrame(columns=list(fields), dtype="float64")
+
+    result = pd.DataFrame(columns)
+    return result[result["Close"].notna()]
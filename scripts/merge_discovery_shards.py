@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import argparse
+import json
+
+from app.models import ScannerContractResult
+from app.services.fundamental_discovery import merge_discovery_shards
+
+
+def _load_shard(path: Path) -> ScannerContractResult:
+    payload: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    # Accept either a saved endpoint response or its bare ``data`` payload.
+    if isinstance(payload.get("data"), dict):
+        payload = payload["data"]
+    return ScannerContractResult.model_validate(payload)
+
+
+def merge_files(paths: List[Path], top_n: int) -> Dict[str, Any]:
+    candidates, errors, metadata = merge_discovery_shards(
+        [_load_shard(path) for path in paths],
+        top_n=top_n,
+    )
+    result = ScannerContractResult(
+        scan_type="best_fundamentals",
+        count=len(candidates),
+        candidates=candidates,
+        metadata=metadata,
+        errors={error.symbol: error.error for error in errors},
+    )
+    return result.model_dump(mode="json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="รวมผลการค้นหาหุ้นพื้นฐานจากหลาย shard เป็นอันดับเดียว")
+    parser.add_argument("shards", nargs="+", type=Path, help="ไฟล์ JSON ผลลัพธ์ของแต่ละ shard")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    try:
+        merged = json.dumps(merge_files(args.shards, args.top_n), ensure_ascii=False, indent=2)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(merged + "\n", encoding="utf-8")
+    print(merged)
+
+
+if __name__ == "__main__":
+    main()
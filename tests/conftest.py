@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_negative_cache(tmp_path, monkeypatch):
+    """Keep discovery runs off the real data/negative_cache.json."""
+
+    from app.services import fundamental_discovery
+    from app.services.negative_cache import NegativeCache
+
+    cache = NegativeCache(tmp_path / "negative_cache.json")
+    monkeypatch.setattr(fundamental_discovery, "get_negative_cache", lambda: cache)
+    return cache
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from app.services import backtest
+
+
+def _reference_win_rate(closes):
+    """The per-symbol loop the matrix engine replaced."""
+
+    forward_returns = []
+    for i in range(20, len(closes) - 5):
+        current = float(closes.iloc[i])
+        ma20 = float(closes.iloc[i - 20 : i].mean())
+        if current > ma20:
+            forward_returns.append(backtest._pct_return(current, float(closes.iloc[i + 5])))
+    clean = [r for r in forward_returns if r is not None]
+    if not clean:
+        return None
+    return sum(1 for r in clean if r > 0) / len(clean)
+
+
+def _reference_result(symbol, closes):
+    current = float(closes.iloc[-1])
+    return backtest._scored_result(
+        symbol,
+        current,
+        backtest._pct_return(float(closes.iloc[-6]), current),
+        backtest._pct_return(float(closes.iloc[-21]), current),
+        _reference_win_rate(closes),
+    )
+
+
+def _random_closes(rng, length):
+    steps = rng.normal(0, 0.02, length)
+    prices = 100 * np.exp(np.cumsum(steps))
+    # Flat stretches make close == MA20 ties, the case rounding would flip.
+    if length > 40:
+        prices[10:35] = round(float(prices[10]), 2)
+    prices = np.round(prices, 2)
+    return pd.Series(prices, index=pd.date_range("2026-01-01", periods=length, freq="D"))
+
+
+def test_matrix_engine_matches_per_symbol_loop():
+    rng = np.random.default_rng(21)
+    closes = {f"S{index:03d}": _random_closes(rng, int(rng.integers(25, 130))) for index in range(300)}
+
+    results = backtest.backtest_close_matrix(closes)
+
+    for symbol, series in closes.items():
+        assert results[symbol] == _reference_result(symbol, series), symbol
+
+
+def test_short_and_empty_histories_keep_their_reasons():
+    results = backtest.backtest_close_matrix(
+        {
+            "EMPTY": pd.Series([], dtype=float),
+            "SHORT": pd.Series([10.0] * 24),
+        }
+    )
+
+    assert results["EMPTY"].current_price is None
+    assert results["EMPTY"].reason == ["ไม่มีข้อมูลราคาย้อนหลังเพียงพอสำหรับ Backtest"]
+    assert results["SHORT"].current_price == 10.0
+    assert results["SHORT"].win_rate is None
+
+
+def test_batch_results_seed_the_per_symbol_cache(monkeypatch):
+    rng = np.random.default_rng(3)
+    frames = {symbol: pd.DataFrame({"Close": _random_closes(rng, 80)}) for symbol in ("AAA", "BBB")}
+    loads = []
+
+    def fake_history(symbol, bars):
+        loads.append(symbol)
+        return frames[symbol]
+
+    monkeypatch.setattr(backtest, "get_price_history", fake_history)
+    backtest.get_backtest_result.cache_clear()
+
+    batch = backtest.get_backtest_results(["aaa", "BBB"])
+    single = backtest.get_backtest_result("AAA")
+
+    assert single is batch["AAA"]
+    assert loads == ["AAA", "BBB"]
+    assert batch["BBB"] == _reference_result("BBB", frames["BBB"]["Close"])
+    backtest.get_backtest_result.cache_clear()
@@ -3,6 +3,7 @@ import pytest
 
 pytest.importorskip("yfinance")
 
+from app.data_sources import price_history
 from app.services import backtest
 
 
@@ -12,7 +13,8 @@ def test_backtest_accepts_yfinance_multiindex(monkeypatch):
     columns = pd.MultiIndex.from_tuples([("Close", "AAPL")])
     history = pd.DataFrame(closes, index=dates, columns=columns)
 
-    monkeypatch.setattr(backtest.yf, "download", lambda *args, **kwargs: history)
+    monkeypatch.setattr(price_history.yf, "download", lambda *args, **kwargs: history)
+    price_history.clear_price_history_cache()
     backtest.get_backtest_result.cache_clear()
 
     result = backtest.get_backtest_result("AAPL")
@@ -0,0 +1,150 @@
+import math
+import random
+
+import pytest
+
+pytest.importorskip("tradingview_ta")
+
+from app.services import scanner
+from app.services.backtest import BacktestResult
+from app.services.fundamental_score import FundamentalScoreResult
+from app.services.sector_rotation import SectorRotationResult
+from app.services.weight_tuner import BASE_WEIGHTS
+
+
+RECOMMENDATIONS = ["STRONG_BUY", "BUY", "NEUTRAL", "HOLD", "SELL", "STRONG_SELL", "buy", "UNKNOWN"]
+# Values that sit exactly on the scalar scorers' thresholds, plus odd inputs.
+EDGE_VALUES = {
+    "RSI": [35.0, 45.0, 70.0, 70.0001, math.nan, "55.5"],
+    "ATR": [0.0, 6.0, 4.0, 8.0, math.nan],
+    "Volume MA": [0.0, -1.0, 1_000_000.0, math.nan],
+    "High.52W": [0.0, 100.0, 102.0, math.nan],
+}
+
+
+def _row(rng, index):
+    symbol = f"S{index}"
+    indicators = {}
+    optional = {
+        "close": lambda: rng.choice([rng.uniform(1, 300), 0.0, 100.0, math.nan]),
+        "RSI": lambda: rng.uniform(10, 90),
+        "MACD.macd": lambda: rng.uniform(-2, 2),
+        "MACD.signal": lambda: rng.uniform(-2, 2),
+        "SMA50": lambda: rng.uniform(1, 300),
+        "SMA200[1]": lambda: rng.uniform(1, 300),
+        "Volume": lambda: rng.uniform(0, 3_000_000),
+        "Volume MA": lambda: rng.uniform(100_000, 2_000_000),
+        "ATR": lambda: rng.uniform(0, 20),
+        "High.52W": lambda: rng.uniform(50, 400),
+        "Perf.W": lambda: rng.uniform(-40, 40),
+        "Perf.1M": lambda: rng.uniform(-40, 40),
+        "Perf.3M": lambda: rng.uniform(-60, 60),
+        "change_6m": lambda: rng.uniform(-80, 80),
+        "earnings_growth": lambda: rng.uniform(-60, 80),
+        "Revenue Growth TTM YoY": lambda: rng.uniform(-30, 60),
+    }
+    for name, make in optional.items():
+        if rng.random() < 0.75:
+            indicators[name] = rng.choice(EDGE_VALUES[name]) if name in EDGE_VALUES and rng.random() < 0.3 else make()
+    if rng.random() < 0.1:
+        indicators["RSI"] = None
+    votes = [rng.randint(0, 17) for _ in range(3)] if rng.random() < 0.9 else [0, 0, 0]
+    analysis = {"RECOMMENDATION": rng.choice(RECOMMENDATIONS), "BUY": votes[0], "NEUTRAL": votes[1], "SELL": votes[2]}
+    if rng.random() < 0.1:
+        del analysis["RECOMMENDATION"]
+    prefilter = {"prefilter_score": rng.choice([rng.random(), 0, None])} if rng.random() < 0.7 else {}
+    market_rank = {"market_rank_score": rng.random()} if rng.random() < 0.7 else {}
+    enrichment = {
+        "backtest": BacktestResult(symbol, 100.0, 0.02, 0.05, 0.6, rng.random(), []),
+        "fundamental": FundamentalScoreResult(symbol, rng.random(), None, None, None, None, None, None, None, None, []),
+        "sector_rotation": SectorRotationResult(symbol, None, None, None, None, None, None, rng.random(), []),
+    }
+    return scanner.CandidateInputs(symbol, analysis, indicators, prefilter, market_rank, enrichment)
+
+
+def _rows(count, seed=7):
+    rng = random.Random(seed)
+    return [_row(rng, index) for index in range(count)]
+
+
+def _scalar_scores(row, weights):
+    """Composes the scalar scorers exactly as ``_rank_candidate`` does."""
+
+    indicator = scanner._indicator_score(row.indicators)
+    relative = scanner._relative_strength_score(row.indicators)["score"]
+    sector = row.enrichment["sector_rotation"].score
+    values = {
+        "prefilter_score": float(row.prefilter.get("prefilter_score", 0.50) or 0.50),
+        "market_rank_score": float(row.market_rank.get("market_rank_score", 0.50) or 0.50),
+        "technical_vote_score": scanner._technical_score(row.analysis),
+        "indicator_score": indicator["score"],
+        "momentum_score": scanner._momentum_score(row.analysis, indicator["score"], relative, sector),
+        "relative_strength_score": relative,
+        "sector_rotation_score": sector,
+        "growth_score": scanner._growth_score(row.indicators)["score"],
+        "backtest_score": row.enrichment["backtest"].score,
+        "fundamental_score": row.enrichment["fundamental"].score,
+        "risk_score": scanner._risk_score(row.analysis, indicator["values"]),
+    }
+    values["final_score"] = scanner._weighted_final_score(values, weights)
+    return values
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [dict(BASE_WEIGHTS), {"indicator_score": 0.5, "risk_score": 0.3, "growth_score": 0.15, "unknown_score": 0.05}],
+)
+def test_batch_scores_match_scalar_scoring_exactly(weights):
+    rows = _rows(600)
+
+    inputs, errors = scanner._score_inputs(rows)
+    batch = scanner._score_candidate_batch(inputs, weights)
+    recommendations = scanner._rank_recommendations(batch["final_score"])
+
+    assert errors == []
+    for index, row in enumerate(rows):
+        expected = _scalar_scores(row, weights)
+        for key, value in expected.items():
+            actual = float(batch[key][index])
+            assert actual == value or (math.isnan(actual) and math.isnan(value)), (row.symbol, key)
+        assert recommendations[index] == scanner._rank_recommendation(expected["final_score"])
+
+
+def test_rank_candidates_materializes_only_passing_rows(monkeypatch):
+    rows = _rows(300, seed=11)
+    weights = dict(BASE_WEIGHTS)
+    expected = [
+        row.symbol
+        for row in rows
+        if scanner._rank_candidate(
+            row.symbol, row.analysis, row.indicators, row.prefilter, row.market_rank, row.enrichment, weights
+        ).recommendation
+        in {"BUY", "STRONG_BUY"}
+    ]
+    built = []
+    rank_candidate = scanner._rank_candidate
+
+    def counting_rank_candidate(symbol, *args, **kwargs):
+        built.append(symbol)
+        return rank_candidate(symbol, *args, **kwargs)
+
+    monkeypatch.setattr(scanner, "_rank_candidate", counting_rank_candidate)
+
+    candidates, errors = scanner._rank_candidates(rows, weights)
+
+    assert errors == []
+    assert 0 < len(expected) < len(rows)
+    assert built == expected
+    assert [candidate.symbol for candidate in candidates] == expected
+    assert all(candidate.details["final_score"] >= scanner.DISCOVERY_THRESHOLD for candidate in candidates)
+
+
+def test_rank_candidates_reports_malformed_rows_and_scores_the_rest():
+    rows = _rows(20, seed=3)
+    rows[4].analysis["BUY"] = "many"
+    del rows[9].enrichment["backtest"]
+
+    candidates, errors = scanner._rank_candidates(rows, dict(BASE_WEIGHTS))
+
+    assert [error.symbol for error in errors] == ["S4", "S9"]
+    assert {candidate.symbol for candidate in candidates}.isdisjoint({"S4", "S9"})
@@ -0,0 +1,160 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import ScannerCandidateContract
+from app.services import discovery_checkpoint, fundamental_discovery
+from app.services.discovery_checkpoint import DiscoveryCheckpoint
+from app.services.negative_cache import NegativeCache
+
+UNIVERSE = ["AAA", "BBB", "CCC", "DDD"]
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(discovery_checkpoint, "DEFAULT_CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "get_negative_cache",
+        lambda: NegativeCache(tmp_path / "negative_cache.json"),
+    )
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "build_us_fundamental_universe",
+        lambda max_universe: {"symbols": list(UNIVERSE), "sources": {}},
+    )
+
+
+def test_restarted_job_resumes_from_checkpoint(monkeypatch):
+    analyzed = []
+
+    def crashing_analyze(symbol, exchange):
+        analyzed.append(symbol)
+        if symbol == "DDD":
+            raise KeyboardInterrupt
+        if symbol == "BBB":
+            raise ValueError("missing financial statements")
+        return ScannerCandidateContract(symbol=symbol, candidate_score=0.5)
+
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", crashing_analyze)
+    with pytest.raises(KeyboardInterrupt):
+        fundamental_discovery.discover_best_fundamentals(top_n=3, max_workers=1, job_id="nightly-1")
+
+    assert analyzed == UNIVERSE
+    analyzed.clear()
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "analyze_fundamental_candidate",
+        lambda symbol, exchange: analyzed.append(symbol) or ScannerCandidateContract(symbol=symbol, candidate_score=0.9),
+    )
+
+    candidates, errors, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=3, max_workers=1, job_id="nightly-1"
+    )
+
+    assert analyzed == ["DDD"]
+    assert metadata["checkpoint_resumed"] is True
+    assert metadata["checkpoint_resumed_count"] == 3
+    assert [error.symbol for error in errors] == ["BBB"]
+    assert candidates[0].symbol == "DDD"
+
+
+def test_reused_job_id_on_another_shard_or_symbol_list_starts_over(monkeypatch):
+    analyzed = []
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "analyze_fundamental_candidate",
+        lambda symbol, exchange: analyzed.append(symbol) or ScannerCandidateContract(symbol=symbol, candidate_score=0.5),
+    )
+
+    fundamental_discovery.discover_best_fundamentals(top_n=3, max_workers=1, job_id="shared", shard_index=0, shard_count=2)
+    _, _, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=3, max_workers=1, job_id="shared", shard_index=1, shard_count=2
+    )
+    assert metadata["checkpoint_resumed"] is False
+
+    analyzed.clear()
+    _, _, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=3, max_workers=1, job_id="shared", symbols=["CCC", "DDD"], shard_index=1, shard_count=2
+    )
+    assert metadata["checkpoint_resumed"] is False
+    assert analyzed == ["DDD"]
+
+
+def test_changed_parameters_start_over(tmp_path):
+    directory = tmp_path / "checkpoints"
+    checkpoint = DiscoveryCheckpoint("job", {"top_n": 10}, directory=directory)
+    checkpoint.record_error("AAA", "missing market data")
+
+    same = DiscoveryCheckpoint("job", {"top_n": 10}, directory=directory)
+    assert same.resumed is True
+    assert same.restore(["AAA", "BBB"])[2] == ["BBB"]
+
+    other = DiscoveryCheckpoint("job", {"top_n": 20}, directory=directory)
+    assert other.resumed is False
+    assert other.restore(["AAA"])[2] == ["AAA"]
+
+
+def test_later_outcome_replaces_earlier_and_torn_lines_are_ignored(tmp_path):
+    directory = tmp_path / "checkpoints"
+    checkpoint = DiscoveryCheckpoint("job", {}, directory=directory)
+    checkpoint.record_error("AAA", "HTTP 429")
+    checkpoint.record_candidate("AAA", ScannerCandidateContract(symbol="AAA", candidate_score=0.7))
+    with checkpoint.path.open("a", encoding="utf-8") as file:
+        file.write('{"symbol": "BBB", "cand')
+
+    candidates, errors, remaining = DiscoveryCheckpoint("job", {}, directory=directory).restore(["AAA", "BBB"])
+
+    assert [candidate.symbol for candidate in candidates] == ["AAA"]
+    assert errors == []
+    assert remaining == ["BBB"]
+
+
+def test_invalid_job_id_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DiscoveryCheckpoint("../escape", {}, directory=tmp_path)
+
+
+def test_resumed_two_phase_job_reuses_the_stored_prescreen(monkeypatch):
+    scored = []
+    analyzed = []
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "_prescreen_score",
+        lambda symbol, exchange: scored.append(symbol) or SimpleNamespace(score=0.9 if symbol in {"AAA", "BBB"} else 0.1, reason=[]),
+    )
+
+    def crashing_analyze(symbol, exchange):
+        analyzed.append(symbol)
+        if symbol == "BBB":
+            raise KeyboardInterrupt
+        return ScannerCandidateContract(symbol=symbol, candidate_score=0.5)
+
+    monkeypatch.setattr(fundamental_discovery, "PRESCREEN_MIN_KEEP_MULTIPLE", 1)
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", crashing_analyze)
+    options = dict(top_n=2, max_workers=1, two_phase=True, prescreen_fraction=0.5, prescreen_audit_size=0, job_id="two-phase")
+    with pytest.raises(KeyboardInterrupt):
+        fundamental_discovery.discover_best_fundamentals(**options)
+
+    assert sorted(scored) == UNIVERSE
+    scored.clear()
+    analyzed.clear()
+    # Fresh info would now keep CCC and DDD; the resumed job must not look.
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "_prescreen_score",
+        lambda symbol, exchange: scored.append(symbol) or SimpleNamespace(score=0.9 if symbol in {"CCC", "DDD"} else 0.1, reason=[]),
+    )
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "analyze_fundamental_candidate",
+        lambda symbol, exchange: analyzed.append(symbol) or ScannerCandidateContract(symbol=symbol, candidate_score=0.8),
+    )
+
+    candidates, _, metadata = fundamental_discovery.discover_best_fundamentals(**options)
+
+    assert scored == []
+    assert analyzed == ["BBB"]
+    assert [candidate.symbol for candidate in candidates] == ["BBB", "AAA"]
+    assert metadata["prescreen_from_checkpoint"] is True
+    assert metadata["prescreen_kept_count"] == 2
@@ -0,0 +1,113 @@
+import pytest
+
+from app.models import ScannerCandidateContract
+from app.services import fundamental_discovery
+from app.services.discovery_progress import DiscoveryProgress
+from app.services.negative_cache import NegativeCache
+
+UNIVERSE = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+SCORES = {"AAA": 0.3, "BBB": 0.9, "CCC": 0.5, "DDD": 0.7, "EEE": 0.1}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def progress(tmp_path, clock, monkeypatch):
+    progress = DiscoveryProgress(tmp_path / "discovery_progress.json", clock=clock)
+    monkeypatch.setattr(fundamental_discovery, "get_discovery_progress", lambda: progress)
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "get_negative_cache",
+        lambda: NegativeCache(tmp_path / "negative_cache.json"),
+    )
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "build_us_fundamental_universe",
+        lambda max_universe: {"symbols": list(UNIVERSE), "sources": {}},
+    )
+    return progress
+
+
+def _analyze(analyzed):
+    def fake_analyze(symbol, exchange):
+        analyzed.append(symbol)
+        return ScannerCandidateContract(symbol=symbol, candidate_score=SCORES[symbol], exchange=exchange)
+
+    return fake_analyze
+
+
+def test_progressive_runs_cover_universe_and_rank_stored_scores(progress, clock, monkeypatch):
+    analyzed = []
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", _analyze(analyzed))
+
+    candidates, _, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=2, progressive=True, progressive_slice_size=2
+    )
+    assert sorted(analyzed) == ["AAA", "BBB"]
+    assert [candidate.symbol for candidate in candidates] == ["BBB", "AAA"]
+    assert metadata["discovery_mode"] == "progressive"
+    assert metadata["progressive_coverage_ratio"] == 0.4
+    assert metadata["analyzed_count"] == 2
+
+    clock.now += 3600
+    analyzed.clear()
+    candidates, _, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=2, progressive=True, progressive_slice_size=2
+    )
+    assert sorted(analyzed) == ["CCC", "DDD"]
+    assert [candidate.symbol for candidate in candidates] == ["BBB", "DDD"]
+    assert candidates[0].metadata["score_age_seconds"] == 3600
+    assert candidates[1].metadata["score_age_seconds"] == 0
+    assert metadata["progressive_scored_count"] == 4
+    assert metadata["progressive_remaining_in_pass"] == 1
+
+    clock.now += 3600
+    analyzed.clear()
+    _, _, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=2, progressive=True, progressive_slice_size=2
+    )
+    assert analyzed == ["EEE"]
+    assert metadata["progressive_coverage_ratio"] == 1.0
+
+    clock.now += 3600
+    analyzed.clear()
+    _, _, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=2, progressive=True, progressive_slice_size=2
+    )
+    assert sorted(analyzed) == ["AAA", "BBB"]
+    assert metadata["progressive_previous_pass_completed"] is True
+    assert metadata["progressive_pass_count"] == 2
+
+
+def test_failed_symbols_keep_last_good_score(progress, clock):
+    progress.next_slice(UNIVERSE, 5)
+    progress.record(["BBB"], [ScannerCandidateContract(symbol="BBB", candidate_score=0.9)])
+    clock.now += 60
+    progress.record(["BBB"], [])
+
+    stored = progress.stored_candidates(UNIVERSE)
+    assert [candidate.symbol for candidate in stored] == ["BBB"]
+    assert stored[0].metadata["score_age_seconds"] == 60
+
+
+def test_stale_scores_are_dropped(progress, clock, tmp_path):
+    progress.record(["AAA"], [ScannerCandidateContract(symbol="AAA", candidate_score=0.4)])
+    progress.save()
+
+    reloaded = DiscoveryProgress(tmp_path / "discovery_progress.json", clock=clock)
+    assert [candidate.symbol for candidate in reloaded.stored_candidates(UNIVERSE)] == ["AAA"]
+
+    clock.now += reloaded.max_score_age_seconds + 1
+    assert reloaded.stored_candidates(UNIVERSE) == []
+    assert reloaded.prune() == 1
@@ -0,0 +1,153 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.models import BestFundamentalsRequest, ScannerCandidateContract, ScannerContractResult
+from app.services import fundamental_discovery
+from app.services.negative_cache import NegativeCache
+from scripts.merge_discovery_shards import merge_files
+
+UNIVERSE = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF", "GGG"]
+SCORES = {"AAA": 0.2, "BBB": 0.8, "CCC": 0.6, "DDD": 0.9, "EEE": 0.4, "FFF": 0.7}
+build_us_fundamental_universe = fundamental_discovery.build_us_fundamental_universe
+
+
+@pytest.fixture(autouse=True)
+def fake_provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "get_negative_cache",
+        lambda: NegativeCache(tmp_path / "negative_cache.json"),
+    )
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "build_us_fundamental_universe",
+        lambda max_universe: {"symbols": list(UNIVERSE), "sources": {}},
+    )
+
+    def fake_analyze(symbol, exchange):
+        if symbol not in SCORES:
+            raise ValueError("missing financial statements")
+        return ScannerCandidateContract(symbol=symbol, candidate_score=SCORES[symbol])
+
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", fake_analyze)
+
+
+def _run_shard(index, count, top_n=2):
+    candidates, errors, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=top_n, shard_index=index, shard_count=count
+    )
+    return ScannerContractResult(
+        scan_type="best_fundamentals",
+        count=len(candidates),
+        candidates=candidates,
+        metadata=metadata,
+        errors={error.symbol: error.error for error in errors},
+    )
+
+
+def test_shards_partition_the_universe():
+    parts = [fundamental_discovery.shard_symbols(UNIVERSE, index, 3) for index in range(3)]
+
+    assert sorted(symbol for part in parts for symbol in part) == sorted(UNIVERSE)
+    assert parts[0] == ["AAA", "DDD", "GGG"]
+    with pytest.raises(ValueError):
+        fundamental_discovery.shard_symbols(UNIVERSE, 3, 3)
+
+
+def test_merged_shards_match_single_process_ranking():
+    shards = [_run_shard(index, 3) for index in range(3)]
+    single, _, _ = fundamental_discovery.discover_best_fundamentals(top_n=2)
+
+    assert shards[0].metadata["shard_universe_count"] == 7
+    assert shards[0].metadata["attempted_count"] == 3
+
+    merged, errors, metadata = fundamental_discovery.merge_discovery_shards(shards, top_n=2)
+
+    assert [candidate.symbol for candidate in merged] == [candidate.symbol for candidate in single]
+    assert [candidate.discovery_rank for candidate in merged] == [1, 2]
+    assert [error.symbol for error in errors] == ["GGG"]
+    assert metadata["attempted_count"] == 7
+    assert metadata["missing_shard_indexes"] == []
+    assert metadata["exact_merge"] is True
+    assert metadata["error_categories"] == {"missing_financial_statements": 1}
+
+
+def test_merge_reports_missing_shards_and_cli_reads_saved_responses(tmp_path):
+    paths = []
+    for index in (0, 2):
+        path = tmp_path / f"shard-{index}.json"
+        path.write_text(
+            json.dumps({"data": _run_shard(index, 3, top_n=3).model_dump(mode="json")}),
+            encoding="utf-8",
+        )
+        paths.append(path)
+
+    merged = merge_files(paths, top_n=3)
+
+    assert merged["metadata"]["missing_shard_indexes"] == [1]
+    assert [candidate["symbol"] for candidate in merged["candidates"]] == ["DDD", "FFF", "CCC"]
+
+
+def test_merge_rejects_shards_ranked_with_a_smaller_top_n():
+    shards = [_run_shard(index, 3, top_n=3) for index in range(3)]
+    shards[1] = _run_shard(1, 3, top_n=1)
+
+    with pytest.raises(ValueError, match="shard 1"):
+        fundamental_discovery.merge_discovery_shards(shards, top_n=2)
+
+
+def test_merge_marks_shards_without_declared_top_n_as_unverified():
+    shards = [_run_shard(index, 3) for index in range(3)]
+    del shards[2].metadata["top_n"]
+
+    merged, _, metadata = fundamental_discovery.merge_discovery_shards(shards, top_n=2)
+
+    assert [candidate.symbol for candidate in merged] == ["DDD", "BBB"]
+    assert metadata["exact_merge"] is False
+    assert metadata["unverified_shard_count"] == 1
+
+
+def test_explicit_symbols_replace_the_universe():
+    candidates, _, metadata = fundamental_discovery.discover_best_fundamentals(top_n=5, symbols=["ccc", "eee"])
+
+    assert [candidate.symbol for candidate in candidates] == ["CCC", "EEE"]
+    assert metadata["universe_source"] == "explicit_symbols"
+
+
+def test_request_requires_shard_fields_together():
+    with pytest.raises(ValidationError):
+        BestFundamentalsRequest(shard_index=1)
+    with pytest.raises(ValidationError):
+        BestFundamentalsRequest(shard_index=2, shard_count=2)
+    assert BestFundamentalsRequest(shard_index=1, shard_count=2).shard_count == 2
+
+
+def test_shards_cover_the_universe_when_node_caches_differ(tmp_path, monkeypatch):
+    monkeypatch.setattr(fundamental_discovery, "build_us_fundamental_universe", build_us_fundamental_universe)
+    monkeypatch.setattr(fundamental_discovery, "load_sp500_symbols", lambda: list(UNIVERSE))
+    monkeypatch.setattr(fundamental_discovery, "load_nasdaq100_symbols", lambda: list(UNIVERSE))
+    monkeypatch.setattr(fundamental_discovery, "load_nasdaq_listed_symbols", lambda: [])
+    node_cached = [{"BBB", "CCC"}, {"AAA"}]
+    analyzed = [[], []]
+    skipped_counts = []
+    for index, cached in enumerate(node_cached):
+        cache = NegativeCache(tmp_path / f"node-{index}" / "negative_cache.json")
+        for symbol in cached:
+            cache.record(symbol, "missing_financial_statements")
+        monkeypatch.setattr(fundamental_discovery, "get_negative_cache", lambda cache=cache: cache)
+
+        def fake_analyze(symbol, exchange, seen=analyzed[index]):
+            seen.append(symbol)
+            return ScannerCandidateContract(symbol=symbol, candidate_score=SCORES.get(symbol, 0.1))
+
+        monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", fake_analyze)
+        _, _, metadata = fundamental_discovery.discover_best_fundamentals(top_n=2, shard_index=index, shard_count=2)
+        skipped_counts.append(metadata["negative_cache_skipped_count"])
+
+    # Node 0's entry for BBB belongs to shard 1 and moves no boundary; only
+    # its own CCC is skipped, and node 1's AAA entry is never consulted.
+    assert set(analyzed[0]).isdisjoint(analyzed[1])
+    assert sorted(analyzed[0] + analyzed[1] + ["CCC"]) == sorted(UNIVERSE)
+    assert skipped_counts == [1, 0]
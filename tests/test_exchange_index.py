@@ -0,0 +1,125 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tradingview_ta")
+
+from app.services import scanner
+from app.services.exchange_index import FAILED_EXCHANGE_TTL_SECONDS, ExchangeIndex
+
+
+@pytest.fixture(autouse=True)
+def empty_analysis_cache():
+    scanner._ANALYSIS_CACHE.clear()
+
+
+def _analysis():
+    return SimpleNamespace(summary={"RECOMMENDATION": "BUY"}, indicators={"close": 10.0})
+
+
+def test_learned_exchange_overrides_seed_and_persists(tmp_path):
+    path = tmp_path / "exchange_index.json"
+    index = ExchangeIndex(path=path, seed_loader=lambda: {"KO": "NASDAQ"})
+
+    assert index.order_candidates("KO", ["NASDAQ", "NYSE", "AMEX"]) == ["NASDAQ", "NYSE", "AMEX"]
+
+    index.record_failure("KO", ["NASDAQ"])
+    index.record_success("KO", "NYSE")
+    assert index.save() is True
+    assert index.save() is False
+
+    reloaded = ExchangeIndex(path=path, seed_loader=dict)
+    assert reloaded.resolved_exchange("ko") == "NYSE"
+    assert reloaded.order_candidates("KO", ["NASDAQ", "NYSE", "AMEX"]) == ["NYSE", "AMEX", "NASDAQ"]
+
+
+def test_failed_seed_exchange_is_not_treated_as_resolved(tmp_path):
+    index = ExchangeIndex(path=tmp_path / "exchange_index.json", seed_loader=lambda: {"XYZ": "NYSE"})
+
+    assert index.is_resolved("XYZ") is True
+    index.record_failure("XYZ", ["NYSE"])
+
+    assert index.is_resolved("XYZ") is False
+    assert index.order_candidates("XYZ", ["NASDAQ", "NYSE", "AMEX"]) == ["NASDAQ", "AMEX", "NYSE"]
+
+
+def test_known_exchange_outside_candidates_is_not_promoted(tmp_path):
+    index = ExchangeIndex(path=tmp_path / "exchange_index.json", seed_loader=lambda: {"ZCBOE": "CBOE"})
+    candidates = ["NASDAQ", "NYSE", "AMEX"]
+
+    assert index.order_candidates("ZCBOE", candidates) == candidates
+    assert index.is_resolved("ZCBOE", candidates) is False
+    assert index.is_resolved("ZCBOE") is True
+
+
+def test_failed_exchanges_age_out(tmp_path):
+    now = [1_000_000.0]
+    path = tmp_path / "exchange_index.json"
+    index = ExchangeIndex(path=path, seed_loader=dict, clock=lambda: now[0], failed_ttl_seconds=3600)
+
+    index.record_failure("KO", ["NASDAQ"])
+    now[0] += 1800
+    index.record_failure("KO", ["NYSE"])
+    assert index.failed_exchanges("KO") == ["NASDAQ", "NYSE"]
+
+    now[0] += 1801
+    assert index.failed_exchanges("KO") == ["NYSE"]
+    assert index.order_candidates("KO", ["NASDAQ", "NYSE", "AMEX"]) == ["NASDAQ", "AMEX", "NYSE"]
+
+    index.record_failure("KO", ["NASDAQ"])
+    index.save()
+    reloaded = ExchangeIndex(path=path, seed_loader=dict, clock=lambda: now[0], failed_ttl_seconds=3600)
+    assert set(reloaded.failed_exchanges("KO")) == {"NASDAQ", "NYSE"}
+
+
+def test_legacy_failed_lists_age_from_their_update_time(tmp_path):
+    path = tmp_path / "exchange_index.json"
+    path.write_text(
+        json.dumps({"KO": {"failed": ["NASDAQ"], "updated_at": "2026-01-01T00:00:00+00:00"}}),
+        encoding="utf-8",
+    )
+    updated = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+
+    fresh = ExchangeIndex(path=path, seed_loader=dict, clock=lambda: updated + 60)
+    stale = ExchangeIndex(path=path, seed_loader=dict, clock=lambda: updated + FAILED_EXCHANGE_TTL_SECONDS + 1)
+
+    assert fresh.failed_exchanges("KO") == ["NASDAQ"]
+    assert stale.failed_exchanges("KO") == []
+
+
+def test_fetch_analyses_requests_only_the_indexed_exchange(monkeypatch, tmp_path):
+    index = ExchangeIndex(path=tmp_path / "exchange_index.json", seed_loader=lambda: {"KO": "NYSE"})
+    monkeypatch.setattr(scanner, "get_exchange_index", lambda: index)
+    calls = []
+
+    def fake_multiple_analysis(screener, interval, symbols, timeout=None):
+        calls.append(list(symbols))
+        return {symbol: _analysis() if symbol == "NYSE:KO" else None for symbol in symbols}
+
+    monkeypatch.setattr(scanner, "get_multiple_analysis", fake_multiple_analysis)
+
+    results = scanner.fetch_analyses(["KO"], "america", "NASDAQ")
+
+    assert calls == [["NYSE:KO"]]
+    assert results["KO"]["exchange"] == "NYSE"
+
+
+def test_fetch_analyses_falls_back_when_indexed_exchange_is_stale(monkeypatch, tmp_path):
+    index = ExchangeIndex(path=tmp_path / "exchange_index.json", seed_loader=lambda: {"ABC": "NASDAQ"})
+    monkeypatch.setattr(scanner, "get_exchange_index", lambda: index)
+    calls = []
+
+    def fake_multiple_analysis(screener, interval, symbols, timeout=None):
+        calls.append(list(symbols))
+        return {symbol: _analysis() if symbol == "AMEX:ABC" else None for symbol in symbols}
+
+    monkeypatch.setattr(scanner, "get_multiple_analysis", fake_multiple_analysis)
+
+    results = scanner.fetch_analyses(["ABC"], "america", "NASDAQ")
+
+    assert calls == [["NASDAQ:ABC"], ["NYSE:ABC", "AMEX:ABC"]]
+    assert results["ABC"]["exchange"] == "AMEX"
+    assert index.resolved_exchange("ABC") == "AMEX"
+    assert index.failed_exchanges("ABC") == ["NASDAQ", "NYSE"]
@@ -1,9 +1,21 @@
+import time
+
 import pandas as pd
+import pytest
 
 from app.data_sources import financial_statements
+from app.data_sources.statement_warehouse import StatementWarehouse
 from app.services import fundamental_discovery
 
 
+@pytest.fixture(autouse=True)
+def statement_warehouse(monkeypatch, tmp_path):
+    # Keep get_financials_with_diagnostics away from data/financial_statements.sqlite3.
+    warehouse = StatementWarehouse(tmp_path / "statements.sqlite3")
+    monkeypatch.setattr(financial_statements, "get_statement_warehouse", lambda: warehouse)
+    return warehouse
+
+
 class EmptyTicker:
     income_stmt = pd.DataFrame()
     financials = pd.DataFrame()
@@ -103,3 +115,41 @@ def test_provider_failures_are_preserved_for_error_taxonomy(monkeypatch):
     assert fundamental_discovery._classify_discovery_error(
         "financial provider error [annual_income_statement]: provider transport failed"
     ) == "financial_provider_error"
+
+
+def test_provider_errors_keep_sequential_loader_order(monkeypatch, statement_warehouse):
+    monkeypatch.setattr(financial_statements.yf, "Ticker", lambda symbol: FailingTicker())
+
+    _, diagnostics = financial_statements.get_financials_with_diagnostics("FAIL", "NASDAQ")
+
+    stages = list(dict.fromkeys(error["stage"] for error in diagnostics["provider_errors"]))
+    assert stages == [kind for kind, _ in financial_statements.STATEMENT_LOADERS]
+    assert statement_warehouse.load("FAIL") is None
+
+
+class SlowTicker:
+    info = {"longName": "Slow Co"}
+
+    def _slow(self):
+        time.sleep(0.2)
+        return pd.DataFrame({pd.Timestamp("2025-12-31"): [1.0]}, index=["Total Revenue"])
+
+    income_stmt = property(_slow)
+    balance_sheet = property(_slow)
+    cashflow = property(_slow)
+    quarterly_income_stmt = property(_slow)
+    quarterly_balance_sheet = property(_slow)
+    quarterly_cashflow = property(_slow)
+
+
+def test_statement_loaders_run_concurrently(monkeypatch, statement_warehouse):
+    monkeypatch.setattr(financial_statements.yf, "Ticker", lambda symbol: SlowTicker())
+
+    started = time.perf_counter()
+    data, diagnostics = financial_statements.get_financials_with_diagnostics("SLOW", "NASDAQ")
+    elapsed = time.perf_counter() - started
+
+    assert diagnostics["status"] == "success"
+    assert data["info"]["longName"] == "Slow Co"
+    assert elapsed < 0.6
+    assert statement_warehouse.load("SLOW") is not None
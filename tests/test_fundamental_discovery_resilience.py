@@ -99,6 +99,8 @@ def test_discovery_caps_provider_workers(monkeypatch):
 
     assert candidates == []
     assert errors == []
-    assert observed["max_workers"] == 4
+    assert observed["max_workers"] == 16
     assert metadata["requested_max_workers"] == 20
-    assert metadata["effective_max_workers"] == 4
+    assert metadata["effective_max_workers"] == 16
+    assert metadata["provider_worker_cap"] == 16
+    assert metadata["provider_concurrency"]["provider"] == "yfinance"
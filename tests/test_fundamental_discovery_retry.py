@@ -0,0 +1,148 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import BestFundamentalsRequest, ErrorDetail
+from app.services import fundamental_discovery
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _candidate(symbol, score=0.5):
+    return SimpleNamespace(symbol=symbol, candidate_score=score, raw_scores={}, metadata={})
+
+
+def test_retry_recovers_rate_limited_symbols_after_backoff(monkeypatch):
+    clock = FakeClock()
+    calls = []
+
+    def fake_analyze(symbol, exchange):
+        calls.append((symbol, clock.now))
+        if symbol == "AAA" and len([call for call in calls if call[0] == "AAA"]) == 1:
+            raise RuntimeError("HTTP 429 Too Many Requests")
+        return _candidate(symbol)
+
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", fake_analyze)
+
+    recovered, remaining, stats = fundamental_discovery._retry_failed_symbols(
+        [
+            ErrorDetail(symbol="AAA", error="HTTP 429 Too Many Requests"),
+            ErrorDetail(symbol="BBB", error="request timed out"),
+            ErrorDetail(symbol="CCC", error="missing financial statements"),
+        ],
+        "NASDAQ",
+        workers=2,
+        budget_seconds=60,
+        clock=clock,
+        sleep=clock.sleep,
+        rng=random.Random(7),
+    )
+
+    assert sorted(candidate.symbol for candidate in recovered) == ["AAA", "BBB"]
+    assert [error.symbol for error in remaining] == ["CCC"]
+    assert all(when > 0 for _, when in calls)
+    assert stats["retry_queued_count"] == 2
+    assert stats["retry_attempt_count"] == 3
+    assert stats["retry_recovered_count"] == 2
+    assert stats["retry_yield"] == 1.0
+    assert stats["retry_budget_exhausted"] is False
+
+
+def test_retry_stops_at_budget_and_keeps_last_error(monkeypatch):
+    clock = FakeClock()
+
+    def always_throttled(symbol, exchange):
+        raise RuntimeError("HTTP 429 Too Many Requests (retry)")
+
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", always_throttled)
+
+    recovered, remaining, stats = fundamental_discovery._retry_failed_symbols(
+        [ErrorDetail(symbol="AAA", error="HTTP 429 Too Many Requests")],
+        "NASDAQ",
+        workers=1,
+        budget_seconds=3.0,
+        clock=clock,
+        sleep=clock.sleep,
+        rng=random.Random(1),
+    )
+
+    assert recovered == []
+    assert remaining[0].error == "HTTP 429 Too Many Requests (retry)"
+    assert clock.now <= 3.0
+    assert stats["retry_attempt_count"] <= fundamental_discovery.RETRY_MAX_ATTEMPTS
+
+
+def test_discovery_merges_retried_symbols_into_ranking(monkeypatch):
+    attempts = {}
+
+    def flaky_analyze(symbol, exchange):
+        attempts[symbol] = attempts.get(symbol, 0) + 1
+        if symbol == "BEST" and attempts[symbol] == 1:
+            raise RuntimeError("Read timed out")
+        return _candidate(symbol, 0.9 if symbol == "BEST" else 0.4)
+
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "build_us_fundamental_universe",
+        lambda max_universe: {"symbols": ["BEST", "OKAY"], "sources": {}},
+    )
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", flaky_analyze)
+    monkeypatch.setattr(fundamental_discovery, "RETRY_BASE_DELAY_SECONDS", 0.0)
+
+    candidates, errors, metadata = fundamental_discovery.discover_best_fundamentals(top_n=2, retry_budget_seconds=60)
+
+    assert [candidate.symbol for candidate in candidates] == ["BEST", "OKAY"]
+    assert errors == []
+    assert metadata["first_pass_analyzed_count"] == 1
+    assert metadata["first_pass_yield"] == 0.5
+    assert metadata["retry_recovered_count"] == 1
+    assert metadata["analyzed_count"] == 2
+
+
+def test_zero_retry_budget_disables_retries(monkeypatch):
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "analyze_fundamental_candidate",
+        lambda symbol, exchange: (_ for _ in ()).throw(RuntimeError("HTTP 429")),
+    )
+
+    recovered, remaining, stats = fundamental_discovery._retry_failed_symbols(
+        [ErrorDetail(symbol="AAA", error="HTTP 429")], "NASDAQ", 1, 0
+    )
+
+    assert recovered == []
+    assert len(remaining) == 1
+    assert stats["retry_queued_count"] == 0
+
+
+def test_discovery_does_not_retry_or_sleep_by_default(monkeypatch):
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "build_us_fundamental_universe",
+        lambda max_universe: {"symbols": ["SLOW"], "sources": {}},
+    )
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "analyze_fundamental_candidate",
+        lambda symbol, exchange: (_ for _ in ()).throw(RuntimeError("HTTP 429 Too Many Requests")),
+    )
+    monkeypatch.setattr(fundamental_discovery.time, "sleep", lambda seconds: pytest.fail("discovery must not sleep"))
+
+    candidates, errors, metadata = fundamental_discovery.discover_best_fundamentals(top_n=1)
+
+    assert candidates == []
+    assert [error.symbol for error in errors] == ["SLOW"]
+    assert metadata["retry_queued_count"] == 0
+    assert BestFundamentalsRequest().retry_budget_seconds == 0.0
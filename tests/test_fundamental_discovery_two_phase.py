@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from app.services import fundamental_discovery
+
+SYMBOLS = [f"S{index:02d}" for index in range(30)]
+
+
+def _setup(monkeypatch, analyzed, true_best="S25"):
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "build_us_fundamental_universe",
+        lambda max_universe: {"symbols": list(SYMBOLS), "sources": {}},
+    )
+    monkeypatch.setattr(
+        fundamental_discovery,
+        "_prescreen_score",
+        lambda symbol, exchange: SimpleNamespace(score=round(1.0 - int(symbol[1:]) / 100, 2)),
+    )
+
+    def fake_analyze(symbol, exchange):
+        analyzed.append(symbol)
+        score = 0.99 if symbol == true_best else 0.9 - int(symbol[1:]) / 100
+        return SimpleNamespace(symbol=symbol, candidate_score=score, raw_scores={}, metadata={})
+
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", fake_analyze)
+
+
+def test_two_phase_runs_statement_analysis_on_the_prescreened_fraction(monkeypatch):
+    analyzed = []
+    _setup(monkeypatch, analyzed, true_best="S01")
+
+    candidates, errors, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=2,
+        two_phase=True,
+        prescreen_fraction=0.2,
+        prescreen_audit_size=0,
+    )
+
+    assert sorted(analyzed) == SYMBOLS[:6]
+    assert [candidate.symbol for candidate in candidates] == ["S01", "S00"]
+    assert metadata["discovery_mode"] == "two_phase"
+    assert metadata["prescreen_kept_count"] == 6
+    assert metadata["prescreen_dropped_count"] == 24
+    assert metadata["prescreen_cutoff_score"] == 0.95
+    assert metadata["attempted_count"] == 6
+    assert metadata["universe_symbol_count"] == 30
+
+
+def test_two_phase_audit_reports_dropped_top_n_names(monkeypatch):
+    analyzed = []
+    _setup(monkeypatch, analyzed, true_best="S25")
+
+    candidates, _, metadata = fundamental_discovery.discover_best_fundamentals(
+        top_n=2,
+        two_phase=True,
+        prescreen_fraction=0.2,
+        prescreen_audit_size=24,
+    )
+
+    assert candidates[0].symbol == "S25"
+    assert metadata["prescreen_audit_count"] == 24
+    assert metadata["prescreen_audit_top_n_hits"] == ["S25"]
+    assert metadata["prescreen_estimated_missed_top_n"] == 1.0
+    assert metadata["prescreen_estimated_top_n_recall"] == 0.5
+
+
+def test_single_phase_is_the_default(monkeypatch):
+    analyzed = []
+    _setup(monkeypatch, analyzed)
+
+    _, _, metadata = fundamental_discovery.discover_best_fundamentals(top_n=2)
+
+    assert len(analyzed) == 30
+    assert metadata["discovery_mode"] == "single_phase"
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from app.services import local_indicators
+from app.services.indicator_state import IndicatorStateStore
+from app.services.local_indicators import advance_indicator_states, compute_indicator_matrix
+
+
+def _frame(bars, seed, drift=0.0):
+    rng = np.random.default_rng(seed)
+    close = 50.0 * np.exp(np.cumsum(rng.normal(drift, 0.015, bars)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.003, bars)),
+            "High": close * (1 + np.abs(rng.normal(0, 0.01, bars))),
+            "Low": close * (1 - np.abs(rng.normal(0, 0.01, bars))),
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, bars).astype(float),
+        },
+        index=pd.bdate_range("2025-01-02", periods=bars),
+    )
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_warm_advance_matches_full_recompute(tmp_path):
+    frames = {"LONG": _frame(300, 1), "SHORT": _frame(40, 2), "UP": _frame(260, 3, drift=0.004)}
+    store = IndicatorStateStore(tmp_path / "state.json")
+    advance_indicator_states({symbol: frame.iloc[:-3] for symbol, frame in frames.items()}, store)
+    store.save()
+
+    reloaded = IndicatorStateStore(tmp_path / "state.json")
+    results = advance_indicator_states(frames, reloaded)
+
+    assert results == compute_indicator_matrix(frames)
+    assert reloaded.get("LONG")["last_bar"] == str(frames["LONG"].index.values[-1])
+
+
+def test_same_day_rescan_reuses_state_without_rewriting_it(tmp_path):
+    clock = FakeClock()
+    frames = {"AAA": _frame(260, 4)}
+    store = IndicatorStateStore(tmp_path / "state.json", clock=clock)
+    first = advance_indicator_states(frames, store)
+    clock.now += 60
+
+    second = advance_indicator_states(frames, store)
+
+    assert second == first
+    assert store.get("AAA")["updated_at"] == 1_000_000.0
+
+
+def test_revised_history_reseeds_state(tmp_path):
+    store = IndicatorStateStore(tmp_path / "state.json")
+    original = _frame(260, 5)
+    advance_indicator_states({"AAA": original.iloc[:-1]}, store)
+    # A dividend adjustment rescales the whole adjusted history.
+    revised = original.copy()
+    revised[["Open", "High", "Low", "Close"]] *= 0.98
+
+    results = advance_indicator_states({"AAA": revised}, store)
+
+    assert results == compute_indicator_matrix({"AAA": revised})
+
+
+def test_state_from_other_version_or_older_than_history_reseeds(tmp_path):
+    store = IndicatorStateStore(tmp_path / "state.json")
+    frame = _frame(260, 6)
+    advance_indicator_states({"AAA": frame.iloc[:100], "BBB": frame.iloc[:-1]}, store)
+    store.put("BBB", dict(store.get("BBB"), version=local_indicators.INDICATOR_STATE_VERSION + 1))
+
+    results = advance_indicator_states({"AAA": frame.iloc[150:], "BBB": frame}, store)
+
+    assert results["AAA"] == compute_indicator_matrix({"AAA": frame.iloc[150:]})["AAA"]
+    assert results["BBB"] == compute_indicator_matrix({"BBB": frame})["BBB"]
+    assert store.get("BBB")["version"] == local_indicators.INDICATOR_STATE_VERSION
+
+
+def test_state_keeps_only_short_windows(tmp_path):
+    store = IndicatorStateStore(tmp_path / "state.json")
+    advance_indicator_states({"AAA": _frame(300, 7)}, store)
+
+    state = store.get("AAA")
+    assert {field: len(values) for field, values in state["windows"].items()} == local_indicators.STATE_WINDOW_BARS
+    assert state["bars"] == 300
+    assert len(state["high_52w"]) <= local_indicators.WEEK_52_BARS
+
+
+def test_prune_drops_states_not_advanced_recently(tmp_path):
+    clock = FakeClock()
+    store = IndicatorStateStore(tmp_path / "state.json", clock=clock, max_age_seconds=100)
+    store.put("OLD", {"version": 1})
+    clock.now += 60
+    store.put("NEW", {"version": 1})
+    clock.now += 60
+
+    assert store.prune() == 1
+    assert store.get("OLD") is None
+    assert store.get("NEW") is not None
+    assert store.save() is True
+    assert IndicatorStateStore(tmp_path / "state.json").get("NEW") is not None
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data_sources.price_history import period_for_bars
+from app.services import local_indicators
+from app.services.indicator_state import IndicatorStateStore
+from app.services.local_indicators import compute_indicator_matrix, compute_local_analyses
+
+
+def _frame(bars, seed, drift=0.0):
+    rng = np.random.default_rng(seed)
+    close = 50.0 * np.exp(np.cumsum(rng.normal(drift, 0.015, bars)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.003, bars)),
+            "High": close * (1 + np.abs(rng.normal(0, 0.01, bars))),
+            "Low": close * (1 - np.abs(rng.normal(0, 0.01, bars))),
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, bars).astype(float),
+        }
+    )
+
+
+def _reference(frame):
+    """Per-symbol pandas formulas the matrix engine must agree with."""
+
+    close, high, low = frame["Close"], frame["High"], frame["Low"]
+    change = close.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    loss = (-change.clip(upper=0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    macd = close.ewm(span=12, adjust=False, min_periods=12).mean() - close.ewm(span=26, adjust=False, min_periods=26).mean()
+    true_range = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    values = {
+        "RSI": 100 - 100 / (1 + gain.iloc[-1] / loss.iloc[-1]),
+        "MACD.macd": macd.iloc[-1],
+        "MACD.signal": macd.ewm(span=9, adjust=False, min_periods=9).mean().iloc[-1],
+        "SMA50": close.rolling(50).mean().iloc[-1],
+        "SMA200": close.rolling(200).mean().iloc[-1],
+        "EMA20": close.ewm(span=20, adjust=False, min_periods=20).mean().iloc[-1],
+        "ATR": true_range.ewm(alpha=1 / 14, adjust=False, min_periods=14).mean().iloc[-1],
+        "Volume MA": frame["Volume"].rolling(20).mean().iloc[-1],
+        "High.52W": high.tail(252).max(),
+        "Perf.1M": (close.iloc[-1] / close.iloc[-22] - 1) * 100,
+        "Perf.3M": (close.iloc[-1] / close.iloc[-64] - 1) * 100,
+    }
+    return {name: value for name, value in values.items() if pd.notna(value)}
+
+
+def test_matrix_indicators_match_per_symbol_pandas_formulas():
+    frames = {"LONG": _frame(300, 1), "SHORT": _frame(120, 2), "UP": _frame(260, 3, drift=0.004)}
+
+    results = compute_indicator_matrix(frames)
+
+    for symbol, frame in frames.items():
+        indicators = results[symbol]["indicators"]
+        for name, expected in _reference(frame).items():
+            assert indicators[name] == pytest.approx(expected, rel=1e-9), (symbol, name)
+        assert indicators["close"] == frame["Close"].iloc[-1]
+
+
+def test_short_history_omits_indicators_it_cannot_compute():
+    results = compute_indicator_matrix({"NEW": _frame(60, 4)})
+
+    indicators = results["NEW"]["indicators"]
+    assert "SMA50" in indicators
+    assert "SMA200" not in indicators
+    assert "Perf.3M" not in indicators
+    assert "Perf.1M" in indicators
+
+
+def test_vote_summary_follows_tradingview_shape_and_direction():
+    results = compute_indicator_matrix({"UP": _frame(260, 5, drift=0.01), "DOWN": _frame(260, 6, drift=-0.01)})
+
+    up, down = results["UP"]["analysis"], results["DOWN"]["analysis"]
+    assert set(up) == {"RECOMMENDATION", "BUY", "SELL", "NEUTRAL"}
+    assert up["BUY"] + up["SELL"] + up["NEUTRAL"] == 18
+    assert up["RECOMMENDATION"] in {"BUY", "STRONG_BUY"}
+    assert down["RECOMMENDATION"] in {"SELL", "STRONG_SELL"}
+
+
+def test_scanner_technical_score_accepts_local_summary():
+    scanner = pytest.importorskip("app.services.scanner")
+    results = compute_indicator_matrix({"UP": _frame(260, 7, drift=0.01)})
+
+    assert scanner._technical_score(results["UP"]["analysis"]) > 0.5
+
+
+def test_local_history_window_stays_on_the_shared_one_year_frames():
+    assert period_for_bars(local_indicators.LOCAL_INDICATOR_BARS) == "1y"
+
+
+def test_compute_local_analyses_maps_symbols_and_reports_missing_history(monkeypatch, tmp_path):
+    requested = []
+    frames = {"PTT.BK": _frame(260, 8)}
+    monkeypatch.setattr(local_indicators, "prefetch_price_histories", lambda symbols, bars: {"BAD.BK": "download failed"})
+
+    def history(symbol, bars):
+        requested.append((symbol, bars))
+        return frames.get(symbol, pd.DataFrame())
+
+    monkeypatch.setattr(local_indicators, "get_price_history", history)
+
+    store = IndicatorStateStore(tmp_path / "indicator_state.json")
+    results = compute_local_analyses(["PTT", "EMPTY", "BAD"], "SET", state_store=store)
+
+    assert results["PTT"]["source"] == "local"
+    assert results["PTT"]["exchange"] == "SET"
+    assert results["PTT"]["indicators"]["close"] == frames["PTT.BK"]["Close"].iloc[-1]
+    assert results["EMPTY"] == {"symbol": "EMPTY", "error": local_indicators.NO_LOCAL_DATA_ERROR}
+    assert results["BAD"] == {"symbol": "BAD", "error": "download failed"}
+    assert ("PTT.BK", local_indicators.LOCAL_INDICATOR_BARS) in requested
+    assert store.get("PTT.BK") is not None
+
+
+def test_scan_market_local_source_skips_tradingview(monkeypatch):
+    scanner = pytest.importorskip("app.services.scanner")
+    from app.services.backtest import BacktestResult
+    from app.services.fundamental_score import FundamentalScoreResult
+    from app.services.sector_rotation import SectorRotationResult
+
+    prefetched = []
+    monkeypatch.setattr(scanner, "prefetch_price_histories", lambda symbols, bars: prefetched.append(bars) or {})
+    monkeypatch.setattr(scanner, "get_backtest_results", lambda symbols: {})
+    monkeypatch.setattr(scanner, "append_feedback_seeds", lambda candidates: 0)
+    monkeypatch.setattr(scanner, "fetch_analyses", lambda *args: pytest.fail("TradingView must not be called"))
+    monkeypatch.setattr(
+        scanner,
+        "compute_local_analyses",
+        lambda symbols, exchange: {
+            symbol: {"symbol": symbol, "exchange": exchange, "source": "local", **computed}
+            for symbol, computed in compute_indicator_matrix(
+                {symbol: _frame(260, 9, drift=0.01) for symbol in symbols}
+            ).items()
+        },
+    )
+    monkeypatch.setattr(scanner, "get_backtest_result", lambda symbol: BacktestResult(symbol, 100.0, 0.02, 0.05, 0.6, 0.7, []))
+    monkeypatch.setattr(
+        scanner,
+        "get_fundamental_score",
+        lambda symbol: FundamentalScoreResult(symbol, 0.7, None, None, None, None, None, None, None, None, []),
+    )
+    monkeypatch.setattr(
+        scanner,
+        "get_sector_rotation_score",
+        lambda symbol: SectorRotationResult(symbol, None, None, None, None, None, None, 0.5, []),
+    )
+
+    candidates, errors = scanner.scan_market(["AAA"], screener="america", exchange="NASDAQ", technical_source="local")
+
+    assert errors == []
+    assert prefetched == [local_indicators.LOCAL_INDICATOR_BARS]
+    assert [candidate.symbol for candidate in candidates] == ["AAA"]
+    assert candidates[0].details["technical_source"] == "local"
+
+
+def test_scan_market_rejects_unknown_technical_source():
+    scanner = pytest.importorskip("app.services.scanner")
+
+    with pytest.raises(ValueError):
+        scanner.scan_market(["AAA"], technical_source="yahoo")
@@ -0,0 +1,98 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.utils import market_calendar
+from app.utils.market_calendar import (
+    SET_MARKET,
+    US_MARKET,
+    is_open,
+    market_for_symbol,
+    next_session_boundary,
+    session_ttl,
+    set_holidays,
+    us_holidays,
+)
+
+NEW_YORK = ZoneInfo("America/New_York")
+BANGKOK = ZoneInfo("Asia/Bangkok")
+
+
+def test_us_holidays_follow_nyse_rules():
+    holidays = us_holidays(2026)
+
+    assert date(2026, 4, 3) in holidays  # Good Friday
+    assert date(2026, 7, 3) in holidays  # Independence Day observed on Friday
+    assert date(2026, 11, 26) in holidays  # Thanksgiving
+    assert date(2022, 12, 31) not in us_holidays(2022)  # New Year on Saturday is not observed
+
+
+def test_weekend_entries_live_until_monday_open():
+    friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=NEW_YORK)
+
+    assert is_open(US_MARKET, friday_evening) is False
+    assert next_session_boundary(US_MARKET, friday_evening) == datetime(2026, 10, 19, 9, 30, tzinfo=NEW_YORK)
+    assert session_ttl(US_MARKET, 900, friday_evening) == (63 * 60 + 30) * 60
+
+
+def test_open_session_entries_are_capped_at_the_close():
+    before_close = datetime(2026, 10, 14, 15, 55, tzinfo=NEW_YORK)
+    midday = datetime(2026, 10, 14, 12, 0, tzinfo=NEW_YORK)
+
+    assert session_ttl(US_MARKET, 900, before_close) == 300
+    assert session_ttl(US_MARKET, 900, midday) == 900
+
+
+def test_set_symbols_use_bangkok_session_and_substituted_holidays():
+    assert market_for_symbol("PTT.BK") == SET_MARKET
+    assert market_for_symbol("AAPL") == US_MARKET
+    assert date(2026, 12, 7) in set_holidays(2026)  # King's Birthday falls on Saturday
+
+    friday_after_close = datetime(2026, 12, 4, 17, 0, tzinfo=BANGKOK)
+    assert next_session_boundary(SET_MARKET, friday_after_close) == datetime(2026, 12, 8, 10, 0, tzinfo=BANGKOK)
+
+
+def test_closed_ttl_is_bounded(monkeypatch):
+    monkeypatch.setattr(market_calendar, "MAX_CLOSED_TTL_SECONDS", 60)
+    friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=NEW_YORK)
+
+    assert session_ttl(US_MARKET, 900, friday_evening) == 60
+
+
+def test_set_coronation_day_is_a_holiday():
+    assert date(2026, 5, 4) in set_holidays(2026)
+    assert date(2025, 5, 5) in set_holidays(2025)  # falls on Sunday in 2025
+
+    coronation_morning = datetime(2026, 5, 4, 11, 0, tzinfo=BANGKOK)
+    assert is_open(SET_MARKET, coronation_morning) is False
+    assert session_ttl(SET_MARKET, 900, coronation_morning) == (23 * 60) * 60
+
+
+def test_batched_prefilter_results_live_until_the_next_session(monkeypatch):
+    prefilter = pytest.importorskip("app.services.prefilter")
+    saturday = datetime(2026, 10, 17, 12, 0, tzinfo=NEW_YORK)
+    monkeypatch.setattr(market_calendar, "_now", lambda at: at or saturday)
+    monkeypatch.setattr(
+        prefilter,
+        "_fetch_quote_batch",
+        lambda symbols: {
+            symbol: {
+                "symbol": symbol,
+                "quoteType": "EQUITY",
+                "regularMarketPrice": 100.0,
+                "averageDailyVolume10Day": 5_000_000,
+                "marketCap": 50_000_000_000,
+            }
+            for symbol in symbols
+        },
+    )
+    cache = prefilter.evaluate_symbol.cache
+    cache.clear()
+
+    prefilter.prefilter_symbols(["AAPL"])
+
+    expires_in = cache._entries[("AAPL",)].expires_at - cache._clock()
+    assert expires_in > prefilter.PREFILTER_CACHE_TTL_SECONDS
+    assert expires_in == pytest.approx(session_ttl(US_MARKET, 900, saturday), abs=5)
+    cache.clear()
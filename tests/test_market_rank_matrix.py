@@ -0,0 +1,178 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services import market_ranker
+from app.services.market_ranker import (
+    MarketRankResult,
+    _clamp01,
+    _pct_return,
+    _rank_error,
+    _safe_float,
+    _score_return,
+    _score_volume_ratio,
+)
+from app.utils.yfinance_frames import extract_yfinance_series
+
+
+def _reference_rank(symbol, history):
+    """The per-symbol implementation the matrix ranking replaced."""
+
+    reasons: List[str] = []
+
+    try:
+        close_series = extract_yfinance_series(history, "Close", symbol)
+        volume_values = extract_yfinance_series(history, "Volume", symbol)
+        volume_series = None if volume_values.empty else volume_values
+    except Exception as exc:
+        return _rank_error(symbol, f"Market Ranking error: {exc}")
+
+    if close_series.empty:
+        return _rank_error(symbol, "ไม่มีข้อมูลราคาเพียงพอสำหรับ Market Ranking")
+
+    if len(close_series) < 30:
+        return _rank_error(symbol, "ข้อมูลราคาน้อยเกินไปสำหรับ Market Ranking")
+
+    last_price = _safe_float(close_series.iloc[-1])
+    ret_5d = _pct_return(
+        _safe_float(close_series.iloc[-6]) if len(close_series) >= 6 else None,
+        last_price,
+    )
+    ret_20d = _pct_return(
+        _safe_float(close_series.iloc[-21]) if len(close_series) >= 21 else None,
+        last_price,
+    )
+    ret_60d = _pct_return(
+        _safe_float(close_series.iloc[-61]) if len(close_series) >= 61 else None,
+        last_price,
+    )
+
+    ma20 = (
+        _safe_float(close_series.tail(20).mean())
+        if len(close_series) >= 20
+        else None
+    )
+    ma50 = (
+        _safe_float(close_series.tail(50).mean())
+        if len(close_series) >= 50
+        else None
+    )
+    trend_parts = []
+    if last_price is not None and ma20 is not None:
+        trend_parts.append(1.0 if last_price > ma20 else 0.35)
+        if last_price > ma20:
+            reasons.append("ราคาอยู่เหนือ MA20")
+    if ma20 is not None and ma50 is not None:
+        trend_parts.append(1.0 if ma20 > ma50 else 0.35)
+        if ma20 > ma50:
+            reasons.append("MA20 อยู่เหนือ MA50 แนวโน้มระยะสั้นแข็งแรง")
+    trend_score = sum(trend_parts) / len(trend_parts) if trend_parts else 0.45
+
+    volume_ratio = None
+    if volume_series is not None and len(volume_series) >= 21:
+        recent_volume = _safe_float(volume_series.iloc[-1])
+        avg_volume_20 = _safe_float(volume_series.tail(20).mean())
+        if recent_volume is not None and avg_volume_20 and avg_volume_20 > 0:
+            volume_ratio = recent_volume / avg_volume_20
+            if volume_ratio >= 1.3:
+                reasons.append(
+                    f"Volume ล่าสุดสูงกว่าค่าเฉลี่ย ({volume_ratio:.2f}x)"
+                )
+
+    score = _clamp01(
+        (_score_return(ret_5d, -0.06, 0.12) * 0.15)
+        + (_score_return(ret_20d, -0.10, 0.20) * 0.30)
+        + (_score_return(ret_60d, -0.15, 0.35) * 0.25)
+        + (_score_volume_ratio(volume_ratio) * 0.15)
+        + (trend_score * 0.15)
+    )
+
+    if ret_20d is not None and ret_20d > 0:
+        reasons.append(f"ผลตอบแทน 20 วันเป็นบวก ({ret_20d:.2%})")
+    if ret_60d is not None and ret_60d > 0:
+        reasons.append(f"ผลตอบแทน 60 วันเป็นบวก ({ret_60d:.2%})")
+    if score >= 0.65:
+        reasons.append("Market Ranking สนับสนุนให้ส่งเข้า TradingView")
+
+    return MarketRankResult(
+        symbol=symbol,
+        score=round(score, 4),
+        price=last_price,
+        return_5d=ret_5d,
+        return_20d=ret_20d,
+        return_60d=ret_60d,
+        volume_ratio=volume_ratio,
+        trend_score=round(trend_score, 4),
+        reason=reasons,
+    )
+
+
+def _history(rng, length, flat=False, volume_gaps=False):
+    prices = np.round(50 * np.exp(np.cumsum(rng.normal(0, 0.015, length))), 2)
+    if flat:
+        prices[:] = prices[0]
+        prices[-1] += 0.01
+    volumes = rng.integers(1_000, 50_000, length).astype(float)
+    if volume_gaps:
+        volumes[rng.choice(length, size=max(1, length // 10), replace=False)] = np.nan
+    index = pd.date_range("2026-01-01", periods=length, freq="D")
+    return pd.DataFrame({"Close": prices, "Volume": volumes}, index=index)
+
+
+def test_matrix_ranking_matches_per_symbol_ranking():
+    rng = np.random.default_rng(22)
+    histories = {
+        f"S{index:03d}": _history(
+            rng,
+            int(rng.integers(1, 127)),
+            flat=index % 7 == 0,
+            volume_gaps=index % 5 == 0,
+        )
+        for index in range(400)
+    }
+    histories["EMPTY"] = pd.DataFrame({"Close": [], "Volume": []})
+    histories["NOVOL"] = _history(rng, 90).drop(columns=["Volume"])
+
+    results = market_ranker.rank_histories(histories)
+
+    for symbol, history in histories.items():
+        assert results[symbol] == _reference_rank(symbol, history), symbol
+
+
+def test_rank_market_matrix_on_aligned_arrays():
+    closes = np.full((2, 70), np.nan)
+    closes[0] = np.linspace(10.0, 20.0, 70)
+    closes[1, 30:] = np.linspace(20.0, 10.0, 40)
+    volumes = np.ones((2, 70)) * 1000.0
+    volumes[0, -1] = 3000.0
+
+    up, down = market_ranker.rank_market_matrix(["UP", "DOWN"], closes, volumes)
+
+    assert up.return_60d is not None and up.return_60d > 0
+    assert down.return_60d is None
+    assert up.volume_ratio == 3000.0 / 1100.0
+    assert up.trend_score == 1.0
+    assert down.trend_score == 0.35
+    assert up.score > down.score
+
+
+def test_rank_market_symbols_ranks_cached_prices_in_one_pass(monkeypatch):
+    rng = np.random.default_rng(5)
+    histories = {f"T{index:04d}": _history(rng, 126) for index in range(5000)}
+    monkeypatch.setattr(market_ranker, "prefetch_price_histories", lambda symbols, bars: {})
+    monkeypatch.setattr(market_ranker, "get_price_history", lambda symbol, bars: histories[symbol])
+    market_ranker.rank_symbol.cache_clear()
+
+    matrices = market_ranker._right_aligned([history["Close"] for history in histories.values()])
+    volumes = market_ranker._right_aligned([history["Volume"] for history in histories.values()])
+    started = time.perf_counter()
+    market_ranker.rank_market_matrix(list(histories), matrices, volumes)
+    assert time.perf_counter() - started < 1.0
+
+    selected, metadata = market_ranker.rank_market_symbols(list(histories)[:100])
+
+    assert len(selected) == market_ranker.MAX_SYMBOLS_AFTER_RANKING
+    assert market_ranker.rank_symbol("T0001") is market_ranker.rank_symbol.cache.get(("T0001",))[1]
+    assert metadata["T0001"]["market_rank_score"] == market_ranker.rank_symbol("T0001").score
+    market_ranker.rank_symbol.cache_clear()
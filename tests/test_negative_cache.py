@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import fundamental_discovery
+from app.services.negative_cache import NegativeCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock, monkeypatch):
+    cache = NegativeCache(tmp_path / "negative_cache.json", clock=clock)
+    monkeypatch.setattr(fundamental_discovery, "get_negative_cache", lambda: cache)
+    return cache
+
+
+def test_entries_expire_by_category(cache, clock):
+    assert cache.record("DEAD", "missing_financial_statements", "missing financial statements")
+    assert cache.record("BUSY", "provider_rate_limited", "HTTP 429")
+    assert not cache.record("ODD", "analysis_error", "boom")
+
+    kept, skipped = cache.partition(["DEAD", "BUSY", "ODD"])
+    assert kept == ["ODD"]
+    assert skipped == {"missing_financial_statements": 1, "provider_rate_limited": 1}
+
+    clock.now += 16 * 60
+    kept, _ = cache.partition(["DEAD", "BUSY"])
+    assert kept == ["BUSY"]
+
+    clock.now += 7 * 24 * 60 * 60
+    assert cache.partition(["DEAD"])[0] == ["DEAD"]
+    assert cache.prune() == 2
+
+
+def test_cache_persists_between_instances(cache, clock, tmp_path):
+    cache.record("dead", "missing_market_data", "missing market data")
+    assert cache.save() is True
+    assert cache.save() is False
+
+    reloaded = NegativeCache(tmp_path / "negative_cache.json", clock=clock)
+    assert reloaded.active_categories("DEAD") == ["missing_market_data"]
+
+
+def test_discovery_skips_cached_symbols_within_the_capped_universe(cache, monkeypatch):
+    monkeypatch.setattr(fundamental_discovery, "load_sp500_symbols", lambda: ["AAPL", "DEAD", "MSFT"])
+    monkeypatch.setattr(fundamental_discovery, "load_nasdaq100_symbols", lambda: ["NVDA"])
+    monkeypatch.setattr(fundamental_discovery, "load_nasdaq_listed_symbols", lambda: [])
+    cache.record("DEAD", "missing_financial_statements")
+    analyzed = []
+
+    def fake_analyze(symbol, exchange):
+        analyzed.append(symbol)
+        return SimpleNamespace(symbol=symbol, candidate_score=0.5, raw_scores={}, metadata={})
+
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", fake_analyze)
+
+    universe = fundamental_discovery.build_us_fundamental_universe(max_universe=3)
+    _, _, metadata = fundamental_discovery.discover_best_fundamentals(max_universe=3, top_n=2)
+
+    # The universe ignores the cache, and NVDA does not fill DEAD's slot.
+    assert universe["symbols"] == ["AAPL", "DEAD", "MSFT"]
+    assert sorted(analyzed) == ["AAPL", "MSFT"]
+    assert metadata["negative_cache_skipped_count"] == 1
+    assert metadata["negative_cache_skipped_by_category"] == {"missing_financial_statements": 1}
+
+
+def test_discovery_records_failures_and_clears_recovered_symbols(cache, monkeypatch):
+    cache.record("GOOD", "provider_timeout")
+
+    def fake_analyze(symbol, exchange):
+        if symbol == "EMPTY":
+            raise ValueError("missing financial statements")
+        return SimpleNamespace(symbol=symbol, candidate_score=0.5, raw_scores={}, metadata={})
+
+    monkeypatch.setattr(fundamental_discovery, "analyze_fundamental_candidate", fake_analyze)
+
+    # An explicit symbol list is analyzed even where the cache has an entry.
+    _, errors, metadata = fundamental_discovery.discover_best_fundamentals(top_n=2, symbols=["GOOD", "EMPTY"])
+
+    assert [error.symbol for error in errors] == ["EMPTY"]
+    assert metadata["negative_cache_recorded_count"] == 1
+    assert cache.active_categories("EMPTY") == ["missing_financial_statements"]
+    assert cache.active_categories("GOOD") == []
+    assert cache.path.exists()
@@ -0,0 +1,109 @@
+import pytest
+
+pytest.importorskip("yfinance")
+
+from app.services import prefilter
+
+
+class QuoteSession:
+    calls = []
+
+    def get_raw_json(self, url, params=None, timeout=30):
+        symbols = params["symbols"].split(",")
+        QuoteSession.calls.append(symbols)
+        quotes = {
+            "AAPL": {
+                "symbol": "AAPL",
+                "quoteType": "EQUITY",
+                "regularMarketPrice": 190.0,
+                "averageDailyVolume10Day": 50_000_000,
+                "marketCap": 3_000_000_000_000,
+            },
+            "SPY": {
+                "symbol": "SPY",
+                "quoteType": "ETF",
+                "regularMarketPrice": 500.0,
+                "averageDailyVolume10Day": 60_000_000,
+                "marketCap": 500_000_000_000,
+            },
+            "TINY": {
+                "symbol": "TINY",
+                "quoteType": "EQUITY",
+                "regularMarketPrice": 1.5,
+                "averageDailyVolume10Day": 20_000,
+            },
+        }
+        return {
+            "quoteResponse": {
+                "result": [quotes[symbol] for symbol in symbols if symbol in quotes]
+            }
+        }
+
+
+class InfoTicker:
+    requested = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        InfoTicker.requested.append(symbol)
+
+    def get_info(self):
+        return {"quoteType": "EQUITY", "marketCap": 100_000_000}
+
+
+@pytest.fixture
+def batched_provider(monkeypatch):
+    QuoteSession.calls = []
+    InfoTicker.requested = []
+    monkeypatch.setattr(prefilter.yf.data, "YfData", QuoteSession)
+    monkeypatch.setattr(prefilter.yf, "Ticker", InfoTicker)
+    prefilter.evaluate_symbol.cache_clear()
+
+
+def test_prefilter_reads_complete_quotes_without_per_symbol_calls(batched_provider):
+    selected, metadata = prefilter.prefilter_symbols(["AAPL", "SPY"], batch_size=50)
+
+    assert QuoteSession.calls == [["AAPL", "SPY"]]
+    assert InfoTicker.requested == []
+    assert selected[0] == "AAPL"
+    assert metadata["AAPL"]["passed"] is True
+    assert metadata["AAPL"]["avg_volume"] == 50_000_000
+    assert metadata["SPY"]["passed"] is False
+
+
+def test_prefilter_falls_back_to_get_info_only_for_missing_fields(batched_provider):
+    _, metadata = prefilter.prefilter_symbols(["TINY", "AAPL"], batch_size=1)
+
+    assert QuoteSession.calls == [["TINY"], ["AAPL"]]
+    assert InfoTicker.requested == ["TINY"]
+    assert metadata["TINY"]["market_cap"] == 100_000_000
+    assert metadata["TINY"]["passed"] is False
+
+
+def test_prefilter_keeps_bad_symbol_patterns_out_of_provider_calls(batched_provider):
+    _, metadata = prefilter.prefilter_symbols(["ABC.W", "AAPL"])
+
+    assert QuoteSession.calls == [["AAPL"]]
+    assert metadata["ABC.W"]["passed"] is False
+    assert metadata["ABC.W"]["prefilter_score"] == 0.0
+
+
+def test_prefilter_serves_repeat_scans_from_the_symbol_cache(batched_provider):
+    prefilter.prefilter_symbols(["AAPL", "TINY"], batch_size=50)
+    _, metadata = prefilter.prefilter_symbols(["AAPL", "TINY", "SPY"], batch_size=50)
+
+    assert QuoteSession.calls == [["AAPL", "TINY"], ["SPY"]]
+    assert InfoTicker.requested == ["TINY"]
+    assert prefilter.evaluate_symbol.cache_info().hits == 2
+    assert metadata["AAPL"]["passed"] is True
+    assert prefilter.evaluate_symbol("AAPL").avg_volume == 50_000_000
+
+
+def test_prefilter_falls_back_per_symbol_when_yfinance_lacks_quote_session(batched_provider, monkeypatch):
+    monkeypatch.delattr(prefilter.yf.data, "YfData")
+
+    _, metadata = prefilter.prefilter_symbols(["AAPL", "TINY"], batch_size=50)
+
+    assert QuoteSession.calls == []
+    assert InfoTicker.requested == ["AAPL", "TINY"]
+    assert metadata["AAPL"]["market_cap"] == 100_000_000
@@ -0,0 +1,123 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("yfinance")
+
+from app.data_sources import price_history
+from app.services import market_ranker
+
+
+def _multi_ticker_history(symbols, periods=80):
+    dates = pd.date_range("2026-01-01", periods=periods, freq="D")
+    data = {}
+    for offset, symbol in enumerate(symbols):
+        data[("Close", symbol)] = [100.0 + offset + index for index in range(periods)]
+        data[("Volume", symbol)] = [1_000_000.0] * periods
+    return pd.DataFrame(data, index=dates)
+
+
+def test_download_price_histories_chunks_requests(monkeypatch):
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        chunk = tickers if isinstance(tickers, list) else [tickers]
+        calls.append(list(chunk))
+        return _multi_ticker_history(chunk)
+
+    monkeypatch.setattr(price_history.yf, "download", fake_download)
+
+    histories, errors = price_history.download_price_histories(
+        ["aapl", "MSFT", "NVDA", "AAPL"],
+        batch_size=2,
+    )
+
+    assert calls == [["AAPL", "MSFT"], ["NVDA"]]
+    assert errors == {}
+    assert histories["MSFT"]["Close"].iloc[0] == 101.0
+    assert len(histories["NVDA"]) == 80
+
+
+def test_rank_market_symbols_uses_one_batched_download(monkeypatch):
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append(tickers)
+        return _multi_ticker_history(tickers)
+
+    monkeypatch.setattr(price_history.yf, "download", fake_download)
+    price_history.clear_price_history_cache()
+    market_ranker.rank_symbol.cache_clear()
+
+    selected, metadata = market_ranker.rank_market_symbols(["AAPL", "MSFT", "NVDA"])
+
+    assert len(calls) == 1
+    assert set(selected) == {"AAPL", "MSFT", "NVDA"}
+    assert metadata["AAPL"]["return_20d"] is not None
+    assert metadata["AAPL"]["trend_score"] == 1.0
+
+
+def test_rank_market_symbols_reports_failed_chunk_per_symbol(monkeypatch):
+    def failing_download(tickers, **kwargs):
+        raise RuntimeError("HTTP 429 Too Many Requests")
+
+    monkeypatch.setattr(price_history.yf, "download", failing_download)
+    price_history.clear_price_history_cache()
+
+    _, metadata = market_ranker.rank_market_symbols(["AAPL", "MSFT"])
+
+    assert metadata["MSFT"]["market_rank_score"] == 0.0
+    assert metadata["MSFT"]["reason"] == [
+        "Market Ranking error: HTTP 429 Too Many Requests"
+    ]
+
+
+def test_shared_store_fetches_widest_window_once_and_slices(monkeypatch):
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append((tickers, kwargs["period"]))
+        return _multi_ticker_history([tickers], periods=260)
+
+    monkeypatch.setattr(price_history.yf, "download", fake_download)
+    store = price_history.PriceHistoryStore()
+
+    regime_bars = store.get("SPY", 252)
+    sector_bars = store.get("spy", 63)
+    latest_bars = store.get("SPY", 5)
+
+    assert calls == [("SPY", "1y")]
+    assert len(regime_bars) == 252
+    assert len(sector_bars) == 63
+    assert latest_bars["Close"].iloc[-1] == regime_bars["Close"].iloc[-1]
+
+
+def test_shared_store_refetches_when_more_history_is_needed(monkeypatch):
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append(kwargs["period"])
+        return _multi_ticker_history([tickers], periods=300)
+
+    monkeypatch.setattr(price_history.yf, "download", fake_download)
+    store = price_history.PriceHistoryStore()
+
+    store.get("SPY", 126)
+    store.get("SPY", 300)
+    store.get("SPY", 252)
+
+    assert calls == ["1y", "2y"]
+
+
+def test_shared_store_does_not_keep_empty_responses(monkeypatch):
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append(tickers)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(price_history.yf, "download", fake_download)
+    store = price_history.PriceHistoryStore()
+
+    assert store.get("DEAD", 5).empty
+    assert store.get("DEAD", 5).empty
+    assert len(calls) == 2
@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.provider_limits import AIMDController, is_throttle_error, reasons_outcome
+
+
+def test_successes_grow_window_additively_up_to_max():
+    controller = AIMDController("test", initial=2, max_limit=4)
+
+    controller.call(lambda: None)
+    controller.call(lambda: None)
+    assert controller.limit == 2
+    controller.call(lambda: None)
+    assert controller.limit == 3
+
+    for _ in range(20):
+        controller.call(lambda: None)
+    assert controller.limit == 4
+    assert controller.snapshot()["peak_limit"] == 4
+
+
+def test_throttle_halves_window_and_other_errors_do_not():
+    controller = AIMDController("test", initial=8, max_limit=16)
+
+    with pytest.raises(ValueError):
+        controller.call(lambda: (_ for _ in ()).throw(ValueError("missing financial statements")))
+    assert controller.limit == 8
+
+    with pytest.raises(RuntimeError):
+        controller.call(lambda: (_ for _ in ()).throw(RuntimeError("HTTP 429 Too Many Requests")))
+    snapshot = controller.snapshot()
+    assert snapshot["limit"] == 4
+    assert snapshot["throttles"] == 1
+    assert snapshot["decreases"] == 1
+    assert snapshot["in_flight"] == 0
+
+
+def test_one_congestion_event_decreases_once():
+    controller = AIMDController("test", initial=8, max_limit=16)
+    tokens = [controller.acquire() for _ in range(4)]
+
+    for token in tokens:
+        controller.release(token, "throttle")
+
+    snapshot = controller.snapshot()
+    assert snapshot["throttles"] == 4
+    assert snapshot["decreases"] == 1
+    assert snapshot["limit"] == 4
+
+
+def test_window_bounds_concurrent_calls():
+    controller = AIMDController("test", initial=2, max_limit=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+
+    threads = [threading.Thread(target=controller.call, args=(work,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+
+def test_is_throttle_error_matches_rate_limits_and_timeouts():
+    assert is_throttle_error(TimeoutError())
+    assert is_throttle_error("Read timed out")
+    assert is_throttle_error(Exception("Rate limit exceeded"))
+    assert not is_throttle_error("Missing financial statements")
+
+
+def test_swallowed_throttle_in_result_shrinks_window():
+    controller = AIMDController("test", initial=8, max_limit=16)
+
+    result = controller.call_with_outcome(
+        lambda: ["ดึงข้อมูลพื้นฐานไม่สำเร็จ: 429 Client Error: Too Many Requests"],
+        reasons_outcome,
+    )
+
+    assert result == ["ดึงข้อมูลพื้นฐานไม่สำเร็จ: 429 Client Error: Too Many Requests"]
+    snapshot = controller.snapshot()
+    assert snapshot["limit"] == 4
+    assert snapshot["throttles"] == 1
+    assert snapshot["successes"] == 0
+    assert snapshot["in_flight"] == 0
+
+    controller.call_with_outcome(lambda: ["Market Cap ประมาณ $1"], reasons_outcome)
+    assert controller.snapshot()["successes"] == 1
+
+
+def test_prescreen_backs_off_when_the_info_fetch_is_throttled(monkeypatch):
+    from app.services import fundamental_discovery
+
+    controller = AIMDController("yfinance", initial=8, max_limit=16)
+    monkeypatch.setattr(fundamental_discovery, "provider_concurrency", lambda provider: controller)
+
+    def throttled_info(symbol, exchange):
+        raise RuntimeError("HTTP 429 Too Many Requests")
+
+    monkeypatch.setattr(fundamental_discovery.financial_statements, "get_info", throttled_info)
+
+    scores = fundamental_discovery._prescreen_scores(["AAA"], "NASDAQ", workers=1)
+
+    assert scores == {"AAA": 0.5}
+    assert controller.snapshot()["decreases"] == 1
+    assert controller.limit == 4
+
+
+def test_scan_enrichment_outcome_reads_provider_reasons():
+    scanner = pytest.importorskip("app.services.scanner")
+    from app.services.backtest import BacktestResult
+    from app.services.fundamental_score import FundamentalScoreResult
+
+    throttled = {
+        "backtest": BacktestResult("AAA", None, None, None, None, 0.5, ["ดึงข้อมูลย้อนหลังไม่สำเร็จ: Read timed out"]),
+        "fundamental": FundamentalScoreResult("AAA", 0.7, None, None, None, None, None, None, None, None, []),
+    }
+    healthy = {"backtest": BacktestResult("AAA", 100.0, 0.02, 0.05, 0.6, 0.7, [])}
+
+    assert scanner._enrichment_outcome(throttled) == "throttle"
+    assert scanner._enrichment_outcome(healthy) == "success"
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("tradingview_ta")
+
+from app.services import scanner
+from app.services.backtest import BacktestResult
+from app.services.fundamental_score import FundamentalScoreResult
+from app.services.sector_rotation import SectorRotationResult
+
+
+PROVIDER_DELAY = 0.2
+
+
+def _slow(result_factory, threads):
+    def provider(symbol):
+        threads.add(threading.current_thread().name)
+        time.sleep(PROVIDER_DELAY)
+        return result_factory(symbol)
+
+    return provider
+
+
+def test_enrichment_runs_in_parallel_with_technical_fetch(monkeypatch):
+    enrichment_threads = set()
+    monkeypatch.setattr(scanner, "prefetch_price_histories", lambda symbols, bars: {})
+    monkeypatch.setattr(scanner, "get_backtest_results", lambda symbols: {})
+    monkeypatch.setattr(scanner, "append_feedback_seeds", lambda candidates: 0)
+    monkeypatch.setattr(
+        scanner,
+        "fetch_analyses",
+        lambda symbols, screener, exchange: {
+            symbol: {
+                "symbol": symbol,
+                "exchange": exchange,
+                "analysis": {"RECOMMENDATION": "STRONG_BUY", "BUY": 15, "NEUTRAL": 2, "SELL": 0},
+                "indicators": {"close": 100.0, "RSI": 60.0, "SMA50": 90.0, "SMA200": 80.0},
+            }
+            for symbol in symbols
+        },
+    )
+    monkeypatch.setattr(
+        scanner,
+        "get_backtest_result",
+        _slow(
+            lambda symbol: BacktestResult(symbol, 100.0, 0.02, 0.05, 0.6, 0.7, []),
+            enrichment_threads,
+        ),
+    )
+    monkeypatch.setattr(
+        scanner,
+        "get_fundamental_score",
+        _slow(
+            lambda symbol: FundamentalScoreResult(
+                symbol, 0.7, None, None, None, None, None, None, None, None, []
+            ),
+            enrichment_threads,
+        ),
+    )
+    monkeypatch.setattr(
+        scanner,
+        "get_sector_rotation_score",
+        _slow(
+            lambda symbol: SectorRotationResult(
+                symbol, None, None, None, None, None, None, 0.5, []
+            ),
+            enrichment_threads,
+        ),
+    )
+    symbols = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF"]
+
+    started = time.monotonic()
+    candidates, errors = scanner.scan_market(symbols, screener="america", exchange="NASDAQ")
+    elapsed = time.monotonic() - started
+
+    assert errors == []
+    assert {candidate.symbol for candidate in candidates} == set(symbols)
+    assert threading.current_thread().name not in enrichment_threads
+    serialized = len(symbols) * 3 * PROVIDER_DELAY
+    assert elapsed < serialized / 2
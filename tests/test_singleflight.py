@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pandas as pd
+
+from app.data_sources import price_history
+from app.utils.singleflight import SingleFlight
+from app.utils.ttl_cache import ttl_cache
+
+
+def _run_concurrently(func, count=8):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as exc:
+            errors[index] = exc
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_cache_misses_share_one_provider_call():
+    calls = []
+
+    @ttl_cache(60, name="test.singleflight.score")
+    def score(symbol):
+        calls.append(symbol)
+        time.sleep(0.1)
+        return {"symbol": symbol}
+
+    results, errors = _run_concurrently(lambda: score("AAPL"))
+
+    assert calls == ["AAPL"]
+    assert errors == [None] * 8
+    assert all(result is results[0] for result in results)
+    assert score.cache_info().coalesced >= 1
+
+
+def test_waiters_receive_the_leader_exception():
+    flight = SingleFlight()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("provider down")
+
+    results, errors = _run_concurrently(lambda: flight.do("AAPL", failing))
+
+    assert len(calls) == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flight.in_flight() == 0
+
+
+def test_price_store_coalesces_concurrent_single_symbol_downloads(monkeypatch):
+    calls = []
+
+    def fake_download(symbols, period, interval="1d", batch_size=100):
+        calls.append(list(symbols))
+        time.sleep(0.1)
+        frame = pd.DataFrame({"Close": [1.0, 2.0, 3.0]})
+        return {symbol: frame for symbol in symbols}, {}
+
+    monkeypatch.setattr(price_history, "download_price_histories", fake_download)
+    store = price_history.PriceHistoryStore(name="test.singleflight.prices")
+
+    results, errors = _run_concurrently(lambda: store.get("AAPL", 2))
+
+    assert calls == [["AAPL"]]
+    assert errors == [None] * 8
+    assert all(len(result) == 2 for result in results)
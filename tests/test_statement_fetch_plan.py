@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from app.data_sources import financial_statements
+from app.data_sources.statement_warehouse import StatementWarehouse
+from app.services import long_term_scanner
+
+
+def _statement():
+    return pd.DataFrame(
+        {pd.Timestamp("2025-12-31"): [100.0, 10.0], pd.Timestamp("2024-12-31"): [90.0, 9.0]},
+        index=["Total Revenue", "Net Income"],
+    )
+
+
+class RecordingTicker:
+    def __init__(self, empty=()):
+        self.accessed = []
+        self.empty = set(empty)
+        self.info = {"earningsTimestamp": 1}
+
+    def _read(self, name):
+        self.accessed.append(name)
+        return pd.DataFrame() if name in self.empty else _statement()
+
+    income_stmt = property(lambda self: self._read("income_stmt"))
+    balance_sheet = property(lambda self: self._read("balance_sheet"))
+    cashflow = property(lambda self: self._read("cashflow"))
+    quarterly_income_stmt = property(lambda self: self._read("quarterly_income_stmt"))
+    quarterly_balance_sheet = property(lambda self: self._read("quarterly_balance_sheet"))
+    quarterly_cashflow = property(lambda self: self._read("quarterly_cashflow"))
+
+
+@pytest.fixture
+def ticker(monkeypatch, tmp_path):
+    warehouse = StatementWarehouse(tmp_path / "statements.sqlite3")
+    recording = RecordingTicker()
+    monkeypatch.setattr(financial_statements, "get_statement_warehouse", lambda: warehouse)
+    monkeypatch.setattr(financial_statements.yf, "Ticker", lambda symbol: recording)
+    return recording
+
+
+def test_long_term_plan_skips_quarterly_statements(ticker):
+    data = financial_statements.get_financials(
+        "AAPL",
+        "NASDAQ",
+        statements=long_term_scanner.LONG_TERM_STATEMENTS,
+    )
+
+    assert sorted(ticker.accessed) == ["balance_sheet", "cashflow", "income_stmt"]
+    assert data["quarterly_income_statement"] is None
+    assert data["has_quarterly_financials"] is False
+    assert data["income_statement"] is data["annual_income_statement"]
+
+
+def test_missing_annual_statement_still_falls_back_to_quarterly(ticker):
+    ticker.empty = {"income_stmt", "financials"}
+
+    data = financial_statements.get_financials(
+        "AAPL",
+        "NASDAQ",
+        statements=long_term_scanner.LONG_TERM_STATEMENTS,
+    )
+
+    assert "quarterly_income_stmt" in ticker.accessed
+    assert "quarterly_cashflow" not in ticker.accessed
+    assert data["income_statement"] is data["quarterly_income_statement"]
+
+
+def test_wider_plan_only_fetches_kinds_missing_from_the_warehouse(ticker):
+    financial_statements.get_financials("AAPL", "NASDAQ", statements=long_term_scanner.LONG_TERM_STATEMENTS)
+    ticker.accessed.clear()
+
+    data, diagnostics = financial_statements.get_financials_with_diagnostics(
+        "AAPL",
+        "NASDAQ",
+        statements=["annual_income_statement", "quarterly_income_statement"],
+    )
+
+    assert ticker.accessed == ["quarterly_income_stmt"]
+    assert diagnostics["statement_source"] == "provider"
+    assert data["has_annual_income_statement"] is True
+    assert data["has_quarterly_income_statement"] is True
+
+
+def test_unknown_statement_kind_is_rejected():
+    with pytest.raises(ValueError):
+        financial_statements.build_fetch_plan(["monthly_income_statement"])
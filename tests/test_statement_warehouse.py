@@ -0,0 +1,176 @@
+import time
+
+import pandas as pd
+
+from app.data_sources import financial_statements
+from app.data_sources.statement_warehouse import (
+    StatementWarehouse,
+    StoredFinancials,
+    needs_statement_refresh,
+    new_period_expected,
+)
+
+
+def _statement(periods):
+    return pd.DataFrame(
+        {pd.Timestamp(period): [100.0 + index, 10.0] for index, period in enumerate(periods)},
+        index=["Total Revenue", "Net Income"],
+    )
+
+
+class CountingTicker:
+    accesses = 0
+
+    def __init__(self, info):
+        self.info = info
+
+    def _read(self, periods):
+        type(self).accesses += 1
+        return _statement(periods)
+
+    @property
+    def income_stmt(self):
+        return self._read(["2025-12-31", "2024-12-31"])
+
+    @property
+    def balance_sheet(self):
+        return self._read(["2025-12-31", "2024-12-31"])
+
+    @property
+    def cashflow(self):
+        return self._read(["2025-12-31", "2024-12-31"])
+
+    @property
+    def quarterly_income_stmt(self):
+        return self._read(["2026-06-30", "2026-03-31"])
+
+    @property
+    def quarterly_balance_sheet(self):
+        return self._read(["2026-06-30", "2026-03-31"])
+
+    @property
+    def quarterly_cashflow(self):
+        return self._read(["2026-06-30", "2026-03-31"])
+
+
+def _use_warehouse(monkeypatch, tmp_path, info):
+    warehouse = StatementWarehouse(tmp_path / "statements.sqlite3")
+    CountingTicker.accesses = 0
+    monkeypatch.setattr(financial_statements, "get_statement_warehouse", lambda: warehouse)
+    monkeypatch.setattr(financial_statements.yf, "Ticker", lambda symbol: CountingTicker(info))
+    return warehouse
+
+
+def test_statements_round_trip_by_symbol_kind_and_period(tmp_path):
+    warehouse = StatementWarehouse(tmp_path / "statements.sqlite3")
+    frame = _statement(["2025-12-31", "2024-12-31"])
+
+    warehouse.save_statements("AAPL", {"annual_income_statement": frame}, {"earningsTimestamp": 1})
+    stored = warehouse.load("AAPL")
+
+    pd.testing.assert_frame_equal(stored.statements["annual_income_statement"], frame, check_freq=False)
+    assert stored.info == {"earningsTimestamp": 1}
+    assert warehouse.load("MSFT") is None
+
+
+def test_second_discovery_call_reads_statements_locally(monkeypatch, tmp_path):
+    _use_warehouse(monkeypatch, tmp_path, {"earningsTimestamp": 1, "longName": "Apple"})
+
+    first, first_diagnostics = financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+    fetched = CountingTicker.accesses
+    second, second_diagnostics = financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+
+    assert first_diagnostics["statement_source"] == "provider"
+    assert second_diagnostics["statement_source"] == "warehouse"
+    assert CountingTicker.accesses == fetched
+    assert second["info"]["longName"] == "Apple"
+    pd.testing.assert_frame_equal(
+        second["annual_income_statement"],
+        first["annual_income_statement"],
+        check_freq=False,
+    )
+
+
+def test_changed_earnings_timestamp_triggers_refresh(monkeypatch, tmp_path):
+    warehouse = _use_warehouse(monkeypatch, tmp_path, {"earningsTimestamp": 1})
+    financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+
+    warehouse.save_info("AAPL", {"earningsTimestamp": 2})
+    _, diagnostics = financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+
+    assert diagnostics["statement_source"] == "provider"
+    assert warehouse.load("AAPL").earnings_key == '{"earningsTimestamp": 2, "lastFiscalYearEnd": null, "mostRecentQuarter": null}'
+
+
+def test_stale_quote_fields_are_fetched_live_while_statements_stay_local(monkeypatch, tmp_path):
+    info = {"earningsTimestamp": 1, "currentPrice": 100.0, "trailingPE": 20.0}
+    warehouse = _use_warehouse(monkeypatch, tmp_path, info)
+    monkeypatch.setattr(financial_statements, "session_ttl", lambda market, ttl, at=None: ttl)
+    financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+    fetched = CountingTicker.accesses
+
+    warehouse.save_info("AAPL", dict(info), now=time.time() - 2 * 60 * 60)
+    info.update(currentPrice=120.0, trailingPE=24.0)
+    data, diagnostics = financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+
+    assert diagnostics["statement_source"] == "warehouse"
+    assert CountingTicker.accesses == fetched
+    assert data["info"]["currentPrice"] == 120.0
+    assert data["info"]["trailingPE"] == 24.0
+    assert warehouse.load("AAPL").info["currentPrice"] == 120.0
+
+
+def test_quote_fields_within_session_ttl_come_from_the_warehouse(monkeypatch, tmp_path):
+    info = {"earningsTimestamp": 1, "currentPrice": 100.0}
+    _use_warehouse(monkeypatch, tmp_path, info)
+    monkeypatch.setattr(financial_statements, "session_ttl", lambda market, ttl, at=None: ttl)
+    financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+
+    info["currentPrice"] = 120.0
+    data, _ = financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+
+    assert data["info"]["currentPrice"] == 100.0
+
+
+def test_prescreened_info_is_reused_by_the_statement_fetch(monkeypatch, tmp_path):
+    info_reads = []
+
+    class InfoCountingTicker(CountingTicker):
+        @property
+        def info(self):
+            info_reads.append(1)
+            return {"earningsTimestamp": 1, "currentPrice": 100.0}
+
+        @info.setter
+        def info(self, value):
+            pass
+
+    _use_warehouse(monkeypatch, tmp_path, {})
+    monkeypatch.setattr(financial_statements.yf, "Ticker", lambda symbol: InfoCountingTicker({}))
+    monkeypatch.setattr(financial_statements, "session_ttl", lambda market, ttl, at=None: ttl)
+
+    assert financial_statements.get_info("AAPL", "NASDAQ")["currentPrice"] == 100.0
+    data, diagnostics = financial_statements.get_financials_with_diagnostics("AAPL", "NASDAQ")
+
+    assert diagnostics["statement_source"] == "provider"
+    assert data["info"]["currentPrice"] == 100.0
+    assert len(info_reads) == 1
+
+
+def test_overdue_fiscal_period_triggers_refresh_after_retry_interval():
+    now = pd.Timestamp("2026-10-18").timestamp()
+    stored = StoredFinancials(
+        yf_symbol="AAPL",
+        statements={"quarterly_income_statement": _statement(["2026-03-31"])},
+        statements_fetched_at=now - 2 * 24 * 60 * 60,
+    )
+
+    assert new_period_expected(stored, now) is True
+    assert needs_statement_refresh(stored, None, now) is True
+
+    stored.statements_fetched_at = now - 60
+    assert needs_statement_refresh(stored, None, now) is False
+
+    stored.statements = {"quarterly_income_statement": _statement(["2026-09-30"])}
+    stored.statements_fetched_at = time.time() - 2 * 24 * 60 * 60
+    assert new_period_expected(stored, now) is False
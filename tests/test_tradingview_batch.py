@@ -0,0 +1,193 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tradingview_ta")
+
+from app.services import scanner
+from app.services.exchange_index import ExchangeIndex
+
+
+@pytest.fixture(autouse=True)
+def isolated_exchange_index(monkeypatch, tmp_path):
+    index = ExchangeIndex(path=tmp_path / "exchange_index.json", seed_loader=dict)
+    monkeypatch.setattr(scanner, "get_exchange_index", lambda: index)
+    scanner._ANALYSIS_CACHE.clear()
+    return index
+
+
+def _analysis(recommendation):
+    return SimpleNamespace(
+        summary={"RECOMMENDATION": recommendation, "BUY": 10, "NEUTRAL": 5, "SELL": 1},
+        indicators={"close": 100.0},
+    )
+
+
+def test_fetch_analyses_resolves_all_exchange_candidates_in_one_request(monkeypatch):
+    calls = []
+
+    def fake_multiple_analysis(screener, interval, symbols, timeout=None):
+        calls.append(list(symbols))
+        return {
+            "NASDAQ:AAPL": _analysis("BUY"),
+            "NYSE:AAPL": None,
+            "AMEX:AAPL": None,
+            "NASDAQ:KO": None,
+            "NYSE:KO": _analysis("STRONG_BUY"),
+            "AMEX:KO": None,
+            "NASDAQ:ZZZZ": None,
+            "NYSE:ZZZZ": None,
+            "AMEX:ZZZZ": None,
+        }
+
+    monkeypatch.setattr(scanner, "get_multiple_analysis", fake_multiple_analysis)
+    monkeypatch.setattr(
+        scanner,
+        "fetch_analysis",
+        lambda *args: pytest.fail("per-symbol fallback must not run"),
+    )
+
+    results = scanner.fetch_analyses(["AAPL", "KO", "ZZZZ"], "america", "NASDAQ")
+
+    assert len(calls) == 1
+    assert "NYSE:KO" in calls[0]
+    assert results["AAPL"]["exchange"] == "NASDAQ"
+    assert results["KO"]["exchange"] == "NYSE"
+    assert results["KO"]["analysis"]["RECOMMENDATION"] == "STRONG_BUY"
+    assert results["ZZZZ"] == {"symbol": "ZZZZ", "error": scanner.NO_ANALYSIS_ERROR}
+
+
+@pytest.fixture
+def throttle_controller(monkeypatch):
+    from app.utils.provider_limits import AIMDController
+
+    controller = AIMDController("tradingview", initial=8, max_limit=10)
+    sleeps = []
+    monkeypatch.setattr(scanner, "provider_concurrency", lambda provider: controller)
+    monkeypatch.setattr(scanner, "provider_rate_limiter", lambda provider: SimpleNamespace(acquire=lambda: 0.0))
+    monkeypatch.setattr(scanner.time, "sleep", sleeps.append)
+    controller.sleeps = sleeps
+    return controller
+
+
+def test_fetch_analyses_retries_failed_batch_in_halves_with_backoff(monkeypatch, throttle_controller):
+    calls = []
+
+    def failing_multiple_analysis(screener, interval, symbols, timeout=None):
+        calls.append(list(symbols))
+        raise KeyError("data")
+
+    monkeypatch.setattr(scanner, "get_multiple_analysis", failing_multiple_analysis)
+    monkeypatch.setattr(
+        scanner,
+        "fetch_analysis",
+        lambda *args: pytest.fail("a failed batch must not fan out into per-symbol requests"),
+    )
+
+    results = scanner.fetch_analyses(["AAPL", "KO", "MSFT", "IBM"], "america", "NASDAQ")
+
+    assert [len(chunk) for chunk in calls] == [12, 6, 6, 3, 3, 3, 3]
+    assert throttle_controller.sleeps == [1.0, 2.0, 2.0]
+    assert throttle_controller.snapshot()["throttles"] == 7
+    assert throttle_controller.snapshot()["decreases"] >= 1
+    assert set(results) == {"AAPL", "KO", "MSFT", "IBM"}
+    assert all("TradingView batch request failed" in result["error"] for result in results.values())
+
+
+def test_fetch_analyses_keeps_results_from_the_half_that_recovers(monkeypatch, throttle_controller):
+    calls = []
+
+    def flaky_multiple_analysis(screener, interval, symbols, timeout=None):
+        calls.append(list(symbols))
+        if len(calls) == 1 or "NASDAQ:BAD" in symbols:
+            raise ValueError("Expecting value: line 1 column 1 (char 0)")
+        return {pair: _analysis("BUY") if pair.startswith("NASDAQ:") else None for pair in symbols}
+
+    monkeypatch.setattr(scanner, "get_multiple_analysis", flaky_multiple_analysis)
+    monkeypatch.setattr(scanner, "TRADINGVIEW_CHUNK_RETRIES", 1)
+
+    results = scanner.fetch_analyses(["AAPL", "BAD"], "america", "NASDAQ")
+
+    assert results["AAPL"]["exchange"] == "NASDAQ"
+    assert "TradingView batch request failed" in results["BAD"]["error"]
+    assert throttle_controller.snapshot()["successes"] == 1
+
+
+def test_fetch_analyses_falls_back_per_symbol_for_pairs_missing_from_response(monkeypatch, throttle_controller):
+    monkeypatch.setattr(
+        scanner,
+        "get_multiple_analysis",
+        lambda screener, interval, symbols, timeout=None: {"NASDAQ:AAPL": _analysis("BUY")},
+    )
+    monkeypatch.setattr(
+        scanner,
+        "fetch_analysis",
+        lambda symbol, screener, exchange: {"symbol": symbol, "error": "per-symbol"},
+    )
+
+    results = scanner.fetch_analyses(["AAPL", "KO"], "america", "NASDAQ")
+
+    assert results["AAPL"]["exchange"] == "NASDAQ"
+    assert results["KO"] == {"symbol": "KO", "error": "per-symbol"}
+
+
+class _SlowHandler:
+    delays = {"NASDAQ": 1.0, "NYSE": 0.05, "AMEX": 1.0}
+    winners = {"NYSE"}
+    started = []
+
+    def __init__(self, symbol, screener, exchange, interval):
+        self.exchange = exchange
+        self.started.append(exchange)
+
+    def get_analysis(self):
+        import time
+
+        time.sleep(self.delays[self.exchange])
+        if self.exchange in self.winners:
+            return _analysis("BUY")
+        return SimpleNamespace(summary={}, indicators={})
+
+
+def test_fetch_analysis_hedges_unresolved_exchange_probes(monkeypatch):
+    import time
+
+    _SlowHandler.started = []
+    monkeypatch.setattr(scanner, "TA_Handler", _SlowHandler)
+
+    started = time.perf_counter()
+    result = scanner.fetch_analysis("KO", "america", "NASDAQ", hedge_delay=0.05)
+    elapsed = time.perf_counter() - started
+
+    assert result["exchange"] == "NYSE"
+    assert elapsed < 0.5
+    assert _SlowHandler.started[:2] == ["NASDAQ", "NYSE"]
+
+
+def test_fetch_analysis_probes_resolved_symbol_sequentially(monkeypatch, isolated_exchange_index):
+    _SlowHandler.started = []
+    monkeypatch.setattr(scanner, "TA_Handler", _SlowHandler)
+    isolated_exchange_index.record_success("KO", "NYSE")
+
+    result = scanner.fetch_analysis("KO", "america", "NASDAQ", hedge_delay=0.0)
+
+    assert result["exchange"] == "NYSE"
+    assert _SlowHandler.started == ["NYSE"]
+
+
+def test_fetch_analyses_serves_closed_session_results_from_cache(monkeypatch):
+    calls = []
+
+    def fake_multiple_analysis(screener, interval, symbols, timeout=None):
+        calls.append(list(symbols))
+        return {symbol: _analysis("BUY") if symbol == "NASDAQ:AAPL" else None for symbol in symbols}
+
+    monkeypatch.setattr(scanner, "get_multiple_analysis", fake_multiple_analysis)
+    monkeypatch.setattr(scanner, "session_ttl", lambda market, ttl: 3 * 24 * 60 * 60)
+
+    first = scanner.fetch_analyses(["AAPL", "ZZZZ"], "america", "NASDAQ")
+    calls.clear()
+    second = scanner.fetch_analyses(["AAPL"], "america", "NASDAQ")
+
+    assert calls == []
+    assert second["AAPL"] == first["AAPL"]
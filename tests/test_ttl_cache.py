@@ -0,0 +1,112 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import fundamental_score, sector_rotation
+from app.utils.ttl_cache import TTLCache, cache_stats, ttl_cache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = TTLCache("test.expiry", ttl_seconds=60, clock=clock)
+    cache.set("AAPL", 1.0)
+
+    assert cache.get("AAPL") == (True, 1.0)
+    clock.now = 61
+    assert cache.get("AAPL") == (False, None)
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.expirations, info.currsize) == (1, 1, 1, 0)
+
+
+def test_value_ttl_shortens_error_entries_only():
+    clock = _Clock()
+    cache = TTLCache(
+        "test.value_ttl",
+        ttl_seconds=3600,
+        clock=clock,
+        ttl_for_value=lambda value: 60 if value.get("error") else None,
+    )
+    cache.set("OK", {"sector": "Energy"})
+    cache.set("BUSY", {"sector": None, "error": "HTTP 429"})
+
+    clock.now = 61
+    assert cache.get("OK") == (True, {"sector": "Energy"})
+    assert cache.get("BUSY") == (False, None)
+
+
+def test_provider_error_fallbacks_are_retried_within_minutes(monkeypatch):
+    clock = _Clock()
+
+    def throttled(symbol):
+        raise RuntimeError("HTTP 429 Too Many Requests")
+
+    monkeypatch.setattr(fundamental_score.yf, "Ticker", throttled)
+    for lookup in (fundamental_score.get_fundamental_score, sector_rotation._get_symbol_profile):
+        monkeypatch.setattr(lookup.cache, "_clock", clock)
+        lookup.cache_clear()
+
+    assert fundamental_score.get_fundamental_score("BUSY").error == "HTTP 429 Too Many Requests"
+    assert sector_rotation._get_symbol_profile("BUSY")["sector"] is None
+
+    clock.now = 5 * 60
+    assert fundamental_score.get_fundamental_score.cache.get(("BUSY",)) == (False, None)
+    assert sector_rotation._get_symbol_profile.cache.get(("BUSY",)) == (False, None)
+
+
+def test_byte_budget_evicts_least_recently_used_frames():
+    frame = pd.DataFrame({"Close": [1.0] * 1000})
+    frame_bytes = int(frame.memory_usage(deep=True).sum())
+    cache = TTLCache("test.bytes", ttl_seconds=60, max_bytes=int(frame_bytes * 2.5))
+
+    cache.set("A", frame.copy())
+    cache.set("B", frame.copy())
+    assert cache.get("A")[0] is True
+    cache.set("C", frame.copy())
+
+    assert cache.get("B")[0] is False
+    assert cache.get("A")[0] is True
+    assert cache.get("C")[0] is True
+    assert cache.info().evictions == 1
+    assert cache.info().current_bytes <= cache.max_bytes
+
+
+def test_decorator_counts_hits_and_supports_invalidation():
+    calls = []
+
+    @ttl_cache(60, maxsize=10, name="test.decorated")
+    def lookup(symbol):
+        calls.append(symbol)
+        return symbol.lower()
+
+    assert lookup("AAPL") == "aapl"
+    assert lookup("AAPL") == "aapl"
+    assert lookup.cache_invalidate("AAPL") is True
+    assert lookup("AAPL") == "aapl"
+
+    assert calls == ["AAPL", "AAPL"]
+    assert lookup.cache_info().hits == 1
+    assert lookup.cache_info().misses == 2
+    assert cache_stats()["test.decorated"]["currsize"] == 1
+
+    lookup.cache_clear()
+    assert lookup.cache_info().currsize == 0
+
+
+def test_cache_endpoint_reports_registered_caches():
+    client = TestClient(app)
+    response = client.get("/cache")
+
+    assert response.status_code == 200
+    caches = response.json()["data"]["caches"]
+    assert "price_history" in caches
+    assert "app.services.market_ranker.rank_symbol" in caches
+    assert caches["price_history"]["ttl_seconds"] > 0
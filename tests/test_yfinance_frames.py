@@ -1,7 +1,7 @@
 import pandas as pd
 import pytest
 
-from app.utils.yfinance_frames import extract_yfinance_series
+from app.utils.yfinance_frames import extract_yfinance_frame, extract_yfinance_series
 
 
 def _index():
@@ -86,3 +86,25 @@ def test_missing_field_returns_empty_series():
     result = extract_yfinance_series(frame, "Close", "AAPL")
 
     assert result.empty
+
+
+def test_extracts_one_symbol_frame_from_multi_ticker_download():
+    columns = pd.MultiIndex.from_tuples(
+        [
+            ("Close", "AAPL"),
+            ("Close", "MSFT"),
+            ("Volume", "AAPL"),
+            ("Volume", "MSFT"),
+        ]
+    )
+    frame = pd.DataFrame(
+        [[100.0, None, 10, None], [101.0, 201.0, 11, 21], [102.0, 202.0, 12, 22]],
+        index=_index(),
+        columns=columns,
+    )
+
+    result = extract_yfinance_frame(frame, "MSFT")
+
+    assert list(result.columns) == ["Close", "Volume"]
+    assert result["Close"].tolist() == [201.0, 202.0]
+    assert result["Volume"].tolist() == [21.0, 22.0]